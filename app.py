@@ -1,19 +1,21 @@
 import streamlit as st
-from utils.auth import authenticate, save_user, save_history, get_user_history
-import pandas as pd
-from utils.report_generator import generate_pdf_report
-from utils.pdf_reader import extract_text_from_pdf
-from utils.text_cleaner import clean_text
-from utils.section_extractor import extract_sections
-from utils.ats_matcher import match_skills, extract_skills_from_text, get_learning_link, find_weak_bullets, find_unquantified_bullets, skills_without_evidence, SUGGESTION_TEMPLATES
-from utils.semantic_matcher import calculate_semantic_match
-from utils.visualizer import plot_gauge_chart, plot_skills_gap, plot_comparison
-from utils.llm_engine import get_ai_feedback
-from utils.csv_export import convert_df_to_csv
-import requests
+from utils.auth import authenticate, save_user, save_history, get_user_history, count_user_history, get_history_summary, get_history_version, is_admin
+from utils import metrics
 from streamlit_lottie import st_lottie
+import json
+import os
 import time
 
+# Heavy modules (pandas, sklearn, plotly, reportlab, Gemini) are imported inside the
+# mode that needs them, so the login page paints without loading any of them.
+# Python caches imports, so on reruns these local imports cost a dict lookup.
+
+HISTORY_PAGE_SIZE = 20  # Records per page in the History tab
+LEADERBOARD_PAGE_SIZE = 50  # Candidates per page in the HR Mode leaderboard
+
+# Bundled with the app: the login page never waits on the network
+LOTTIE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "lottie_ai.json")
+
 def check_rate_limit():
     """
     Prevents users from spamming the Analyze button.
@@ -32,11 +34,41 @@ def check_rate_limit():
         # Update the last call time
         st.session_state.last_call = current_time
 
-def load_lottieurl(url):
-    r = requests.get(url)
-    if r.status_code != 200:
+@st.cache_resource(show_spinner=False)
+def load_lottiefile(path):
+    """Reads a Lottie animation once per process (None if the file is missing or invalid)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
         return None
-    return r.json()
+
+def metrics_panel():
+    """Admin-only debug panel: per-stage timings of this server process."""
+    if not metrics.METRICS_ENABLED or not is_admin(st.session_state.get("user_email")):
+        return
+    import pandas as pd
+
+    with st.expander("🛠️ Stage Metrics (Admin)", expanded=False):
+        rows = metrics.summary()
+        caches = metrics.cache_stats()
+        if not rows and not caches:
+            st.caption("No stages recorded yet.")
+            return
+        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+        for cache, stats in caches.items():
+            st.caption(f"{cache}: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
+        c1, c2 = st.columns(2)
+        with c1:
+            st.download_button("⬇️ JSON", metrics.to_json(), "metrics.json", "application/json")
+        with c2:
+            st.download_button("⬇️ Prometheus", metrics.to_prometheus(), "metrics.prom", "text/plain")
+        if st.button("💾 Export to Disk"):
+            json_path, prom_path = metrics.export_files()
+            st.success(f"Saved {json_path} and {prom_path}")
+        if st.button("Reset Metrics"):
+            metrics.reset()
+            st.rerun()
 
 def ui_footer():
     st.markdown("---")
@@ -51,13 +83,53 @@ def ui_footer():
 # --- PAGE CONFIG ---
 st.set_page_config(page_title="AI Resume Analyzer", page_icon="🚀", layout="wide")
 
+# --- CACHED HELPERS ---
+# Streamlit reruns this whole script on every interaction. Everything below is keyed
+# on the inputs that really change it, so an unchanged rerun is mostly cache lookups.
+# cache_data returns a copy per call; cache_resource shares one object across sessions
+# (used for plotly figures: rebuilding one is cheaper than copying it, and nothing mutates them).
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def read_css(file_name, mtime):
+    """style.css contents, re-read only when the file's mtime changes."""
+    with open(file_name) as f:
+        return f.read()
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def cached_history_summary(uid, version):
+    """version (from get_history_version) is only there to key the cache."""
+    return get_history_summary(uid)
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def cached_history_page(uid, version, page, page_size):
+    """(total_records, rows of this page), newest first."""
+    total = count_user_history(uid)
+    rows = get_user_history(uid, limit=page_size, offset=(page - 1) * page_size, newest_first=True)
+    return total, rows
+
+@st.cache_resource(max_entries=128, show_spinner=False)
+def gauge_figure(score):
+    from utils.visualizer import plot_gauge_chart
+    return plot_gauge_chart(score)
+
+@st.cache_resource(max_entries=128, show_spinner=False)
+def comparison_figure(match_a, match_b, sem_a, sem_b):
+    from utils.visualizer import plot_comparison
+    return plot_comparison(match_a, match_b, sem_a, sem_b)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def cached_pdf_report(name, match_score, semantic_score, missing_skills, ai_advice):
+    """missing_skills must be a sorted tuple (hashable, and the same set gives the same key)."""
+    from utils.report_generator import generate_pdf_report
+    return generate_pdf_report(name, match_score, semantic_score, set(missing_skills), ai_advice)
+
 # --- CUSTOM CSS ---
 def local_css(file_name):
     try:
-        with open(file_name) as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-    except FileNotFoundError:
-        pass
+        css = read_css(file_name, os.path.getmtime(file_name))
+    except (FileNotFoundError, OSError):
+        return
+    st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
 local_css("style.css")
 
@@ -74,18 +146,13 @@ if "analysis_results" not in st.session_state:
 # --- 1. LOGIN PAGE FUNCTION ---
 def login_page():
     # Load the animation (A cool AI robot)
-    lottie_ai = load_lottieurl("https://assets5.lottiefiles.com/packages/lf20_V9t630.json")
+    lottie_ai = load_lottiefile(LOTTIE_FILE)
 
     st.title("🚀 AI Resume Analyzer")
     
     # Create two columns
     col1, col2 = st.columns([1, 2]) # Left is smaller (animation), Right is wider (login)
 
-    with col1:
-        # Display animation
-        if lottie_ai:
-            st_lottie(lottie_ai, height=250, key="ai_anim")
-    
     with col2:
         st.subheader("Login to access the Pro Dashboard")
         
@@ -122,6 +189,11 @@ def login_page():
                 else:
                     st.warning("Please fill all fields.")
 
+    # Drawn last so the login form is on screen first (Streamlit components load pandas)
+    with col1:
+        if lottie_ai:
+            st_lottie(lottie_ai, height=250, key="ai_anim")
+
 # --- 2. MAIN DASHBOARD FUNCTION ---
 def main_dashboard():
     # Sidebar Logout
@@ -133,6 +205,7 @@ def main_dashboard():
             if 'user_email' in st.session_state:
                 del st.session_state.user_email
             st.rerun()
+        metrics_panel()
         st.divider()
 
     # --- SIDEBAR INPUTS ---
@@ -177,6 +250,8 @@ def main_dashboard():
             resume_file = None
             resume_b = None
             uploaded_files = st.file_uploader("Upload Candidates (PDF)", type=["pdf"], accept_multiple_files=True)
+            cpus = os.cpu_count() or 1
+            num_workers = st.number_input("Parallel Workers", 1, cpus, cpus)
 
         st.divider()
         analyze_button = st.button("🔍 Analyze")
@@ -184,6 +259,13 @@ def main_dashboard():
    # --- LOGIC HANDLING ---
     if mode == "Single Resume":
         # ================= SINGLE MODE =================
+        import pandas as pd
+        from utils.pdf_reader import extract_text_from_pdf
+        from utils.resume_pipeline import analyze_resume
+        from utils.job_profile import get_job_profile
+        from utils.idf_model import get_idf_model, fold_in
+        from utils.llm_engine import stream_ai_feedback
+
         tab1, tab2 = st.tabs(["📊 Analysis", "📈 History"])
         
         with tab1:
@@ -193,42 +275,21 @@ def main_dashboard():
                 check_rate_limit()
                 if resume_file and job_description:
                     with st.spinner("Processing..."):
-                        # Extract & Analyze
+                        # Extract & Analyze (one fused pass over the resume)
                         raw_text = extract_text_from_pdf(resume_file)
-                        cleaned_text = clean_text(raw_text)
-                        sections = extract_sections(cleaned_text)
-                        resume_skills = extract_skills_from_text(cleaned_text)
-                        jd_text = job_description.lower()
-                        jd_skills = extract_skills_from_text(jd_text)
-                        match_pct, matched, missing = match_skills(resume_skills, jd_skills)
-                        sem_score = calculate_semantic_match(cleaned_text, jd_text)
-                        
-                        # Checks
-                        exp_text = sections.get("experience", "")
-                        weak_bullets = find_weak_bullets(exp_text)
-                        unquantified = find_unquantified_bullets(exp_text)
-                        skills_no_ev = skills_without_evidence(resume_skills, exp_text)
+                        profile = get_job_profile(job_description)
+                        analysis = analyze_resume(raw_text, profile, get_idf_model().pinned())
+                        fold_in([analysis.cleaned_text])
 
                         # Save to State
-                        st.session_state.analysis_results = {
-                            "match_percentage": match_pct,
-                            "semantic_score": sem_score,
-                            "matched_skills": matched,
-                            "missing_skills": missing,
-                            "resume_skills": resume_skills,
-                            "jd_skills": jd_skills,
-                            "cleaned_text": cleaned_text,
-                            "jd_text": jd_text,
-                            "weak_bullets": weak_bullets,
-                            "unquantified": unquantified,
-                            "skills_no_evidence": skills_no_ev
-                        }
+                        st.session_state.analysis_results = analysis
                         st.session_state.analysis_done = True
                         st.session_state.mode = "single"
 
                         # Save History
                         uid = st.session_state.get('user_email', st.session_state.user_name)
-                        save_history(uid, match_pct, sem_score, missing)
+                        save_history(uid, analysis.match_percentage, analysis.semantic_score, analysis.missing_skills,
+                                     analysis.idf_revision)
                         st.toast("✅ Analysis saved!")
                 else:
                     st.error("⚠️ Please upload a resume and paste a JD.")
@@ -239,53 +300,65 @@ def main_dashboard():
                 
                 col1, col2 = st.columns(2)
                 with col1:
-                    fig = plot_gauge_chart(res["match_percentage"])
+                    fig = gauge_figure(res.match_percentage)
                     st.plotly_chart(fig, use_container_width=True)
                 with col2:
-                    st.metric("Semantic Score", f"{res['semantic_score']}%")
+                    st.metric("Semantic Score", f"{res.semantic_score}%")
                 
                 st.divider()
                 st.subheader("🤖 AI Advice")
                 if st.button("✨ Get Advice"):
-                    with st.spinner("Thinking..."):
-                        advice = get_ai_feedback(res['cleaned_text'], res['jd_text'], res['missing_skills'])
-                        st.session_state.ai_advice = advice
-                        st.markdown(advice)
+                    # Tokens are shown as they arrive (repeat clicks come straight from the cache)
+                    advice = st.write_stream(stream_ai_feedback(res.cleaned_text, res.jd_text, res.missing_skills))
+                    st.session_state.ai_advice = advice
 
                 st.divider()
                 st.subheader("📄 Download Report")
                 if st.button("Prepare PDF"):
                     advice_text = st.session_state.get("ai_advice", "No AI advice generated.")
-                    pdf_data = generate_pdf_report(st.session_state.user_name, res['match_percentage'], res['semantic_score'], res['missing_skills'], advice_text)
+                    pdf_data = cached_pdf_report(st.session_state.user_name, res.match_percentage, res.semantic_score, tuple(sorted(res.missing_skills)), advice_text)
                     st.download_button("⬇️ Download PDF", pdf_data, "report.pdf", "application/pdf")
 
         with tab2:
             st.header("📈 History")
             uid = st.session_state.get('user_email', st.session_state.user_name)
-            hist = get_user_history(uid)
-            if hist:
-                st.line_chart(pd.DataFrame(hist).set_index("date")[["match_score", "semantic_score"]])
+            # Daily min/mean/max computed in the database, so the chart stays small.
+            # Cached until a new analysis is saved (the version is a single index lookup)
+            version = get_history_version(uid)
+            summary = cached_history_summary(uid, version)
+            if summary:
+                daily = pd.DataFrame(summary).set_index("date")
+                st.line_chart(daily[["match_min", "match_mean", "match_max", "semantic_mean"]])
+
+                # Raw records, one page at a time (newest first)
+                total, _ = cached_history_page(uid, version, 1, HISTORY_PAGE_SIZE)
+                pages = max(1, -(-total // HISTORY_PAGE_SIZE))
+                page = st.number_input(f"Page (of {pages})", 1, pages, 1, key="history_page")
+                _, hist = cached_history_page(uid, version, page, HISTORY_PAGE_SIZE)
+                st.dataframe(pd.DataFrame(hist), use_container_width=True, hide_index=True)
 
     elif mode == "Compare (A/B Test)":
         # ================= COMPARE MODE =================
+        from utils.pdf_reader import extract_text_from_pdf
+        from utils.resume_pipeline import analyze_resumes
+        from utils.job_profile import get_job_profile
+        from utils.idf_model import get_idf_model, fold_in
+
         st.title("⚔️ Resume Battle Mode (A vs B)")
         
         if analyze_button:
             if resume_file and resume_b and job_description:
                 with st.spinner("Analyzing Both Resumes..."):
-                    # Process A
-                    text_a = clean_text(extract_text_from_pdf(resume_file))
-                    skills_a = extract_skills_from_text(text_a)
-                    jd_clean = job_description.lower()
-                    jd_skills = extract_skills_from_text(jd_clean)
-                    match_a, _, _ = match_skills(skills_a, jd_skills)
-                    sem_a = calculate_semantic_match(text_a, jd_clean)
-
-                    # Process B
-                    text_b = clean_text(extract_text_from_pdf(resume_b))
-                    skills_b = extract_skills_from_text(text_b)
-                    match_b, _, _ = match_skills(skills_b, jd_skills)
-                    sem_b = calculate_semantic_match(text_b, jd_clean)
+                    profile = get_job_profile(job_description)
+
+                    # Process A and B together (semantic scores share one IDF, so they're comparable)
+                    res_a, res_b = analyze_resumes(
+                        [extract_text_from_pdf(resume_file), extract_text_from_pdf(resume_b)],
+                        profile, get_idf_model().pinned(), detailed=False
+                    )
+                    fold_in([res_a.cleaned_text, res_b.cleaned_text])
+                    match_a, sem_a = res_a.match_percentage, res_a.semantic_score
+                    match_b, sem_b = res_b.match_percentage, res_b.semantic_score
 
                     st.session_state.compare_results = {
                         "match_a": match_a, "sem_a": sem_a,
@@ -309,18 +382,24 @@ def main_dashboard():
                 st.info("📄 Resume B")
                 st.metric("ATS Match", f"{res['match_b']}%")
 
-            fig = plot_comparison(res['match_a'], res['match_b'], res['sem_a'], res['sem_b'])
+            fig = comparison_figure(res['match_a'], res['match_b'], res['sem_a'], res['sem_b'])
             st.plotly_chart(fig, use_container_width=True)
 
     else:
         # ================= BULK MODE (HR) =================
-        st.title("📊 Bulk Resume Screening (HR Mode)")
+        from utils.bulk_screener import iter_screen_results, add_semantic_scores
+        from utils.bulk_advice import generate_bulk_advice
+        from utils.llm_engine import MAX_CONCURRENCY as LLM_MAX_CONCURRENCY
         from utils.csv_export import convert_df_to_csv
-        import time
+        from utils.job_profile import get_job_profile
+        from utils.idf_model import get_idf_model, fold_in
+        from utils.leaderboard import Leaderboard, PASS_LABEL
+
+        st.title("📊 Bulk Resume Screening (HR Mode)")
 
         # Initialize Session State for Bulk Data if not exists
-        if "bulk_results" not in st.session_state:
-            st.session_state.bulk_results = []
+        if "bulk_board" not in st.session_state:
+            st.session_state.bulk_board = None
 
         # --- PHASE 1: HEAVY LIFTING (Run AI Only When Button Clicked) ---
         if analyze_button:
@@ -328,33 +407,46 @@ def main_dashboard():
             if uploaded_files and job_description:
                 
                 # Clear previous results
-                st.session_state.bulk_results = []
+                st.session_state.bulk_board = None
                 
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 total_files = len(uploaded_files)
                 
-                # Run Analysis Loop
-                for i, file in enumerate(uploaded_files):
-                    status_text.text(f"Analyzing candidate {i+1} of {total_files}: {file.name}...")
-                    progress_bar.progress((i + 1) / total_files)
-                    
-                    # 1. Extraction & AI
-                    text = clean_text(extract_text_from_pdf(file))
-                    skills = extract_skills_from_text(text)
-                    jd_clean = job_description.lower()
-                    jd_skills = extract_skills_from_text(jd_clean)
-                    match_pct, _, missing = match_skills(skills, jd_skills)
-                    sem_score = calculate_semantic_match(text, jd_clean)
-                    
-                    # Store RAW data in Session State (Not the final score yet)
-                    st.session_state.bulk_results.append({
-                        "Candidate Name": file.name,
-                        "ATS Match": match_pct,
-                        "Semantic Match": sem_score,
-                        "Missing Skills": list(missing) # Store as list
-                    })
-                    time.sleep(0.5) # Be nice to API
+                # Run Analysis across a process pool (results arrive out of order)
+                profile = get_job_profile(job_description)
+                files = [(file.name, file.getvalue()) for file in uploaded_files]
+                rows = [None] * total_files
+                texts = [""] * total_files
+
+                for done, (i, row, text) in enumerate(iter_screen_results(files, profile, num_workers), start=1):
+                    status_text.text(f"Analyzed candidate {done} of {total_files}: {row['Candidate Name']}...")
+                    progress_bar.progress(done / total_files)
+
+                    # Keep RAW data (Not the final score yet)
+                    rows[i] = row
+                    texts[i] = text
+
+                # Semantic scores for the whole batch (persistent IDF model once it has enough
+                # history, else one TF-IDF fit over the batch), kept in upload order
+                status_text.text("Computing semantic scores for the batch...")
+                idf_model = get_idf_model().pinned()
+                rows = add_semantic_scores(rows, texts, profile, idf_model)
+                fold_in(texts)
+
+                # Columnar store: every slider move below is a few NumPy operations on it
+                st.session_state.bulk_board = Leaderboard.from_rows(rows, idf_model.scored_revision)
+                st.session_state.leaderboard_page = 1
+                # Files that couldn't be screened stay in the table with zero scores (keyed by upload position)
+                st.session_state.bulk_errors = {
+                    i: (row["Candidate Name"], row["Error"]) for i, row in enumerate(rows) if row.get("Error")
+                }
+
+                # Keep what the AI advice stage needs (resume excerpts + the JD they were scored against).
+                # Excerpts and advice are keyed by upload position: two files can share a name
+                st.session_state.bulk_excerpts = [text[:1000] for text in texts]
+                st.session_state.bulk_jd = job_description
+                st.session_state.bulk_advice = {}
 
                 st.success("✅ Analysis Complete!")
                 st.rerun() # Force refresh to show results immediately
@@ -362,46 +454,88 @@ def main_dashboard():
                 st.error("⚠️ Please upload candidates and a JD.")
 
         # --- PHASE 2: LIGHT MATH (Run Every Time Slider Moves) ---
-        if st.session_state.bulk_results:
-            
-            # 1. Get Settings from Sidebar
-            # (These variables ats_weight, sem_weight, cutoff_score are already defined in your sidebar code)
-            
-            final_display_list = []
-            
-            # 2. Recalculate Scores INSTANTLY
-            for candidate in st.session_state.bulk_results:
-                final_score = (candidate["ATS Match"] * (ats_weight / 100)) + (candidate["Semantic Match"] * (sem_weight / 100))
-                status = "✅ Pass" if final_score >= cutoff_score else "❌ Reject"
-                
-                final_display_list.append({
-                    "Candidate Name": candidate["Candidate Name"],
-                    "Status": status,
-                    "Final Score": round(final_score, 1),
-                    "ATS Match": candidate["ATS Match"],
-                    "Semantic Match": candidate["Semantic Match"],
-                    "Missing Skills": ", ".join(candidate["Missing Skills"][:5])
-                })
-            
-            # 3. Display Leaderboard
-            df = pd.DataFrame(final_display_list)
-            df = df.sort_values(by="Final Score", ascending=False)
+        board = st.session_state.bulk_board
+        if board is not None and len(board):
             
+            # 1. Recalculate Scores INSTANTLY (one vectorized pass over every candidate)
+            scores = board.final_scores(ats_weight, sem_weight)
+            passed = int((scores >= cutoff_score).sum())
+
+            # 2. Display Leaderboard (only the current page is built and styled)
             st.subheader("🏆 Candidate Leaderboard")
+            st.caption(f"{passed} of {len(board)} candidates pass the cutoff.")
+            bulk_errors = st.session_state.get("bulk_errors", {})
+            if bulk_errors:
+                st.warning(f"⚠️ {len(bulk_errors)} file(s) could not be screened: "
+                           + "; ".join(f"{name} ({error})" for name, error in list(bulk_errors.values())[:5]))
+
+            pages = max(1, -(-len(board) // LEADERBOARD_PAGE_SIZE))
+            # Keyed, so the page survives reruns even though the label changes with the page count
+            page = min(st.session_state.get("leaderboard_page", 1), pages)
+            if pages > 1:
+                st.session_state.leaderboard_page = page
+                page = int(st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, key="leaderboard_page"))
+            df_page = board.page(scores, cutoff_score, page, LEADERBOARD_PAGE_SIZE)
             
             def highlight_status(val):
-                color = '#d4edda' if val == "✅ Pass" else '#f8d7da'
+                color = '#d4edda' if val == PASS_LABEL else '#f8d7da'
                 return f'background-color: {color}; color: black'
 
-            st.dataframe(
-                df.style.map(highlight_status, subset=['Status'])
-                        .format({"Final Score": "{:.1f}", "ATS Match": "{:.1f}", "Semantic Match": "{:.1f}"}),
-                use_container_width=True
-            )
+            with metrics.stage("render"):
+                st.dataframe(
+                    df_page.style.map(highlight_status, subset=['Status'])
+                            .format({"Final Score": "{:.1f}", "ATS Match": "{:.1f}", "Semantic Match": "{:.1f}"}),
+                    use_container_width=True,
+                    hide_index=True
+                )
             
-            # CSV Download
-            csv = convert_df_to_csv(df)
-            st.download_button("⬇️ Download CSV", csv, "HR_Report.csv", "text/csv")
+            # 3. AI Advice for rejected candidates (one shared answer per missing-skill group)
+            st.subheader("🤖 AI Advice for Rejected Candidates")
+            with st.expander("⚙️ Advice Settings", expanded=False):
+                # Every LLM call goes through one process-wide semaphore, so more than that never runs at once
+                advice_concurrency = st.number_input(
+                    "Parallel Requests", 1, LLM_MAX_CONCURRENCY, min(4, LLM_MAX_CONCURRENCY),
+                    help=f"At most {LLM_MAX_CONCURRENCY} (LLM_MAX_CONCURRENCY) requests run at once."
+                )
+                advice_rpm = st.number_input("Max Requests per Minute", 1, 1000, 60)
+
+            # Files that failed to parse have no resume to advise on
+            rejected = [i for i in board.rejected(scores, cutoff_score).tolist() if i not in bulk_errors]
+            if st.button(f"✨ Generate Advice ({len(rejected)} candidates)") and len(rejected):
+                excerpts = st.session_state.get("bulk_excerpts", [])
+                candidates = [
+                    {
+                        "missing_skills": board.missing[i],
+                        "resume_text": excerpts[i] if i < len(excerpts) else ""
+                    }
+                    for i in rejected
+                ]
+                with st.spinner("Generating advice..."):
+                    advice = generate_bulk_advice(
+                        candidates, st.session_state.get("bulk_jd", job_description),
+                        int(advice_concurrency), int(advice_rpm)
+                    )
+                    st.session_state.bulk_advice = dict(zip(rejected, advice))
+
+            bulk_advice = st.session_state.get("bulk_advice", {})
+            if bulk_advice:
+                # Only candidates with advice (and still below the cutoff), best first
+                advised = sorted(
+                    (i for i in bulk_advice if i < len(board) and scores[i] < cutoff_score),
+                    key=lambda i: (-scores[i], i)
+                )
+                for i in advised:
+                    with st.expander(f"💡 {board.names[i]} (upload #{i + 1})"):
+                        st.markdown(bulk_advice[i])
+
+            # CSV Download (the full ranking is only built when the button is clicked)
+            def full_report_csv():
+                df = board.ranked_frame(scores, cutoff_score)
+                if bulk_advice:
+                    df["AI Advice"] = [bulk_advice.get(i, "") for i in df.index]
+                return convert_df_to_csv(df)
+
+            st.download_button("⬇️ Download CSV", full_report_csv, "HR_Report.csv", "text/csv")
 
         else:
             st.error("⚠️ Please upload candidates and a JD.")
@@ -0,0 +1,80 @@
+"""
+Seeded generator of synthetic resumes (as real PDFs, via reportlab) and matching JDs.
+The same seed always gives the same corpus, so benchmark runs are comparable.
+"""
+import random
+from io import BytesIO
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from utils.ats_matcher import SKILL_KEYWORDS
+
+FIRST_NAMES = ["Aarav", "Maya", "Liam", "Sara", "Noah", "Zara", "Omar", "Lena", "Ravi", "Emma"]
+LAST_NAMES = ["Sharma", "Khan", "Smith", "Garcia", "Chen", "Patel", "Okafor", "Novak", "Silva", "Kim"]
+VERBS = ["Built", "Designed", "Led", "Optimized", "Automated", "Migrated", "Developed", "Helped", "Worked on", "Implemented"]
+OBJECTS = ["a data pipeline", "the billing service", "REST APIs", "a recommendation engine", "CI/CD workflows",
+           "dashboards for the sales team", "an internal CLI", "the search backend", "ETL jobs", "a mobile app"]
+RESULTS = ["reducing latency by {n}%", "serving {n}k daily users", "cutting costs by ${n}k", "for {n} clients", "", ""]
+DEGREES = ["B.Tech in Computer Science", "M.Sc. in Data Science", "B.E. in Electronics", "MBA in Analytics"]
+
+def generate_resume_lines(rng, n_bullets=20, n_skills=12):
+    """One synthetic resume as a list of text lines (header, skills, experience, education)."""
+    skills = rng.sample(SKILL_KEYWORDS, min(n_skills, len(SKILL_KEYWORDS)))
+    lines = [
+        f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "SUMMARY",
+        f"Engineer with {rng.randint(1, 12)} years of experience in {', '.join(skills[:3])}.",
+        "SKILLS",
+        ", ".join(skills),
+        "EXPERIENCE",
+    ]
+    for _ in range(n_bullets):
+        result = rng.choice(RESULTS).format(n=rng.randint(5, 90))
+        lines.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)} {result}".rstrip())
+    lines += ["EDUCATION", rng.choice(DEGREES), "CERTIFICATIONS", f"{rng.choice(skills).title()} Certified Professional"]
+    return lines
+
+def lines_to_pdf(lines):
+    """Renders text lines into PDF bytes, adding pages as needed."""
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    y = 750
+    for line in lines:
+        if y < 50:
+            pdf.showPage()
+            y = 750
+        pdf.drawString(50, y, line[:110])
+        y -= 15
+    pdf.save()
+    return buffer.getvalue()
+
+def generate_jd(rng, n_skills=8):
+    """A synthetic Job Description asking for a random set of skills."""
+    skills = rng.sample(SKILL_KEYWORDS, n_skills)
+    return (
+        f"We are hiring a Software Engineer.\n"
+        f"Required skills: {', '.join(skills[:5])}.\n"
+        f"Nice to have: {', '.join(skills[5:])}.\n"
+        "You will design, build and operate production services with a small, senior team."
+    )
+
+def generate_corpus(n_resumes, seed=42, n_bullets=20):
+    """Returns (jd_text, [(file_name, pdf_bytes), ...]) for a seeded synthetic batch."""
+    rng = random.Random(seed)
+    jd = generate_jd(rng)
+    files = [
+        (f"candidate_{i:05d}.pdf", lines_to_pdf(generate_resume_lines(rng, n_bullets)))
+        for i in range(n_resumes)
+    ]
+    return jd, files
+
+def generate_taxonomy(n_skills, seed=42):
+    """A synthetic taxonomy with n_skills skills (about half of them with aliases)."""
+    rng = random.Random(seed)
+    skills = [f"skill{i}" for i in range(n_skills)]
+    synonyms = {
+        skill: [f"{skill} framework", f"{skill}js"]
+        for skill in rng.sample(skills, n_skills // 2)
+    }
+    return {"version": 1, "skills": list(SKILL_KEYWORDS) + skills, "synonyms": synonyms}
@@ -0,0 +1,101 @@
+"""
+Cold-start budget: how long a fresh process takes to get the login page on screen,
+and which heavy modules it loaded on the way.
+
+    python -m benchmarks.import_budget                 # report
+    python -m benchmarks.import_budget --budget-ms 1500  # exit 1 if over budget (or heavy modules loaded)
+
+Two moments are timed, each with its own budget:
+
+- first paint: the login form is on screen (no heavy module may be loaded yet);
+- full page: the Lottie animation, drawn last, is on screen too. Streamlit's
+  custom-component bridge imports pandas (and pyarrow) to check its arguments,
+  so the modules it loads are reported and its time counts against --full-budget-ms.
+
+The login page is rendered with Streamlit in "bare" mode (no server), in a new
+interpreter each time so nothing is already imported.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_BUDGET_MS = 1500
+DEFAULT_FULL_BUDGET_MS = 3000
+
+# Must not be imported before the user picks a mode
+HEAVY_MODULES = ("pandas", "pyarrow", "sklearn", "reportlab", "google.generativeai", "pdfplumber", "pdfminer", "scipy")
+
+_PROBE = """
+import json, sys, time, logging
+logging.disable(logging.WARNING)   # Bare-mode Streamlit warns about the missing server
+heavy_modules = %r
+loaded = lambda: [m for m in heavy_modules if m in sys.modules]
+start = time.perf_counter()
+import app                          # Page config, CSS, session state
+first_paint = {}
+draw_animation = app.st_lottie
+def st_lottie(*args, **kwargs):     # Everything before the animation is on screen by now
+    first_paint.update(ms=(time.perf_counter() - start) * 1000, heavy=loaded())
+    return draw_animation(*args, **kwargs)
+app.st_lottie = st_lottie
+app.login_page()
+full_ms = (time.perf_counter() - start) * 1000
+first_paint = first_paint or {"ms": full_ms, "heavy": loaded()}
+print(json.dumps({"ms": first_paint["ms"], "heavy": first_paint["heavy"], "full_ms": full_ms, "full_heavy": loaded()}))
+""" % (HEAVY_MODULES,)
+
+def measure_once():
+    """
+    Runs the probe in a fresh interpreter. Returns {"ms", "heavy"} for the first paint
+    and {"full_ms", "full_heavy"} for the whole page.
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time-to-first-paint budget for the login page.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time (the median is reported).")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help=f"Fail if the median first paint exceeds this (e.g. {DEFAULT_BUDGET_MS}).")
+    parser.add_argument("--full-budget-ms", type=float, default=DEFAULT_FULL_BUDGET_MS,
+                        help="With --budget-ms, also fail if the median full page (animation included) exceeds this.")
+    args = parser.parse_args(argv)
+
+    runs = [measure_once() for _ in range(max(1, args.runs))]
+    median = statistics.median(run["ms"] for run in runs)
+    full_median = statistics.median(run["full_ms"] for run in runs)
+    heavy = sorted({module for run in runs for module in run["heavy"]})
+    full_heavy = sorted({module for run in runs for module in run["full_heavy"]})
+
+    print(f"Login form first paint: median {median:.0f} ms over {len(runs)} runs "
+          f"(min {min(r['ms'] for r in runs):.0f}, max {max(r['ms'] for r in runs):.0f})")
+    print(f"Heavy modules loaded: {', '.join(heavy) if heavy else 'none'}")
+    print(f"Full login page (with animation): median {full_median:.0f} ms "
+          f"(min {min(r['full_ms'] for r in runs):.0f}, max {max(r['full_ms'] for r in runs):.0f})")
+    print(f"Heavy modules loaded by then: {', '.join(full_heavy) if full_heavy else 'none'}")
+
+    if args.budget_ms is None:
+        return 0
+    failed = False
+    if median > args.budget_ms:
+        print(f"FAIL: first paint over the {args.budget_ms:.0f} ms budget")
+        failed = True
+    if heavy:
+        print("FAIL: heavy modules must only be imported by the mode that uses them")
+        failed = True
+    if full_median > args.full_budget_ms:
+        print(f"FAIL: full page over the {args.full_budget_ms:.0f} ms budget")
+        failed = True
+    if not failed:
+        print(f"OK: first paint within {args.budget_ms:.0f} ms, full page within {args.full_budget_ms:.0f} ms")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
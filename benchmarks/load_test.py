@@ -0,0 +1,146 @@
+"""
+Load test for score_service.py: N concurrent keep-alive clients, latency percentiles.
+
+    python score_service.py --port 8080 &
+    python -m benchmarks.load_test --port 8080 --clients 32 --requests 2000
+    python -m benchmarks.load_test --spawn --endpoint extract   # starts (and stops) the service itself
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.corpus import generate_resume_lines, generate_jd, lines_to_pdf
+
+ENDPOINTS = ("score", "batch", "extract")
+
+def build_requests(endpoint, n_jds, n_resumes, batch_size, seed=42):
+    """A pool of (path, content_type, body) requests to cycle through."""
+    rng = random.Random(seed)
+    jds = [generate_jd(rng) for _ in range(n_jds)]
+    resumes = [generate_resume_lines(rng, rng.randint(5, 40)) for _ in range(n_resumes)]
+    requests = []
+    for i, lines in enumerate(resumes):
+        jd = jds[i % n_jds]
+        if endpoint == "score":
+            body = {"jd": jd, "resume_text": "\n".join(lines)}
+            requests.append(("/score", "application/json", json.dumps(body).encode("utf-8")))
+        elif endpoint == "batch":
+            texts = ["\n".join(resumes[(i + k) % n_resumes]) for k in range(batch_size)]
+            body = {"jd": jd, "resume_texts": texts}
+            requests.append(("/score/batch", "application/json", json.dumps(body).encode("utf-8")))
+        else:
+            requests.append(("/extract", "application/pdf", lines_to_pdf(lines)))
+    return requests
+
+async def _send(reader, writer, host, path, content_type, body):
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    length = 0
+    for line in lines[1:]:
+        if line.lower().startswith("content-length:"):
+            length = int(line.split(":", 1)[1])
+    await reader.readexactly(length)
+    return status
+
+async def _client(host, port, requests, counter, total, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            i = counter[0]
+            if i >= total:
+                break
+            counter[0] += 1
+            path, content_type, body = requests[i % len(requests)]
+            start = time.perf_counter()
+            status = await _send(reader, writer, host, path, content_type, body)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+async def run_load(host, port, requests, clients, total):
+    counter = [0]
+    latencies = []
+    errors = []
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        _client(host, port, requests, counter, total, latencies, errors) for _ in range(clients)
+    ])
+    elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+def report(latencies, errors, elapsed):
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "throughput_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(cuts[49], 2),
+        "p90_ms": round(cuts[89], 2),
+        "p99_ms": round(cuts[98], 2),
+        "max_ms": round(max(latencies), 2),
+    }
+
+def _wait_for_port(host, port, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Service didn't start on {host}:{port}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the local scoring service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--endpoint", choices=ENDPOINTS, default="score")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent connections.")
+    parser.add_argument("--requests", type=int, default=1000, help="Total requests.")
+    parser.add_argument("--jds", type=int, default=2, help="Distinct JDs (fewer JDs = bigger micro-batches).")
+    parser.add_argument("--batch-size", type=int, default=16, help="Resumes per /score/batch request.")
+    parser.add_argument("--spawn", action="store_true", help="Start score_service.py for the test.")
+    parser.add_argument("--workers", type=int, default=None, help="Workers for the spawned service.")
+    args = parser.parse_args(argv)
+
+    requests = build_requests(args.endpoint, max(1, args.jds), 200, args.batch_size)
+
+    service = None
+    if args.spawn:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        command = [sys.executable, os.path.join(root, "score_service.py"), "--host", args.host, "--port", str(args.port)]
+        if args.workers:
+            command += ["--workers", str(args.workers)]
+        service = subprocess.Popen(command, cwd=root)
+    try:
+        _wait_for_port(args.host, args.port)
+        # A short warm-up, so connection setup and first-JD analysis aren't in the numbers
+        asyncio.run(run_load(args.host, args.port, requests, min(4, args.clients), min(50, args.requests)))
+        latencies, errors, elapsed = asyncio.run(run_load(args.host, args.port, requests, args.clients, args.requests))
+    finally:
+        if service:
+            service.send_signal(signal.SIGINT)   # Same as Ctrl+C: the service shuts its pool down
+            service.wait(timeout=30)
+
+    result = report(latencies, errors, elapsed)
+    print(json.dumps({"endpoint": args.endpoint, "clients": args.clients, **result}, indent=2))
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""
+Offline benchmark harness.
+
+    python -m benchmarks.run                  # run and print results
+    python -m benchmarks.run --save-baseline  # run and store benchmarks/baseline.json
+    python -m benchmarks.run --check          # run and fail (exit 1) on regressions
+
+Every timing is the median of several repeats (in milliseconds), so one slow or one
+lucky repeat doesn't move the result. --check and --save-baseline also run the whole
+suite several times (--runs) and keep each benchmark's median across runs, plus its
+noise (how far apart the runs were): a benchmark only fails when it moved by more
+than the threshold *and* well beyond its own noise. Baselines are machine-specific:
+save one on the machine (or CI runner) you compare against.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+# Keep benchmark caches out of the real .cache (and start cold every run)
+_CACHE_DIR = tempfile.mkdtemp(prefix="resume-bench-")
+os.environ["RESUME_CACHE_DIR"] = _CACHE_DIR
+
+from benchmarks.corpus import generate_corpus, generate_resume_lines, generate_jd, lines_to_pdf, generate_taxonomy
+from utils import ats_matcher, pdf_reader
+from utils.ats_matcher import extract_skills_from_text, match_skills
+from utils.bulk_screener import iter_screen_results, add_semantic_scores
+from utils.job_profile import get_job_profile
+from utils.report_generator import generate_pdf_report
+from utils.section_extractor import extract_sections
+from utils.semantic_matcher import calculate_semantic_match
+from utils.skill_taxonomy import build_index
+from utils.text_cleaner import clean_text
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_FILE = os.path.join(BENCH_DIR, "results", "latest.json")
+
+DEFAULT_THRESHOLD = 0.25   # Fail --check when a benchmark is >25% slower than its baseline
+MIN_DELTA_MS = 0.05        # ...and at least this much slower (microsecond-scale jitter is not a regression)
+NOISE_FACTOR = 2           # ...and by more than this many times its run-to-run noise
+DEFAULT_RUNS = 3           # Suite runs for --check and --save-baseline (a plain run does one)
+SEED = 42
+
+MIN_BATCH_SECONDS = 0.02   # Fast functions are looped until one timed batch takes this long
+
+def _calls_per_batch(func):
+    """Like timeit's autorange: how many calls make a batch long enough to time reliably."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= MIN_BATCH_SECONDS:
+            return number
+        number *= 10
+
+def measure(func, repeats=5, setup=None):
+    """
+    Median wall time of one func() call in milliseconds.
+    With setup (run untimed before each repeat), every repeat is a single call.
+    """
+    number = 1 if setup else _calls_per_batch(func)
+    timings = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) * 1000 / number)
+    return round(statistics.median(timings), 4)
+
+def _calibration_workload():
+    # Fixed pure-Python work: its time tracks how fast this machine is *right now*
+    total = 0
+    for i in range(200000):
+        total += i % 7
+    return total
+
+def calibrate(repeats=5):
+    """Timing of a fixed workload, used to cancel machine-speed drift between runs."""
+    return measure(_calibration_workload, repeats)
+
+def _resume(n_bullets, seed=SEED):
+    rng = random.Random(seed)
+    lines = generate_resume_lines(rng, n_bullets)
+    return "\n".join(lines), lines_to_pdf(lines), generate_jd(rng)
+
+def micro_benchmarks(lengths, repeats):
+    """Per-function timings at several resume lengths (number of experience bullets)."""
+    results = {}
+    for n_bullets in lengths:
+        raw_text, pdf_bytes, jd = _resume(n_bullets)
+        cleaned = clean_text(raw_text)
+        resume_skills = extract_skills_from_text(cleaned)
+        jd_skills = extract_skills_from_text(clean_text(jd))
+        missing = jd_skills - resume_skills
+
+        cases = {
+            # The uncached path, so we time real parsing and not the disk cache
+            "extract_text_from_pdf": lambda: pdf_reader._extract_text(BytesIO(pdf_bytes)),
+            "clean_text": lambda: clean_text(raw_text),
+            "extract_sections": lambda: extract_sections(cleaned),
+            "extract_skills_from_text": lambda: extract_skills_from_text(cleaned),
+            "match_skills": lambda: match_skills(resume_skills, jd_skills),
+            "calculate_semantic_match": lambda: calculate_semantic_match(cleaned, jd),
+            "generate_pdf_report": lambda: generate_pdf_report("Candidate", 72.5, 64.1, missing, "Learn **Docker**."),
+        }
+        for name, func in cases.items():
+            results[f"{name}[bullets={n_bullets}]"] = measure(func, repeats)
+    return results
+
+def taxonomy_benchmarks(sizes, repeats):
+    """Skill extraction as the taxonomy grows (the trie is swapped in temporarily)."""
+    results = {}
+    cleaned = clean_text(_resume(50)[0])
+    original_trie = ats_matcher._SKILL_TRIE
+    try:
+        for size in sizes:
+            index = build_index(generate_taxonomy(size))
+            ats_matcher._SKILL_TRIE = index["trie"]
+            results[f"extract_skills_from_text[taxonomy={size}]"] = measure(
+                lambda: extract_skills_from_text(cleaned), repeats
+            )
+    finally:
+        ats_matcher._SKILL_TRIE = original_trie
+    return results
+
+def _clear_pdf_cache():
+    shutil.rmtree(pdf_reader.PDF_CACHE.directory, ignore_errors=True)
+
+def bulk_benchmarks(batch_sizes, workers, repeats):
+    """
+    End-to-end bulk screening (extract + score + batched semantic) per batch size,
+    reported as total time and resumes per second. The PDF cache is cleared before each run.
+    """
+    results = {}
+    for batch_size in batch_sizes:
+        jd, files = generate_corpus(batch_size, seed=SEED)
+        job_profile = get_job_profile(jd)
+
+        def run():
+            rows = [None] * len(files)
+            texts = [None] * len(files)
+            for i, row, text in iter_screen_results(files, job_profile, max_workers=workers):
+                rows[i] = row
+                texts[i] = text
+            add_semantic_scores(rows, texts, job_profile)
+
+        # One untimed run warms the process pool
+        run()
+        elapsed = measure(run, repeats, setup=_clear_pdf_cache)
+        results[f"bulk_screen[batch={batch_size},workers={workers}]"] = elapsed
+        results[f"bulk_throughput_per_s[batch={batch_size},workers={workers}]"] = round(batch_size / (elapsed / 1000), 2)
+    return results
+
+def run_all(quick=False, workers=None):
+    repeats = 3 if quick else 5
+    lengths = (10, 50) if quick else (10, 50, 200)
+    sizes = (100, 1000) if quick else (100, 1000, 10000)
+    batches = (10,) if quick else (10, 50, 200)
+    workers = workers or os.cpu_count() or 1
+
+    results = {"calibration": calibrate(repeats)}
+    results.update(micro_benchmarks(lengths, repeats))
+    results.update(taxonomy_benchmarks(sizes, repeats))
+    results.update(bulk_benchmarks(batches, workers, max(1, repeats // 2)))
+    return results
+
+def run_repeated(runs, quick=False, workers=None):
+    """
+    Runs the whole suite `runs` times. Returns (results, noise): per benchmark, the
+    median across runs and its noise, the spread between runs relative to that
+    median ((max - min) / median, 0 with a single run).
+    """
+    all_results = [run_all(quick, workers) for _ in range(max(1, runs))]
+    results, noise = {}, {}
+    for name in all_results[0]:
+        values = [r[name] for r in all_results]
+        median = statistics.median(values)
+        results[name] = round(median, 2 if "_per_s" in name else 4)
+        noise[name] = round((max(values) - min(values)) / median, 4) if median else 0.0
+    return results, noise
+
+def machine_info():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+def check_regressions(results, baseline, threshold, noise=None, baseline_noise=None):
+    """
+    Compares results against the baseline. Timings regress when they grow by more than
+    `threshold`; throughputs (keys containing "_per_s") regress when they drop by more.
+    Both sides are first scaled by their "calibration" timing, so a machine that is
+    uniformly slower today (CPU throttling, noisy neighbours) doesn't fail the check
+    (a faster calibration is ignored). A benchmark whose runs are noisy (on either side)
+    must also move by more than NOISE_FACTOR times that noise, so jitter alone never fails.
+    Returns a list of human-readable failures.
+    """
+    noise, baseline_noise = noise or {}, baseline_noise or {}
+    speed = 1.0
+    if results.get("calibration") and baseline.get("calibration"):
+        # Only ever excuses a slower machine: a faster calibration loop doesn't mean C
+        # extensions or worker processes got faster too, so it must not inflate their times
+        speed = max(1.0, results["calibration"] / baseline["calibration"])
+
+    failures = []
+    for name, base in baseline.items():
+        current = results.get(name)
+        if current is None or not base or name == "calibration":
+            continue
+        # Express the current result at the baseline machine's speed
+        current = round(current * speed if "_per_s" in name else current / speed, 4)
+        if "_per_s" in name:
+            change = (base - current) / base
+        else:
+            if current - base < MIN_DELTA_MS:
+                continue
+            change = (current - base) / base
+        allowed = max(threshold, NOISE_FACTOR * max(noise.get(name, 0.0), baseline_noise.get(name, 0.0)))
+        if change > allowed:
+            failures.append(f"{name}: {base} -> {current} ({change:+.0%}, allowed {allowed:.0%})")
+    return failures
+
+def _write_json(path, payload):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the resume analyzer.")
+    parser.add_argument("--quick", action="store_true", help="Fewer sizes and repeats (for CI smoke runs).")
+    parser.add_argument("--workers", type=int, default=None, help="Bulk screening workers (default: all CPUs).")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Store results as {BASELINE_FILE}.")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any benchmark regressed past the threshold.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown (0.25 = 25%%).")
+    parser.add_argument("--runs", type=int, default=None,
+                        help=f"Whole-suite runs, keeping each benchmark's median (default: {DEFAULT_RUNS} "
+                             "with --check or --save-baseline, else 1).")
+    args = parser.parse_args(argv)
+    runs = args.runs or (DEFAULT_RUNS if args.check or args.save_baseline else 1)
+
+    try:
+        results, noise = run_repeated(runs, quick=args.quick, workers=args.workers)
+    finally:
+        shutil.rmtree(_CACHE_DIR, ignore_errors=True)
+
+    for name, value in results.items():
+        unit = "/s" if "_per_s" in name else " ms"
+        spread = f"  ±{noise[name] / 2:.0%}" if runs > 1 else ""
+        print(f"{name:<60} {value:>12}{unit}{spread}")
+
+    payload = {"machine": machine_info(), "runs": runs, "results": results, "noise": noise}
+    _write_json(RESULTS_FILE, payload)
+
+    if args.save_baseline:
+        _write_json(BASELINE_FILE, payload)
+        print(f"\nBaseline saved to {BASELINE_FILE}")
+
+    if args.check:
+        if not os.path.exists(BASELINE_FILE):
+            print("\nNo baseline found: run with --save-baseline first.")
+            return 1
+        with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        failures = check_regressions(results, baseline["results"], args.threshold, noise, baseline.get("noise"))
+        if failures:
+            print(f"\n{len(failures)} regression(s) beyond {args.threshold:.0%}:")
+            for failure in failures:
+                print(f"  {failure}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
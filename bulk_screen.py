@@ -0,0 +1,286 @@
+"""
+Headless bulk screening: the same pipeline as the app's HR Mode, from the command line.
+
+    python bulk_screen.py --jd job.txt resumes/ -o results.csv
+    python bulk_screen.py --jd job.txt resumes.zip -o results.parquet --workers 8
+
+Results are written as they arrive. Completed files are checkpointed, so if the run is
+interrupted, running the same command again picks up where it stopped. A file that fails
+gets a row with its error (and is checkpointed like the others, so it isn't retried forever).
+
+Semantic scores use the app's persistent IDF model, pinned to one revision for the whole
+run (the latest, or --idf-revision; a resumed run keeps the revision it started with), so
+they match the app's scores and don't depend on which batch a resume was screened in.
+Until the model has enough documents, each resume is scored against the JD alone.
+"""
+import argparse
+import csv
+import json
+import os
+import shutil
+import sys
+import time
+import zipfile
+
+from utils.bulk_screener import iter_screen_results, DEFAULT_WORKERS
+from utils.idf_model import load_idf_model
+from utils.job_profile import get_job_profile, hash_jd
+from utils import metrics
+
+COLUMNS = ["Candidate Name", "ATS Match", "Semantic Match", "Missing Skills", "IDF Revision", "Error"]
+
+# Results are flushed (and checkpointed) every this many resumes
+DEFAULT_FLUSH_EVERY = 100
+
+def iter_pdf_names(source):
+    """Sorted PDF names in a directory (recursive, relative paths) or a .zip archive."""
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            return sorted(
+                info.filename for info in archive.infolist()
+                if not info.is_dir() and info.filename.lower().endswith(".pdf")
+            )
+    names = []
+    for root, _, files in os.walk(source):
+        for file_name in files:
+            if file_name.lower().endswith(".pdf"):
+                names.append(os.path.relpath(os.path.join(root, file_name), source))
+    return sorted(names)
+
+def iter_pdf_files(source, names):
+    """Yields (name, pdf_bytes), reading each file only when the pool is ready for it."""
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for name in names:
+                yield name, archive.read(name)
+    else:
+        for name in names:
+            with open(os.path.join(source, name), "rb") as f:
+                yield name, f.read()
+
+def _fsync(f):
+    f.flush()
+    os.fsync(f.fileno())
+
+class Checkpoint:
+    """
+    Append-only JSON-lines log of flushed batches. Each line lists the files in the
+    batch plus where the output stood once they were written (CSV size in bytes, or
+    the number of Parquet parts), so a resumed run can cut off anything written after
+    the last checkpoint and never duplicates or loses a row. The state also pins the
+    IDF model revision the run scores with, and records the JD and source it belongs to.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        self.state = {"csv_bytes": 0, "parquet_parts": 0, "idf_revision": None, "jd_hash": None, "source": None}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break   # Torn last line from a crash: everything before it is valid
+                    self.done.update(entry["files"])
+                    self.state = entry["state"]
+
+    def commit(self, files, state):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"files": files, "state": state, "time": time.time()}) + "\n")
+            _fsync(f)
+        self.done.update(files)
+        self.state = state
+
+class CsvSink:
+    def __init__(self, path, state):
+        self.path = path
+        # Drop rows written after the last checkpoint (they're screened again)
+        if os.path.exists(path):
+            with open(path, "r+b") as f:
+                f.truncate(state["csv_bytes"])
+        self.file = open(path, "a", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=COLUMNS)
+        if self.file.tell() == 0:
+            self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+        _fsync(self.file)
+        return {"csv_bytes": os.fstat(self.file.fileno()).st_size, "parquet_parts": 0}
+
+    def finish(self):
+        pass
+
+    def close(self):
+        self.file.close()
+
+class ParquetSink:
+    """
+    Parquet files can't be appended to, so each flush is written as one part file
+    (atomically) and the parts are combined into the final file when the run completes.
+    """
+
+    def __init__(self, path, state):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise RuntimeError("Parquet output needs pyarrow (pip install pyarrow); "
+                               "or write a .csv file instead.") from None
+
+        self.path = path
+        self.parts_dir = f"{path}.parts"
+        self.parts = state["parquet_parts"]
+        os.makedirs(self.parts_dir, exist_ok=True)
+        # Drop parts (and temp files) written after the last checkpoint
+        keep = {os.path.basename(self._part_path(n)) for n in range(self.parts)}
+        for file_name in os.listdir(self.parts_dir):
+            if file_name not in keep:
+                os.remove(os.path.join(self.parts_dir, file_name))
+
+    def _part_path(self, n):
+        return os.path.join(self.parts_dir, f"part-{n:06d}.parquet")
+
+    def write(self, rows):
+        import pandas as pd
+
+        path = self._part_path(self.parts)
+        pd.DataFrame(rows, columns=COLUMNS).to_parquet(f"{path}.tmp", index=False, engine="pyarrow")
+        os.replace(f"{path}.tmp", path)
+        self.parts += 1
+        return {"csv_bytes": 0, "parquet_parts": self.parts}
+
+    def finish(self):
+        """Combines every part into the final Parquet file (only once the run is complete)."""
+        import pyarrow.parquet as pq
+
+        if not self.parts:
+            return
+        table = pq.ParquetDataset([self._part_path(n) for n in range(self.parts)]).read()
+        pq.write_table(table, f"{self.path}.tmp")
+        os.replace(f"{self.path}.tmp", self.path)
+
+    def close(self):
+        pass
+
+def _to_output_row(row):
+    return {"Error": "", **row, "Missing Skills": ", ".join(row["Missing Skills"])}
+
+class CheckpointMismatch(Exception):
+    """The output's checkpoint was written for another JD or source folder."""
+
+def _check_run(checkpoint, run_id, output):
+    """Refuses to resume a checkpoint that belongs to a different JD or source."""
+    labels = {"jd_hash": "Job Description", "source": "source"}
+    for field, value in run_id.items():
+        recorded = checkpoint.state.get(field)
+        if checkpoint.done and recorded is not None and recorded != value:
+            raise CheckpointMismatch(
+                f"{output} was started with a different {labels[field]}: "
+                "use --restart to screen everything again, or write to another -o file."
+            )
+
+def _pick_revision(checkpoint, requested):
+    """The IDF revision to score with: the checkpoint's (resumed run), the requested one, or the latest."""
+    if checkpoint.done and "idf_revision" in checkpoint.state:
+        return checkpoint.state["idf_revision"]
+    if requested is not None:
+        return load_idf_model(requested).scored_revision   # Raises if that revision isn't on disk
+    return load_idf_model().scored_revision
+
+def run(jd_text, source, output, workers=DEFAULT_WORKERS, flush_every=DEFAULT_FLUSH_EVERY, restart=False,
+        idf_revision=None, log=print):
+    """Screens every PDF in `source` into `output`. Returns the number of resumes screened in this run."""
+    checkpoint_path = f"{output}.checkpoint"
+    if restart:
+        for path in (output, checkpoint_path):
+            if os.path.exists(path):
+                os.remove(path)
+        shutil.rmtree(f"{output}.parts", ignore_errors=True)
+
+    checkpoint = Checkpoint(checkpoint_path)
+    run_id = {"jd_hash": hash_jd(jd_text), "source": os.path.abspath(source)}
+    _check_run(checkpoint, run_id, output)
+    names = [name for name in iter_pdf_names(source) if name not in checkpoint.done]
+    log(f"{len(checkpoint.done)} already screened, {len(names)} to go.")
+
+    revision = _pick_revision(checkpoint, idf_revision)
+    if idf_revision is not None and idf_revision != revision:
+        log(f"Resuming: keeping IDF revision {revision} from the checkpoint (--restart to use {idf_revision}).")
+    if revision is None:
+        log("IDF model not ready yet: semantic scores use the JD and each resume alone.")
+    else:
+        log(f"Semantic scores use IDF model revision {revision}.")
+
+    sink_class = ParquetSink if output.lower().endswith(".parquet") else CsvSink
+    sink = sink_class(output, checkpoint.state)
+
+    profile = get_job_profile(jd_text)
+    batch = []
+    screened = 0
+    failed = 0
+    started = time.perf_counter()
+
+    def flush():
+        checkpoint.commit([r["Candidate Name"] for r in batch], {**sink.write(batch), "idf_revision": revision, **run_id})
+        batch.clear()
+
+    try:
+        results = iter_screen_results(
+            iter_pdf_files(source, names), profile, workers, semantic=True, idf_revision=revision
+        )
+        for screened, (_, row, _) in enumerate(results, start=1):
+            if row.get("Error"):
+                failed += 1
+                log(f"Failed: {row['Candidate Name']} ({row['Error']})")
+            batch.append(_to_output_row(row))
+            if len(batch) >= flush_every:
+                flush()
+                rate = screened / (time.perf_counter() - started)
+                log(f"{screened}/{len(names)} screened ({rate:.1f} resumes/s)")
+    finally:
+        # Keep what finished even if we were interrupted or a worker crashed
+        if batch:
+            flush()
+        sink.close()
+
+    sink.finish()
+
+    log(f"Done: {screened} screened in this run ({failed} failed), results in {output}")
+    for cache, stats in metrics.cache_stats().items():
+        log(f"{cache}: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
+    return screened
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen a folder or .zip of resume PDFs against a Job Description.")
+    parser.add_argument("source", help="Directory (searched recursively) or .zip archive of PDFs.")
+    parser.add_argument("--jd", required=True, help="Text file with the Job Description.")
+    parser.add_argument("-o", "--output", default="results.csv", help="Output .csv or .parquet file.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Worker processes (default: all CPUs).")
+    parser.add_argument("--flush-every", type=int, default=DEFAULT_FLUSH_EVERY, help="Resumes per write/checkpoint.")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over.")
+    parser.add_argument("--idf-revision", type=int, default=None,
+                        help="IDF model revision for semantic scores (default: the latest; a resumed run keeps its own).")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.source):
+        parser.error(f"{args.source} does not exist")
+    if args.output.lower().endswith(".parquet"):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error("Parquet output needs pyarrow (pip install pyarrow); or use -o results.csv")
+    with open(args.jd, "r", encoding="utf-8") as f:
+        jd_text = f.read()
+
+    try:
+        run(jd_text, args.source, args.output, args.workers, max(1, args.flush_every), args.restart, args.idf_revision)
+    except CheckpointMismatch as e:
+        parser.error(str(e))
+    except KeyboardInterrupt:
+        print("\nInterrupted: run the same command again to resume.", file=sys.stderr)
+        return 130
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""
+Local HTTP scoring service (stdlib asyncio, no web framework).
+
+    python score_service.py --port 8080 --workers 4
+
+    POST /score        {"jd": "...", "resume_text": "..."}         -> one result
+    POST /score/batch  {"jd": "...", "resume_texts": ["...", ...]}  -> {"results": [...]}
+    POST /extract      raw PDF bytes (Content-Type: application/pdf) -> {"text": "..."}
+    GET  /health
+
+Scoring runs in a pre-warmed process pool (sklearn, pdfplumber and the skill index are
+loaded before the first request). Concurrent /score requests for the same JD are
+coalesced into one batched vectorization. Semantic scores use the app's persistent IDF
+model, pinned to one revision when the service starts (the latest, or --idf-revision),
+or are pairwise (JD vs. one resume) until the model has enough documents. Either way a
+result never depends on which other requests shared its batch, and every result
+names the revision it was scored with ("idf_revision", null for pairwise).
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.bulk_screener import score_resume_texts, DEFAULT_WORKERS
+from utils.idf_model import load_idf_model
+from utils.job_profile import hash_jd
+from utils.pdf_reader import extract_text_from_bytes, MAX_FILE_BYTES
+
+BATCH_WINDOW_MS = 5      # How long a /score request waits for others with the same JD
+MAX_BATCH = 64           # A full batch is sent right away
+MAX_BODY_BYTES = MAX_FILE_BYTES + 1024 * 1024
+MAX_HEADER_BYTES = 16 * 1024
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def _warm_worker(idf_revision):
+    """Runs once in each worker: imports and loads everything a request needs."""
+    import pdfplumber  # noqa: F401
+    score_resume_texts(["python developer"], "python developer", idf_revision)
+
+def _ping():
+    return os.getpid()
+
+def start_pool(max_workers, idf_revision=None):
+    """Starts every worker now (not on the first request) and waits until they're warm."""
+    pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_warm_worker, initargs=(idf_revision,))
+    for future in [pool.submit(_ping) for _ in range(max_workers * 2)]:
+        future.result()
+    return pool
+
+class MicroBatcher:
+    """
+    Collects /score requests per JD hash for up to `window` seconds (or `max_batch`
+    requests), then scores them with one score_resume_texts call in the pool
+    (with IdfModel revision idf_revision, or pairwise when it is None).
+    """
+
+    def __init__(self, pool, window=BATCH_WINDOW_MS / 1000, max_batch=MAX_BATCH, idf_revision=None):
+        self.pool = pool
+        self.idf_revision = idf_revision
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = {}   # jd_hash -> (jd_text, [(resume_text, future), ...])
+        self.batches = 0
+        self.requests = 0
+
+    async def score(self, jd_text, resume_text):
+        loop = asyncio.get_running_loop()
+        key = hash_jd(jd_text)
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = (jd_text, [])
+            loop.call_later(self.window, self._flush, key, batch)
+        future = loop.create_future()
+        batch[1].append((resume_text, future))
+        if len(batch[1]) >= self.max_batch:
+            self._flush(key, batch)
+        return await future
+
+    def _flush(self, key, batch):
+        # The timer of a batch that was already sent (because it filled up) does nothing
+        if self._pending.get(key) is not batch:
+            return
+        del self._pending[key]
+        jd_text, items = batch
+        self.batches += 1
+        self.requests += len(items)
+
+        work = asyncio.wrap_future(self.pool.submit(
+            score_resume_texts, [text for text, _ in items], jd_text, self.idf_revision
+        ))
+
+        def deliver(done):
+            error = done.exception()
+            for i, (_, future) in enumerate(items):
+                if future.done():
+                    continue   # Client went away
+                if error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(done.result()[i])
+
+        work.add_done_callback(deliver)
+
+class ScoreService:
+    def __init__(self, pool, batcher):
+        self.pool = pool
+        self.batcher = batcher
+        self.started = time.time()
+
+    async def _run(self, func, *args):
+        return await asyncio.wrap_future(self.pool.submit(func, *args))
+
+    @staticmethod
+    def _json(body):
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise HttpError(400, "Body must be JSON.")
+        if not isinstance(payload, dict):
+            raise HttpError(400, "Body must be a JSON object.")
+        return payload
+
+    @staticmethod
+    def _text_field(payload, name):
+        value = payload.get(name)
+        if not isinstance(value, str):
+            raise HttpError(400, f"'{name}' must be a string.")
+        return value
+
+    async def route(self, method, path, body):
+        if path == "/health":
+            return {
+                "status": "ok",
+                "uptime_s": round(time.time() - self.started, 1),
+                "batches": self.batcher.batches,
+                "batched_requests": self.batcher.requests,
+                "idf_revision": self.batcher.idf_revision,
+            }
+        if path not in ("/score", "/score/batch", "/extract"):
+            raise HttpError(404, f"No route for {path}.")
+        if method != "POST":
+            raise HttpError(405, f"{path} only accepts POST.")
+
+        if path == "/extract":
+            text = await self._run(extract_text_from_bytes, body)
+            if text.startswith("Error"):
+                raise HttpError(400, text)
+            return {"text": text}
+
+        payload = self._json(body)
+        jd_text = self._text_field(payload, "jd")
+        if path == "/score":
+            return await self.batcher.score(jd_text, self._text_field(payload, "resume_text"))
+
+        texts = payload.get("resume_texts")
+        if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+            raise HttpError(400, "'resume_texts' must be a list of strings.")
+        # An explicit batch is already one vectorization: no need to wait for others
+        return {"results": await self._run(score_resume_texts, texts, jd_text, self.batcher.idf_revision)}
+
+    async def handle(self, reader, writer):
+        """One connection: HTTP/1.1 requests with keep-alive, until the client closes."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                status, result, keep_alive = await self._respond(reader, head)
+                body = json.dumps(result).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, reader, head):
+        """Returns (status, json_result, keep_alive) for one request."""
+        keep_alive = False
+        try:
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ")
+            except ValueError:
+                raise HttpError(400, "Malformed request line.")
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+            keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+            try:
+                length = int(headers.get("content-length", 0) or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                keep_alive = False   # We can't tell where the body ends
+                raise HttpError(400, "Invalid Content-Length.")
+            if length > MAX_BODY_BYTES:
+                keep_alive = False   # We won't read the body, so the connection can't be reused
+                raise HttpError(413, f"Body is larger than {MAX_BODY_BYTES} bytes.")
+            body = await reader.readexactly(length) if length else b""
+
+            return 200, await self.route(method, target.split("?", 1)[0], body), keep_alive
+        except HttpError as e:
+            return e.status, {"error": str(e)}, keep_alive
+        except asyncio.IncompleteReadError:
+            return 400, {"error": "Body shorter than Content-Length."}, False
+        except Exception as e:
+            return 500, {"error": f"{type(e).__name__}: {e}"}, keep_alive
+
+async def serve(host, port, workers, window_ms, max_batch, idf_revision=None):
+    # Pinned for the service's lifetime, so the same request always gets the same score
+    revision = load_idf_model(idf_revision).scored_revision   # Raises if that revision isn't on disk
+    pool = start_pool(workers, revision)
+    service = ScoreService(pool, MicroBatcher(pool, window_ms / 1000, max_batch, revision))
+    server = await asyncio.start_server(service.handle, host, port, limit=MAX_HEADER_BYTES)
+    semantic = f"IDF model revision {revision}" if revision is not None else "pairwise semantic scores"
+    print(f"Scoring service on http://{host}:{port} ({workers} warm workers, {semantic})", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local HTTP service for ATS and semantic scores.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Worker processes (default: all CPUs).")
+    parser.add_argument("--batch-window-ms", type=float, default=BATCH_WINDOW_MS,
+                        help="How long /score waits to batch requests with the same JD.")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--idf-revision", type=int, default=None,
+                        help="IDF model revision for semantic scores (default: the latest).")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, max(1, args.workers), args.batch_window_ms, max(1, args.max_batch),
+                          args.idf_revision))
+    except KeyboardInterrupt:
+        pass
+    except FileNotFoundError as e:
+        parser.error(str(e))
+
+if __name__ == "__main__":
+    main()
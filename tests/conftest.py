@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+
+# Keep test caches (PDF text, IDF model, metrics) out of the real .cache
+os.environ["RESUME_CACHE_DIR"] = tempfile.mkdtemp(prefix="resume-tests-")
+
+# Run from anywhere: the app's modules are imported from the repo root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from utils.ats_matcher import (
+    SKILL_KEYWORDS, SKILL_SYNONYMS, extract_skills_from_text, find_skill_evidence, match_skills,
+    normalize_skills, skills_without_evidence,
+)
+from utils.text_cleaner import clean_text
+
+ALIASED_EXPERIENCE = "Built the UI in ReactJS and Node.js\nWrote Python3 scripts\nStyled pages with HTML5 and CSS3"
+
+@pytest.mark.parametrize("experience", [ALIASED_EXPERIENCE, clean_text(ALIASED_EXPERIENCE)])
+def test_spelling_variants_count_as_evidence(experience):
+    skills = ["python", "css", "node", "react", "html"]
+    assert skills_without_evidence(skills, experience) == []
+
+def test_loose_aliases_do_not_count_as_evidence():
+    experience = "analysis in pandas, deployed on kubernetes, wrote typescript"
+    assert skills_without_evidence(["python", "docker", "js"], experience) == ["python", "docker", "js"]
+
+def test_evidence_is_whole_words_and_points_at_the_first_mention():
+    experience = "Googled a lot\nShipped a Go service\nMore Go later"
+    evidence = find_skill_evidence(["go", "r", "node"], experience)
+    start, end = evidence["go"]
+    assert experience[start:end] == "Go" and start == experience.index("Go service")
+    assert evidence["r"] is None and evidence["node"] is None
+    nodejs = "Wrote APIs in Node.js"
+    start, end = find_skill_evidence(["node"], nodejs)["node"]
+    assert nodejs[start:end] == "Node.js"
+
+def baseline_extract_skills(text):
+    """The original padded-substring scan, over the same taxonomy."""
+    text = text.lower()
+    found_skills = set()
+    for skill in SKILL_KEYWORDS:
+        if f" {skill} " in f" {text} ":
+            found_skills.add(skill)
+    for main, aliases in SKILL_SYNONYMS.items():
+        for alias in aliases:
+            if f" {alias} " in f" {text} ":
+                found_skills.add(main)
+    return found_skills
+
+def test_trie_matches_the_baseline_scan():
+    # Space-separated words: where the padded scan sees word boundaries correctly
+    phrases = list(SKILL_KEYWORDS) + [alias for aliases in SKILL_SYNONYMS.values() for alias in aliases]
+    vocab = [word for phrase in phrases for word in phrase.split()]
+    vocab += ["google", "golang", "pythonic", "the", "with", "Built", "REACT", "Node.JS"]
+    rng = random.Random(0)
+    for _ in range(3000):
+        text = " ".join(rng.choice(vocab) for _ in range(rng.randint(0, 30)))
+        assert extract_skills_from_text(text) == baseline_extract_skills(text), text
+
+def test_trie_matches_next_to_punctuation():
+    found = extract_skills_from_text("Skills: Python, C++, Node.js; machine learning (ML). Google Go.")
+    assert {"python", "c++", "node", "ml", "go"} <= found
+    assert "go" not in extract_skills_from_text("google golang-ish")
+
+def test_match_skills_normalizes_aliases():
+    assert normalize_skills({"ReactJS", " Python3 ", "unknown"}) == {"react", "python", "unknown"}
+    percent, matched, missing = match_skills({"reactjs", "python"}, {"react", "python", "sql", "aws"})
+    assert (percent, matched, missing) == (50, {"react", "python"}, {"sql", "aws"})
+    assert match_skills({"python"}, set()) == (0, set(), set())
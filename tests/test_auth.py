@@ -0,0 +1,132 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+from datetime import date
+
+import pytest
+
+from utils import auth
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A fresh database (and legacy JSON path) per test."""
+    monkeypatch.setattr(auth, "DB_FILE", str(tmp_path / "users.db"))
+    monkeypatch.setattr(auth, "LEGACY_JSON_FILE", str(tmp_path / "users.json"))
+    monkeypatch.setattr(auth, "_conn", None)
+    yield tmp_path
+    if auth._conn is not None:
+        auth._conn.close()
+
+def _reopen():
+    auth._conn.close()
+    auth._conn = None
+
+def _add_history(email, rows):
+    """Inserts (date, match_score, semantic_score) rows with fixed dates."""
+    auth._get_conn().executemany(
+        "INSERT INTO history (email, date, match_score, semantic_score, missing_count) VALUES (?, ?, ?, ?, 0)",
+        [(email, day, match, semantic) for day, match, semantic in rows],
+    )
+
+def test_json_migration_skips_malformed_records(db, caplog):
+    legacy = {
+        "ok@x.com": {"password": "pw", "name": "Ok", "history": [
+            {"date": "2024-01-01 10:00", "match_score": 70, "semantic_score": 55.5, "missing_count": 2},
+            {"date": "2024-01-02 09:00"},                       # Scores missing: kept as NULLs
+            {"match_score": 10},                                # No date: skipped
+            "not a record",                                     # Skipped
+        ]},
+        "noname@x.com": {"password": "pw2", "history": None},   # Name defaults to the email
+        "nopass@x.com": {"name": "No Password"},                # Skipped
+        "broken@x.com": "not a user",                           # Skipped
+    }
+    (db / "users.json").write_text(json.dumps(legacy))
+
+    with caplog.at_level(logging.WARNING, logger=auth.__name__):
+        users = auth.load_users()
+    assert set(users) == {"ok@x.com", "noname@x.com"}
+    assert users["noname@x.com"]["name"] == "noname@x.com"
+    assert users["ok@x.com"]["history"] == [
+        {"date": "2024-01-01 10:00", "match_score": 70, "semantic_score": 55.5, "missing_count": 2},
+        {"date": "2024-01-02 09:00", "match_score": None, "semantic_score": None, "missing_count": None},
+    ]
+    assert len([r for r in caplog.records if "Skipping" in r.getMessage()]) == 4
+
+    # Marked as done: reopening doesn't import the same records twice
+    _reopen()
+    assert len(auth.get_user_history("ok@x.com")) == 2
+    assert auth.authenticate("ok@x.com", "pw") == "Ok"
+
+def test_unreadable_legacy_json_still_completes(db):
+    (db / "users.json").write_text("{not json")
+    assert auth.load_users() == {}
+    assert auth._get_conn().execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone()
+
+def test_paging_boundaries(db):
+    auth.save_user("a@x.com", "pw", "A")
+    _add_history("a@x.com", [(f"2024-01-0{i} 12:00", i, i) for i in range(1, 6)])
+
+    scores = lambda rows: [r["match_score"] for r in rows]
+    assert scores(auth.get_user_history("a@x.com")) == [1, 2, 3, 4, 5]
+    assert scores(auth.get_user_history("a@x.com", limit=2)) == [1, 2]
+    assert scores(auth.get_user_history("a@x.com", limit=2, offset=4)) == [5]
+    assert scores(auth.get_user_history("a@x.com", limit=2, offset=5)) == []
+    assert scores(auth.get_user_history("a@x.com", limit=2, offset=1, newest_first=True)) == [4, 3]
+    assert scores(auth.get_user_history("a@x.com", offset=3)) == [4, 5]
+    assert auth.get_user_history("b@x.com") == []
+
+def test_date_filter_includes_both_end_days(db):
+    auth.save_user("a@x.com", "pw", "A")
+    _add_history("a@x.com", [
+        ("2024-01-01 23:59", 1, 1),
+        ("2024-01-02 00:00", 2, 2),
+        ("2024-01-03 23:59", 3, 3),
+        ("2024-01-04 00:00", 4, 4),
+    ])
+    rows = auth.get_user_history("a@x.com", start="2024-01-02", end="2024-01-03")
+    assert [r["match_score"] for r in rows] == [2, 3]
+    # date objects and full timestamps work too (only the day counts)
+    rows = auth.get_user_history("a@x.com", start=date(2024, 1, 2), end="2024-01-03 00:00")
+    assert [r["match_score"] for r in rows] == [2, 3]
+    assert auth.count_user_history("a@x.com", end=date(2024, 1, 1)) == 1
+    assert auth.count_user_history("a@x.com", start="2024-01-04") == 1
+
+def test_history_needs_a_known_user_and_records_the_revision(db):
+    auth.save_history("ghost@x.com", 50, 40.0, ["sql"])
+    assert auth.get_history_version("ghost@x.com") == 0
+    auth.save_user("a@x.com", "pw", "A")
+    assert not auth.save_user("a@x.com", "other", "Again")
+    auth.save_history("a@x.com", 50, 40.0, ["sql", "aws"], idf_revision=7)
+    (row,) = auth.get_user_history("a@x.com")
+    assert (row["missing_count"], row["idf_revision"]) == (2, 7)
+    assert auth.get_history_version("a@x.com") > 0
+
+def test_paths_do_not_depend_on_the_working_directory(tmp_path):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(auth.__file__)))
+    env = {k: v for k, v in os.environ.items() if k not in ("RESUME_DB_FILE", "RESUME_LEGACY_JSON_FILE")}
+    env["PYTHONPATH"] = root
+    out = subprocess.run(
+        [sys.executable, "-c", "from utils import auth; print(auth.DB_FILE); print(auth.LEGACY_JSON_FILE)"],
+        cwd=tmp_path, env=env, capture_output=True, text=True, check=True,
+    ).stdout.split()
+    assert out == [os.path.join(root, "users.db"), os.path.join(root, "users.json")]
+
+def test_summary_has_none_averages_for_days_without_scores(db):
+    auth.save_user("a@x.com", "pw", "A")
+    _add_history("a@x.com", [
+        ("2024-01-01 09:00", 60, 40.0),
+        ("2024-01-01 18:00", 80, None),
+        ("2024-01-02 10:00", None, None),     # Legacy record without scores
+        ("2024-01-03 10:00", 50, 33.333),
+    ])
+    summary = auth.get_history_summary("a@x.com")
+    assert [day["date"] for day in summary] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    first, empty, last = summary
+    assert (first["runs"], first["match_min"], first["match_mean"], first["match_max"]) == (2, 60, 70.0, 80)
+    assert first["semantic_mean"] == 40.0
+    assert empty["runs"] == 1
+    assert (empty["match_mean"], empty["semantic_mean"], empty["match_min"]) == (None, None, None)
+    assert last["semantic_mean"] == 33.33
+    assert [day["date"] for day in auth.get_history_summary("a@x.com", start="2024-01-02", end="2024-01-02")] == ["2024-01-02"]
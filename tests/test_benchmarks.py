@@ -0,0 +1,36 @@
+from benchmarks import run
+from benchmarks.run import check_regressions
+
+BASELINE = {"calibration": 10.0, "parse": 10.0, "tiny": 0.01, "bulk_per_s": 100.0}
+
+def test_slowdowns_beyond_the_threshold_fail():
+    results = {"calibration": 10.0, "parse": 13.0, "tiny": 0.05, "bulk_per_s": 70.0}
+    failures = check_regressions(results, BASELINE, threshold=0.25)
+    assert [f.split(":")[0] for f in failures] == ["parse", "bulk_per_s"]   # tiny: below MIN_DELTA_MS
+
+def test_calibration_cancels_a_uniformly_slower_machine():
+    results = {"calibration": 20.0, "parse": 20.0, "tiny": 0.02, "bulk_per_s": 50.0}
+    assert check_regressions(results, BASELINE, threshold=0.25) == []
+
+def test_a_faster_calibration_does_not_inflate_other_timings():
+    results = {"calibration": 7.0, "parse": 11.0, "tiny": 0.01, "bulk_per_s": 95.0}
+    assert check_regressions(results, BASELINE, threshold=0.25) == []
+
+def test_noisy_benchmarks_need_to_move_beyond_their_noise():
+    results = {"calibration": 10.0, "parse": 12.8, "tiny": 0.01, "bulk_per_s": 100.0}
+    assert check_regressions(results, BASELINE, 0.25, noise={"parse": 0.15}) == []
+    assert check_regressions(results, BASELINE, 0.25, baseline_noise={"parse": 0.15}) == []
+
+    # Quiet on both sides: the plain threshold applies
+    assert len(check_regressions(results, BASELINE, 0.25, {"parse": 0.02}, {"parse": 0.01})) == 1
+    # Far beyond the noise still fails
+    results["parse"] = 20.0
+    assert len(check_regressions(results, BASELINE, 0.25, {"parse": 0.15})) == 1
+
+def test_repeated_runs_keep_the_median_and_the_spread(monkeypatch):
+    runs = iter([{"parse": 10.0, "bulk_per_s": 30.0}, {"parse": 14.0, "bulk_per_s": 40.0},
+                 {"parse": 11.0, "bulk_per_s": 50.0}])
+    monkeypatch.setattr(run, "run_all", lambda quick, workers: next(runs))
+    results, noise = run.run_repeated(3)
+    assert results == {"parse": 11.0, "bulk_per_s": 40.0}
+    assert noise == {"parse": round(4 / 11, 4), "bulk_per_s": 0.5}
@@ -0,0 +1,78 @@
+import pytest
+
+from utils import disk_cache, llm_engine
+from utils.bulk_advice import (
+    MAX_CANDIDATES_PER_PROMPT, build_group_prompt, generate_bulk_advice, parse_group_reply, skill_signature,
+)
+from utils.disk_cache import DiskCache
+from utils.llm_engine import StubBackend
+
+class CountingBackend(StubBackend):
+    """Stub answers, plus the prompts it was actually asked."""
+
+    def __init__(self):
+        super().__init__()
+        self.prompts = []
+
+    async def stream(self, prompt):
+        self.prompts.append(prompt)
+        async for chunk in super().stream(prompt):
+            yield chunk
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_cache, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(llm_engine, "RESPONSE_CACHE", DiskCache("llm", 1 << 20))
+    return CountingBackend()
+
+def _candidate(skills, name):
+    return {"missing_skills": skills, "resume_text": f"Resume of {name}"}
+
+def test_signature_ignores_order_and_spelling():
+    assert skill_signature(["SQL", "python"]) == skill_signature(["python", "sql"])
+    assert skill_signature([]) == ()
+
+def test_one_prompt_per_signature_chunk(backend):
+    n_big = MAX_CANDIDATES_PER_PROMPT + 3
+    candidates = [_candidate(["docker", "sql"], f"big{i}") for i in range(n_big)]
+    candidates.insert(5, _candidate(["aws"], "alone"))
+
+    advice = generate_bulk_advice(candidates, "Data engineer", requests_per_minute=0, backend=backend)
+
+    # docker+sql: one full chunk plus a remainder; aws: one prompt of its own
+    assert len(backend.prompts) == 3
+    assert sorted(p.count("### CANDIDATE") for p in backend.prompts) == [2, 2 * 3, 2 * MAX_CANDIDATES_PER_PROMPT]
+    assert len(advice) == len(candidates)
+    assert "Focus on: aws." in advice[5]
+    assert all("Focus on: docker, sql." in a for i, a in enumerate(advice) if i != 5)
+
+def test_advice_stays_aligned_with_candidates(backend):
+    candidates = [_candidate(["go"] if i % 2 else ["rust"], f"c{i}") for i in range(6)]
+    advice = generate_bulk_advice(candidates, "Systems engineer", requests_per_minute=0, backend=backend)
+
+    # The stub's personal note is "(candidate n)", n being the position within its group
+    for i, text in enumerate(advice):
+        assert f"(candidate {i // 2 + 1})" in text
+        assert ("Focus on: go." if i % 2 else "Focus on: rust.") in text
+
+def test_repeat_batches_are_served_from_cache(backend):
+    candidates = [_candidate(["kafka"], f"c{i}") for i in range(3)]
+    first = generate_bulk_advice(candidates, "Streaming engineer", requests_per_minute=0, backend=backend)
+    second = generate_bulk_advice(candidates, "Streaming engineer", requests_per_minute=0, backend=backend)
+    assert second == first
+    assert len(backend.prompts) == 1
+
+def test_parse_group_reply():
+    reply = "intro\n### SHARED\nLearn SQL.\n### CANDIDATE 2\nUse your ETL work.\n### CANDIDATE 9\nignored\n"
+    shared, notes = parse_group_reply(reply, 3)
+    assert shared == "intro\n\nLearn SQL."
+    assert notes == ["", "Use your ETL work.", ""]
+
+    # No headings at all: everything is shared advice
+    assert parse_group_reply("  Just learn SQL. ", 2) == ("Just learn SQL.", ["", ""])
+
+def test_group_prompt_lists_every_candidate():
+    prompt = build_group_prompt(("docker",), "JD", ["a" * 1000, "b"])
+    assert "MISSING SKILLS: docker" in prompt
+    assert "### CANDIDATE 1\n" + "a" * 600 + "\n" in prompt
+    assert "### CANDIDATE 2\nb" in prompt
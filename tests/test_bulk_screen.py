@@ -0,0 +1,109 @@
+import csv
+import os
+
+import pytest
+
+import bulk_screen
+from benchmarks.corpus import generate_corpus
+from bulk_screen import Checkpoint, CsvSink
+from utils import bulk_screener
+
+@pytest.fixture(scope="module")
+def corpus():
+    return generate_corpus(7, seed=5, n_bullets=4)
+
+@pytest.fixture
+def source(tmp_path, corpus):
+    folder = tmp_path / "pdfs"
+    folder.mkdir()
+    for name, data in corpus[1]:
+        (folder / name).write_bytes(data)
+    return str(folder)
+
+def _read_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+def _interrupt_after(n):
+    """iter_screen_results that stops with Ctrl+C after n results."""
+    real = bulk_screen.iter_screen_results
+    def results(*args, **kwargs):
+        for i, result in enumerate(real(*args, **kwargs)):
+            if i == n:
+                raise KeyboardInterrupt
+            yield result
+    return results
+
+def test_checkpoint_ignores_a_torn_last_line(tmp_path):
+    path = str(tmp_path / "run.checkpoint")
+    checkpoint = Checkpoint(path)
+    checkpoint.commit(["a.pdf", "b.pdf"], {"csv_bytes": 10, "parquet_parts": 0, "idf_revision": 3})
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"files": ["c.pdf"], "sta')   # Crash mid-write
+
+    reloaded = Checkpoint(path)
+    assert reloaded.done == {"a.pdf", "b.pdf"}
+    assert reloaded.state == {"csv_bytes": 10, "parquet_parts": 0, "idf_revision": 3}
+
+def test_csv_sink_truncates_rows_after_the_checkpoint(tmp_path):
+    path = str(tmp_path / "out.csv")
+    row = {column: "" for column in bulk_screen.COLUMNS}
+    sink = CsvSink(path, {"csv_bytes": 0})
+    state = sink.write([{**row, "Candidate Name": "a.pdf"}])
+    sink.write([{**row, "Candidate Name": "lost.pdf"}])   # Written, never checkpointed
+    sink.close()
+
+    CsvSink(path, state).close()
+    assert [r["Candidate Name"] for r in _read_rows(path)] == ["a.pdf"]
+
+def test_interrupted_run_resumes_without_duplicates(tmp_path, source, corpus, monkeypatch):
+    output = str(tmp_path / "out.csv")
+    args = (corpus[0], source, output)
+
+    monkeypatch.setattr(bulk_screen, "iter_screen_results", _interrupt_after(3))
+    with pytest.raises(KeyboardInterrupt):
+        bulk_screen.run(*args, workers=1, flush_every=2, log=lambda message: None)
+    assert len(_read_rows(output)) == 3
+    with open(output, "a", encoding="utf-8") as f:
+        f.write("half a row from a crash")
+
+    monkeypatch.undo()
+    assert bulk_screen.run(*args, workers=1, flush_every=2, log=lambda message: None) == 4
+    names = [r["Candidate Name"] for r in _read_rows(output)]
+    assert sorted(names) == sorted(name for name, _ in corpus[1])
+    assert bulk_screen.run(*args, workers=1, log=lambda message: None) == 0
+
+def test_checkpoint_from_another_jd_or_source_is_not_resumed(tmp_path, source, corpus):
+    output = str(tmp_path / "out.csv")
+    quiet = {"workers": 1, "log": lambda message: None}
+    bulk_screen.run(corpus[0], source, output, **quiet)
+
+    with pytest.raises(bulk_screen.CheckpointMismatch, match="Job Description"):
+        bulk_screen.run("Hiring a Rust developer.", source, output, **quiet)
+    other_source = tmp_path / "other"
+    other_source.mkdir()
+    with pytest.raises(bulk_screen.CheckpointMismatch, match="source"):
+        bulk_screen.run(corpus[0], str(other_source), output, **quiet)
+    jd_file = tmp_path / "jd.txt"
+    jd_file.write_text("Hiring a Rust developer.", encoding="utf-8")
+    with pytest.raises(SystemExit):
+        bulk_screen.main([source, "--jd", str(jd_file), "-o", output, "--workers", "1"])
+
+    # --restart screens everything again for the new JD
+    assert bulk_screen.run("Hiring a Rust developer.", source, output, restart=True, **quiet) == len(corpus[1])
+
+def test_failed_files_are_recorded_once(tmp_path, source, corpus, monkeypatch):
+    output = str(tmp_path / "out.csv")
+    real = bulk_screener.screen_resume
+    def screen_resume(name, *args, **kwargs):
+        if name == "candidate_00002.pdf":
+            raise ValueError("corrupt file")
+        return real(name, *args, **kwargs)
+    monkeypatch.setattr(bulk_screener, "screen_resume", screen_resume)
+
+    bulk_screen.run(corpus[0], source, output, workers=1, log=lambda message: None)
+    errors = {r["Candidate Name"]: r["Error"] for r in _read_rows(output) if r["Error"]}
+    assert errors == {"candidate_00002.pdf": "ValueError: corrupt file"}
+    # Checkpointed like any other file: a second run doesn't retry it
+    assert bulk_screen.run(corpus[0], source, output, workers=1, log=lambda message: None) == 0
+    assert os.path.exists(f"{output}.checkpoint")
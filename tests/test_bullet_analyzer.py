@@ -0,0 +1,29 @@
+import random
+import re
+
+from benchmarks.corpus import generate_resume_lines
+from utils.ats_matcher import find_unquantified_bullets, find_weak_bullets
+from utils.bullet_analyzer import WEAK_ACTION_WORDS, analyze_bullets
+
+def baseline_weak_bullets(text):
+    return [line.strip() for line in text.split("\n") if any(word in line.lower() for word in WEAK_ACTION_WORDS)]
+
+def baseline_unquantified_bullets(text):
+    return [line.strip() for line in text.split("\n") if len(line.strip()) >= 5 and not re.search(r"\d", line)]
+
+def test_weak_and_unquantified_bullets_match_the_line_scans():
+    rng = random.Random(0)
+    for _ in range(200):
+        text = "\n".join(generate_resume_lines(rng, n_bullets=rng.randint(0, 20)))
+        assert find_weak_bullets(text) == baseline_weak_bullets(text)
+        assert find_unquantified_bullets(text) == baseline_unquantified_bullets(text)
+
+def test_findings_carry_offsets_into_the_text():
+    text = "  Worked on the API\nShipped 3 services\nThe service was deployed weekly\nok"
+    findings = analyze_bullets(text)
+    assert [f.text for f in findings] == [text[f.start:f.end] for f in findings]
+    weak, quantified, passive, short = findings
+    assert weak.is_weak and text[slice(*weak.matches["weak_verb"][0])] == "Worked on"
+    assert quantified.is_quantified and not quantified.is_weak
+    assert passive.is_passive and text[slice(*passive.matches["passive"][0])] == "was deployed"
+    assert short.too_short
@@ -0,0 +1,44 @@
+import os
+
+from utils import disk_cache, metrics
+from utils.disk_cache import DiskCache, make_key
+
+def test_round_trip_and_counters(tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_cache, "CACHE_DIR", str(tmp_path))
+    metrics.reset()
+    cache = DiskCache("test_text", max_bytes=1 << 20)
+    key = make_key("v1", b"pdf bytes")
+
+    assert cache.get(key) is None
+    cache.set(key, "extracted text ✓")
+    assert cache.get(key) == "extracted text ✓"
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert metrics.cache_stats()["test_text_cache"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+def test_eviction_drops_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_cache, "CACHE_DIR", str(tmp_path))
+    cache = DiskCache("test_lru", max_bytes=250)
+    keys = [make_key(str(i)) for i in range(3)]
+    for age, key in enumerate(keys):
+        cache.set(key, "x" * 100)
+        os.utime(cache._path(key), (1000 + age, 1000 + age))
+    cache.get(keys[0])   # Now the most recently used
+
+    cache.evict()
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None and cache.get(keys[2]) is not None
+
+def test_read_only_cache_still_hits(tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_cache, "CACHE_DIR", str(tmp_path))
+    metrics.reset()
+    cache = DiskCache("test_ro", max_bytes=1 << 20)
+    key = make_key("ro")
+    cache.set(key, "text")
+
+    def utime(*args, **kwargs):
+        raise PermissionError("read-only file system")
+    monkeypatch.setattr(disk_cache.os, "utime", utime)
+    assert cache.get(key) == "text"
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 0
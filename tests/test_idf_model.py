@@ -0,0 +1,114 @@
+import glob
+import os
+
+import pytest
+
+from utils import idf_model
+from utils.idf_model import IdfModel, load_idf_model
+
+DOCS = [f"python engineer {i} sql aws docker team{i % 3}" for i in range(30)]
+JD = "python sql engineer with aws"
+RESUMES = ["python sql aws", "java spring docker", "team1 engineer python"]
+
+@pytest.fixture(autouse=True)
+def model_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(idf_model, "MODEL_DIR", str(tmp_path / "idf_model"))
+    monkeypatch.setattr(idf_model, "MIN_DOCS", 5)
+
+def test_scores_reproduce_from_an_old_revision():
+    model = IdfModel()
+    model.update(DOCS[:10])
+    assert model.pending == 10 and model.revision == 0   # Queued, not scored with yet
+    model.save()
+    first = model.scored_revision
+    first_scores = model.score(RESUMES, JD)
+
+    model.update(DOCS[10:])
+    model.save()
+    assert model.scored_revision > first
+    assert model.score(RESUMES, JD) != first_scores
+
+    assert load_idf_model(first).score(RESUMES, JD) == first_scores
+    assert load_idf_model().revision == model.revision
+    with pytest.raises(FileNotFoundError):
+        load_idf_model(model.revision + 1)
+
+def test_pinned_copy_does_not_move_on_save():
+    model = IdfModel()
+    model.update(DOCS[:10])
+    model.save()
+    pinned = model.pinned()
+    scores = pinned.score(RESUMES, JD)
+    model.update(DOCS[10:])
+    model.save()
+    assert pinned.revision < model.revision
+    assert pinned.score(RESUMES, JD) == scores
+
+def test_saves_from_two_processes_merge(tmp_path, monkeypatch):
+    # Two models loaded from the same revision, as the app and the CLI would be
+    IdfModel().save()
+    a, b = load_idf_model(), load_idf_model()
+    a.update(DOCS[:10])
+    b.update(DOCS[5:20])      # Overlaps a's documents: each one is counted once
+    a.save()
+    b.save()
+
+    latest = load_idf_model()
+    assert latest.n_docs == 20
+    assert latest.revision == b.revision
+    monkeypatch.setattr(idf_model, "MODEL_DIR", str(tmp_path / "one_process"))
+    expected = IdfModel()
+    expected.update(DOCS[:20])
+    expected.save()
+    assert expected.n_docs == 20
+    assert (latest.doc_freq == expected.doc_freq).all()
+
+def test_duplicates_and_empty_documents_are_skipped():
+    model = IdfModel()
+    assert model.update(["", "   ", DOCS[0], DOCS[0]]) == 1
+    model.save()
+    assert model.update([DOCS[0]]) == 0
+    assert model.n_docs == 1 and not model.is_ready()
+    assert model.scored_revision is None
+
+def test_every_revision_survives_snapshot_pruning(monkeypatch):
+    monkeypatch.setattr(idf_model, "SNAPSHOT_EVERY", 3)
+    monkeypatch.setattr(idf_model, "KEEP_SNAPSHOTS", 1)
+    model = IdfModel()
+    scores = {}
+    for i in range(0, 30, 4):
+        model.update(DOCS[i:i + 4])
+        model.save()
+        if model.is_ready():
+            scores[model.revision] = model.score(RESUMES, JD)
+
+    assert model.revision == 8
+    # One snapshot left (revision 6); each revision also has its own small delta
+    assert idf_model._saved_revisions("s") == [6]
+    assert idf_model._saved_revisions("r") == list(range(1, 9))
+    for revision, expected in scores.items():
+        rebuilt = load_idf_model(revision)
+        assert rebuilt.score(RESUMES, JD) == expected
+        assert rebuilt.n_docs == min(4 * revision, 30)
+
+    delta = os.path.getsize(idf_model._revision_path(8))
+    snapshot = os.path.getsize(idf_model._snapshot_path(6))
+    assert delta < snapshot
+
+def test_missing_delta_makes_later_revisions_unavailable():
+    model = IdfModel()
+    for i in range(0, 12, 4):
+        model.update(DOCS[i:i + 4])
+        model.save()
+    os.remove(idf_model._revision_path(2))
+    assert load_idf_model(1).n_docs == 4
+    with pytest.raises(FileNotFoundError):
+        load_idf_model(3)
+    # The latest loadable revision is used, and the next save starts a fresh snapshot
+    assert load_idf_model().revision == 1
+    fresh = load_idf_model()
+    fresh.update(DOCS[20:22])
+    fresh.save()
+    assert fresh.revision == 4
+    assert load_idf_model(4).n_docs == 6
+    assert glob.glob(os.path.join(idf_model.MODEL_DIR, "*.tmp")) == []
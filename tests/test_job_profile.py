@@ -0,0 +1,35 @@
+import random
+
+from benchmarks.corpus import generate_jd, generate_resume_lines
+from utils import job_profile
+from utils.ats_matcher import extract_skills_from_text, match_skills, normalize_skills
+from utils.job_profile import get_job_profile
+from utils.semantic_matcher import analyze_terms, calculate_semantic_match
+
+def test_profile_matches_the_per_call_results():
+    rng = random.Random(0)
+    for _ in range(50):
+        jd = generate_jd(rng)
+        profile = get_job_profile(jd)
+        assert profile.skills == extract_skills_from_text(jd)
+        assert profile.normalized_skills == normalize_skills(profile.skills)
+        assert profile.terms == analyze_terms(jd)
+
+        resume = "\n".join(generate_resume_lines(rng, n_bullets=5)).lower()
+        resume_skills = extract_skills_from_text(resume)
+        assert match_skills(resume_skills, profile) == match_skills(resume_skills, extract_skills_from_text(jd))
+        assert calculate_semantic_match(resume, profile) == calculate_semantic_match(resume, jd)
+
+def test_profiles_are_cached_per_jd_with_lru_eviction(monkeypatch):
+    monkeypatch.setattr(job_profile, "_MAX_PROFILES", 2)
+    job_profile._PROFILE_CACHE.clear()
+    a = get_job_profile("Python developer")
+    assert get_job_profile("Python developer") is a
+    get_job_profile("SQL analyst")
+    get_job_profile("Python developer")     # a is now the most recently used
+    get_job_profile("Go engineer")          # ...so the SQL profile is dropped
+    assert get_job_profile("Python developer") is a
+    assert list(job_profile._PROFILE_CACHE) == [
+        job_profile.hash_jd("Go engineer"), job_profile.hash_jd("Python developer"),
+    ]
+    job_profile._PROFILE_CACHE.clear()
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from utils.leaderboard import Leaderboard, PASS_LABEL, REJECT_LABEL
+
+def _full_ranking(scores):
+    """Best score first, ties in row order: what every partial selection must agree with."""
+    return np.lexsort((np.arange(len(scores)), -scores))
+
+def _board(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return Leaderboard(
+        [f"c{i}.pdf" for i in range(n)],
+        rng.integers(0, 5, n) * 20.0,          # Few distinct values: lots of ties
+        rng.integers(0, 3, n) * 10.0,
+        [["sql", "aws"][: i % 3] for i in range(n)],
+        idf_revision=4,
+    )
+
+@pytest.mark.parametrize("seed", range(20))
+def test_ranked_slices_match_a_full_sort(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(0, 80))
+    scores = rng.integers(0, 6, n).astype(float) if seed % 2 else rng.random(n)
+    full = _full_ranking(scores)
+    for start in range(0, n + 5, 7):
+        for size in (1, 7, 50):
+            assert (Leaderboard.ranked(scores, start, start + size) == full[start:start + size]).all()
+    assert (Leaderboard.top_k(scores, 10) == full[:10]).all()
+
+def test_pages_cover_the_ranking_once():
+    board = _board(123)
+    scores = board.final_scores(60, 40)
+    pages = [board.page(scores, 50, page, 50) for page in (1, 2, 3)]
+    assert [len(df) for df in pages] == [50, 50, 23]
+    rows = np.concatenate([df.index.to_numpy() for df in pages])
+    assert (rows == _full_ranking(scores)).all()
+    assert board.page(scores, 50, 4, 50).empty
+
+def test_frame_columns():
+    board = _board(10)
+    scores = board.final_scores(60, 40)
+    df = board.ranked_frame(scores, 50)
+    assert list(df["Final Score"]) == sorted(df["Final Score"], reverse=True)
+    assert set(df["Status"]) <= {PASS_LABEL, REJECT_LABEL}
+    assert (df["Status"] == PASS_LABEL).sum() == (scores >= 50).sum()
+    assert (df["Candidate Name"] == [f"c{i}.pdf" for i in df.index]).all()
+    assert (df["IDF Revision"] == 4).all()
+
+def test_rejected_is_ranked_below_the_cutoff():
+    board = _board(40)
+    scores = board.final_scores(50, 50)
+    rejected = board.rejected(scores, 30)
+    assert (scores[rejected] < 30).all()
+    assert (rejected == [row for row in _full_ranking(scores) if scores[row] < 30]).all()
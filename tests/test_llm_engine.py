@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from utils import disk_cache, llm_engine
+from utils.disk_cache import DiskCache
+from utils.llm_engine import (
+    StubBackend, acomplete, astream_completion, get_cached_completion, iter_async, run_async,
+)
+
+class TrackingBackend(StubBackend):
+    """Stub answers, counting calls and the most requests ever in flight."""
+
+    def __init__(self, delay=0.0, fail=False):
+        super().__init__(delay)
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self.fail = fail
+
+    async def stream(self, prompt):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            async for chunk in super().stream(prompt):
+                yield chunk
+                if self.fail:
+                    raise RuntimeError("connection reset")
+        finally:
+            self.active -= 1
+
+@pytest.fixture(autouse=True)
+def response_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_cache, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(llm_engine, "RESPONSE_CACHE", DiskCache("llm", 1 << 20))
+
+def test_second_call_is_served_from_cache():
+    backend = TrackingBackend()
+    prompt = "MISSING SKILLS: docker"
+    assert get_cached_completion(prompt, backend) is None
+
+    first = run_async(acomplete(prompt, backend))
+    assert get_cached_completion(prompt, backend) == first
+
+    # One chunk, straight from disk, without calling the model
+    assert list(iter_async(astream_completion(prompt, backend))) == [first]
+    assert backend.calls == 1
+
+def test_cache_is_keyed_by_model():
+    prompt = "MISSING SKILLS: sql"
+    run_async(acomplete(prompt, StubBackend(model_name="model-a")))
+    assert get_cached_completion(prompt, StubBackend(model_name="model-b")) is None
+
+def test_failed_answers_are_not_cached():
+    backend = TrackingBackend(fail=True)
+    with pytest.raises(RuntimeError):
+        run_async(acomplete("MISSING SKILLS: go", backend))
+    assert get_cached_completion("MISSING SKILLS: go", backend) is None
+
+    backend.fail = False
+    assert "Focus on: go." in run_async(acomplete("MISSING SKILLS: go", backend))
+    assert backend.calls == 2
+
+def test_requests_in_flight_never_exceed_max_concurrency(monkeypatch):
+    monkeypatch.setattr(llm_engine, "MAX_CONCURRENCY", 2)
+    monkeypatch.setattr(llm_engine, "_semaphore", None)
+    backend = TrackingBackend(delay=0.002)
+
+    async def many():
+        return await asyncio.gather(*[acomplete(f"MISSING SKILLS: skill{i}", backend) for i in range(8)])
+
+    answers = run_async(many())
+    assert len(set(answers)) == 8
+    assert backend.calls == 8
+    assert backend.peak == 2
@@ -0,0 +1,26 @@
+from utils import metrics
+
+def test_worker_metrics_merge_into_the_parent():
+    metrics.reset()
+    metrics.record("parse", 0.01, 0.01)
+    metrics.count("pdf_text_cache_hits", 2)
+    worker = metrics.drain()          # What a worker process sends back
+    assert metrics.counters() == {}
+
+    metrics.count("pdf_text_cache_hits")
+    metrics.count("pdf_text_cache_misses", 3)
+    metrics.merge(worker)
+    metrics.merge(None)
+
+    assert metrics.counters() == {"pdf_text_cache_hits": 3, "pdf_text_cache_misses": 3}
+    assert metrics.cache_stats() == {"pdf_text_cache": {"hits": 3, "misses": 3, "hit_rate": 0.5}}
+    assert metrics.snapshot()["stages"]["parse"]["wall_seconds"]["count"] == 1
+    assert "resume_pdf_text_cache_hits_total 3" in metrics.to_prometheus()
+    metrics.reset()
+
+def test_histogram_quantiles():
+    histogram = metrics.Histogram(metrics.TIME_BUCKETS)
+    for value in [0.002] * 90 + [2.0] * 10:
+        histogram.observe(value)
+    assert histogram.quantile(0.5) <= 0.005
+    assert 1.0 < histogram.quantile(0.95) <= 2.5
@@ -0,0 +1,76 @@
+from io import BytesIO
+
+import pytest
+
+from benchmarks.corpus import lines_to_pdf
+from utils import disk_cache, pdf_reader
+from utils.disk_cache import DiskCache
+from utils.pdf_reader import extract_text_from_bytes, iter_pdf_pages
+
+LINES_PER_PAGE = 47   # What lines_to_pdf fits on a page
+
+def _paged_pdf(pages):
+    lines = ["EXPERIENCE"]
+    for page in range(1, pages + 1):
+        lines += [f"marker page{page} line{i} built a data pipeline in python" for i in range(LINES_PER_PAGE)]
+    return lines_to_pdf(lines[:pages * LINES_PER_PAGE])
+
+@pytest.fixture(scope="module")
+def five_pages():
+    return _paged_pdf(5)
+
+@pytest.fixture
+def parses(tmp_path, monkeypatch):
+    """Fresh cache per test; returns the list of sources actually parsed."""
+    monkeypatch.setattr(disk_cache, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(pdf_reader, "PDF_CACHE", DiskCache("pdf_text", 1 << 20))
+    calls = []
+    real = pdf_reader._extract_text
+    def extract_text(source):
+        calls.append(source)
+        return real(source)
+    monkeypatch.setattr(pdf_reader, "_extract_text", extract_text)
+    return calls
+
+@pytest.mark.parametrize("backend", ["pdfminer", "pdfplumber"])
+def test_max_pages_stops_reading(five_pages, backend):
+    pages = list(iter_pdf_pages(BytesIO(five_pages), backend, max_pages=2))
+    assert len(pages) == 2
+    assert "page2 " in pages[1] and "page3 " not in "".join(pages)
+    assert len(list(iter_pdf_pages(BytesIO(five_pages), backend, max_pages=10))) == 5
+
+@pytest.mark.parametrize("backend", ["pdfminer", "pdfplumber"])
+def test_max_chars_stops_after_the_page_that_crosses_it(five_pages, backend):
+    pages = list(iter_pdf_pages(BytesIO(five_pages), backend, max_chars=10))
+    assert len(pages) == 1
+    first_two = list(iter_pdf_pages(BytesIO(five_pages), backend, max_chars=len(pages[0]) + 1))
+    assert len(first_two) == 2
+
+def test_max_file_bytes_rejects_before_parsing(five_pages, parses, monkeypatch):
+    monkeypatch.setattr(pdf_reader, "MAX_FILE_BYTES", len(five_pages) - 1)
+    assert extract_text_from_bytes(five_pages).startswith("Error: PDF is too large")
+    assert parses == []
+
+def test_backend_selection(five_pages):
+    assert pdf_reader._extract_with_backend(BytesIO(five_pages), "pdfplumber")[1] == "pdfplumber"
+    assert pdf_reader._extract_with_backend(BytesIO(five_pages), "auto")[1] == "pdfminer"
+    # No section header: the fast text looks broken, so "auto" falls back to full layout
+    headless = lines_to_pdf([f"built a data pipeline in python and sql {i}" for i in range(40)])
+    text, used = pdf_reader._extract_with_backend(BytesIO(headless), "auto")
+    assert used == "pdfplumber" and "data pipeline" in text
+
+def test_looks_broken_reasons():
+    assert pdf_reader.looks_broken("short", 1) == "low text density"
+    assert pdf_reader.looks_broken("x" * 500, 1) == "words run together"
+    assert pdf_reader.looks_broken("some words here " * 20, 1) == "no section headers"
+    assert pdf_reader.looks_broken("Skills\n" + "some words here " * 20, 1) is None
+
+def test_cache_key_includes_the_caps(five_pages, parses, monkeypatch):
+    full = extract_text_from_bytes(five_pages)
+    assert extract_text_from_bytes(five_pages) == full
+    assert len(parses) == 1   # Second call was a cache hit
+
+    monkeypatch.setattr(pdf_reader, "MAX_PAGES", 2)
+    capped = extract_text_from_bytes(five_pages)
+    assert len(parses) == 2   # Different cap, different entry: the full text isn't reused
+    assert "page3 " in full and "page3 " not in capped
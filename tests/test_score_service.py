@@ -0,0 +1,83 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import score_service
+from score_service import MicroBatcher, ScoreService
+from utils import bulk_screener, idf_model
+from utils.bulk_screener import score_resume_texts
+from utils.idf_model import IdfModel, load_idf_model
+
+JD = "python sql engineer with aws"
+RESUMES = ["python sql aws", "java spring docker", "team1 engineer python"]
+
+@pytest.fixture
+def revision(tmp_path, monkeypatch):
+    """A saved, ready IdfModel revision (in a temp folder)."""
+    monkeypatch.setattr(idf_model, "MODEL_DIR", str(tmp_path / "idf_model"))
+    monkeypatch.setattr(idf_model, "MIN_DOCS", 5)
+    monkeypatch.setattr(bulk_screener, "_IDF_MODELS", {})
+    model = IdfModel()
+    model.update([f"python engineer {i} sql aws docker team{i % 3}" for i in range(30)])
+    model.save()
+    return model.scored_revision
+
+@pytest.fixture
+def pool():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+def _request(service, raw):
+    """Sends one raw HTTP request through the service; returns (status, json, keep_alive)."""
+    async def send():
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        head = await reader.readuntil(b"\r\n\r\n")
+        return await service._respond(reader, head)
+    return asyncio.run(send())
+
+def _post(service, path, payload):
+    body = json.dumps(payload).encode("utf-8")
+    return _request(service, f"POST {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+
+def test_pinned_revision_scores_like_the_model(revision, pool):
+    service = ScoreService(pool, MicroBatcher(pool, idf_revision=revision))
+    status, result, _ = _post(service, "/score/batch", {"jd": JD, "resume_texts": RESUMES})
+    assert status == 200
+    results = result["results"]
+    assert [r["idf_revision"] for r in results] == [revision] * len(RESUMES)
+
+    expected = load_idf_model(revision).score(RESUMES, JD)
+    assert [r["semantic_match"] for r in results] == pytest.approx(expected)
+
+    # A single /score gets the same score as in the batch
+    status, single, _ = _post(service, "/score", {"jd": JD, "resume_text": RESUMES[0]})
+    assert (status, single) == (200, results[0])
+
+def test_without_a_ready_model_scores_are_pairwise(pool):
+    service = ScoreService(pool, MicroBatcher(pool))
+    status, result, _ = _post(service, "/score/batch", {"jd": JD, "resume_texts": RESUMES})
+    assert status == 200
+    assert [r["idf_revision"] for r in result["results"]] == [None] * len(RESUMES)
+    alone = [score_resume_texts([text], JD)[0]["semantic_match"] for text in RESUMES]
+    assert [r["semantic_match"] for r in result["results"]] == alone
+
+@pytest.mark.parametrize("length", ["-1", "-999", "ten"])
+def test_invalid_content_length_is_rejected(pool, length):
+    service = ScoreService(pool, MicroBatcher(pool))
+    status, result, keep_alive = _request(
+        service, f"POST /score HTTP/1.1\r\nContent-Length: {length}\r\n\r\n{{}}".encode("latin-1")
+    )
+    assert status == 400
+    assert "Content-Length" in result["error"]
+    assert not keep_alive
+
+def test_oversized_body_is_rejected(pool):
+    service = ScoreService(pool, MicroBatcher(pool))
+    status, _, keep_alive = _request(
+        service, f"POST /score HTTP/1.1\r\nContent-Length: {score_service.MAX_BODY_BYTES + 1}\r\n\r\n".encode("latin-1")
+    )
+    assert (status, keep_alive) == (413, False)
@@ -0,0 +1,65 @@
+import random
+
+from benchmarks.corpus import generate_resume_lines
+from utils.section_extractor import extract_sections, find_section_spans
+
+BASELINE_KEYWORDS = {
+    "skills": ["skills", "technical skills", "technologies", "tools", "expertise", "competencies"],
+    "education": ["education", "academic", "qualification", "degree", "alma mater"],
+    "experience": ["experience", "work experience", "employment", "internship", "projects", "work history"],
+}
+
+def baseline_extract_sections(text):
+    """The original line-by-line extractor (skills, education and experience only)."""
+    sections = {"skills": "", "education": "", "experience": ""}
+    current_section = None
+    for line in text.split("\n"):
+        line_strip = line.strip()
+        if not line_strip:
+            continue
+        found_section = None
+        for section_name, keywords in BASELINE_KEYWORDS.items():
+            if line_strip.lower() in keywords:
+                found_section = section_name
+                break
+        if found_section:
+            current_section = found_section
+            continue
+        if any(line_strip.upper().startswith(k) for k in ["CERTIFICATION", "ACHIEVEMENT", "LANGUAGES"]):
+            current_section = None
+            continue
+        if current_section:
+            sections[current_section] += line_strip + "\n"
+    return sections
+
+HEADERS = ["Skills", "TECHNICAL SKILLS", "  Education ", "Experience", "Work History", "Projects",
+           "Certifications", "ACHIEVEMENTS and awards", "Languages", "Tools"]
+BODY = ["- Built a REST API in Python", "B.Tech, 2019", "   indented line  ", "", "sql, aws, docker",
+        "Led 4 engineers", "\t", "skills matter"]
+
+def _legacy(sections):
+    return {name: sections[name] for name in BASELINE_KEYWORDS}
+
+def test_matches_baseline_on_corpus_resumes():
+    rng = random.Random(0)
+    for _ in range(200):
+        text = "\n".join(generate_resume_lines(rng, n_bullets=rng.randint(0, 15)))
+        assert _legacy(extract_sections(text)) == baseline_extract_sections(text)
+
+def test_matches_baseline_on_shuffled_headers():
+    rng = random.Random(1)
+    for _ in range(2000):
+        text = "\n".join(rng.choice(HEADERS + BODY * 2) for _ in range(rng.randint(0, 25)))
+        assert _legacy(extract_sections(text)) == baseline_extract_sections(text), repr(text)
+
+def test_new_sections_and_spans():
+    text = "Jane Doe\nSummary\nBackend engineer\nProjects\nSearch engine\nCertifications and awards\nAWS SA"
+    sections = find_section_spans(text)
+    assert sections.text("summary") == "Backend engineer\n"
+    assert sections.text("projects") == "Search engine\n"
+    assert sections.text("certifications") == "AWS SA\n"
+    assert "skills" not in sections
+    # Legacy dict: projects still count as experience
+    assert extract_sections(text)["experience"] == "Search engine\n"
+    # Line offsets index the original text
+    assert [text[s:e] for s, e in sections.iter_lines("summary", "projects")] == ["Backend engineer", "Search engine"]
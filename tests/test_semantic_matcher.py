@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from benchmarks.corpus import generate_jd, generate_resume_lines
+from utils.job_profile import get_job_profile
+from utils.semantic_matcher import (
+    analyze_terms, calculate_pairwise_matches, calculate_semantic_match, terms_from_tokens,
+)
+from utils.skill_taxonomy import tokenize
+from utils.text_cleaner import clean_text
+
+def _corpus(seed, n):
+    rng = random.Random(seed)
+    jd = clean_text(generate_jd(rng))
+    resumes = [clean_text("\n".join(generate_resume_lines(rng, n_bullets=rng.randint(0, 12)))) for _ in range(n)]
+    return jd, resumes
+
+def test_pairwise_matches_equal_per_pair_fits():
+    jd, resumes = _corpus(0, 60)
+    resumes += ["", "the and of", "python"]   # Empty, stop words only, a single term
+    expected = [calculate_semantic_match(resume, jd) for resume in resumes]
+    assert calculate_pairwise_matches(resumes, jd) == pytest.approx(expected, abs=0.01)
+    # Same scores from a JobProfile and pre-tokenized resume terms
+    terms = [analyze_terms(resume) for resume in resumes]
+    assert calculate_pairwise_matches(resumes, get_job_profile(jd), terms) == pytest.approx(expected, abs=0.01)
+
+def test_pairwise_score_does_not_depend_on_the_batch():
+    jd, resumes = _corpus(1, 20)
+    alone = [calculate_pairwise_matches([resume], jd)[0] for resume in resumes]
+    assert calculate_pairwise_matches(resumes, jd) == pytest.approx(alone, abs=1e-9)
+
+def test_terms_from_tokens_matches_the_tfidf_analyzer():
+    rng = random.Random(2)
+    alphabet = "ab c++ c# node.js ci/cd a-b the and x 1 42 _ é"
+    texts = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60))) for _ in range(2000)]
+    texts += _corpus(3, 20)[1]
+    for text in texts:
+        assert terms_from_tokens(tokenize(text)) == analyze_terms(text), repr(text)
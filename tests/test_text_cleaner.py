@@ -0,0 +1,42 @@
+import random
+import re
+
+from utils.text_cleaner import clean_text, clean_text_with_offsets
+
+def baseline_clean_text(text):
+    """The original four-pass implementation clean_text must keep matching."""
+    text = text.lower()
+    text = re.sub(r'[^\w\s]', '', text)
+    text = re.sub(r'[ \t]+', ' ', text)
+    text = re.sub(r'\n+', '\n', text)
+    return text.strip()
+
+SAMPLES = [
+    "",
+    "  \n\t ",
+    "Python, SQL & AWS!!\n\n\n- Built  a\tREST API (Flask)",
+    "C++ / C# / Node.js — 5+ years\r\n\r\nLed 3 teams",
+    "Ünïcödé Straße İstanbul ΣΟΦΟΣ",
+    "\t\tindented\t \t line \n \n trailing   ",
+]
+
+def _random_text(rng):
+    alphabet = "abcXYZ019 \t\n\n.,;!-+#/()éßİΣ  "
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 80)))
+
+def test_clean_text_matches_baseline():
+    rng = random.Random(0)
+    for text in SAMPLES + [_random_text(rng) for _ in range(2000)]:
+        assert clean_text(text) == baseline_clean_text(text), repr(text)
+
+def test_offsets_point_back_to_the_raw_text():
+    rng = random.Random(1)
+    for text in SAMPLES + [_random_text(rng) for _ in range(500)]:
+        cleaned, offsets = clean_text_with_offsets(text)
+        assert cleaned == clean_text(text)
+        assert len(offsets) == len(cleaned)
+        assert list(offsets) == sorted(offsets)
+        for char, index in zip(cleaned, offsets):
+            if char not in " \n":
+                # casefold: lowercasing is context-dependent (Greek final sigma)
+                assert char.casefold() in text[index].casefold()
@@ -1,100 +1,67 @@
-SKILL_SYNONYMS = {
-    "nlp": ["natural language processing", "text processing"],
-    "ml": ["machine learning", "predictive modeling"],
-    "ai": ["artificial intelligence", "generative ai"],
-    "dl": ["deep learning", "neural networks"],
-    "cv": ["computer vision"],
-    "git": ["github", "gitlab", "version control"],
-    "docker": ["containerization", "kubernetes", "k8s"],
-    "aws": ["amazon web services", "ec2", "lambda", "s3"],
-    "azure": ["microsoft azure"],
-    "gcp": ["google cloud platform"],
-    "sql": ["mysql", "postgresql", "postgres", "no-sql", "mongodb"],
-    "react": ["reactjs", "react.js"],
-    "node": ["nodejs", "node.js", "expressjs"],
-    "vue": ["vuejs", "vue.js"],
-    "angular": ["angularjs"],
-    "python": ["python3", "pandas", "numpy", "scikit-learn", "sklearn"],
-    "java": ["springboot", "spring boot", "jvm"],
-    "js": ["javascript", "es6", "typescript", "ts"],
-    "html": ["html5"],
-    "css": ["css3", "tailwind", "bootstrap"]
-}
+from functools import lru_cache
+
+from utils.bullet_analyzer import analyze_bullets, WEAK_ACTION_WORDS
+from utils.skill_taxonomy import load_skill_index, tokenize as _tokenize, token_spans as _token_spans, TRIE_END as _END
+
+# The taxonomy lives in data/skill_taxonomy.json and is compiled once into a cached index
+_SKILL_INDEX = load_skill_index()
+
+SKILL_KEYWORDS = _SKILL_INDEX["skills"]
+SKILL_SYNONYMS = _SKILL_INDEX["synonyms"]
+_ALIAS_MAP = _SKILL_INDEX["alias_map"]
+_SKILL_TRIE = _SKILL_INDEX["trie"]
 
 def normalize_skills(skills: set) -> set:
     """
     Standardizes skills (e.g., 'ReactJS' -> 'react') using the synonym dictionary.
+    Unknown skills are kept as-is.
     """
     normalized = set()
     for skill in skills:
         skill = skill.lower().strip()
-        
-        # Check if skill is a known synonym
-        mapped = False
-        for main_skill, aliases in SKILL_SYNONYMS.items():
-            if skill == main_skill or skill in aliases:
-                normalized.add(main_skill)
-                mapped = True
-                break
-        
-        # If no synonym found, keep original if it's in our main list
-        if not mapped:
-             # Clean up common variations like "python 3" -> "python" is handled by the synonym map, 
-             # but here we just add the raw skill if it matches the keyword list logic later
-            normalized.add(skill)
-            
+        normalized.add(_ALIAS_MAP.get(skill, skill))
     return normalized
 
-SKILL_KEYWORDS = [
-    # Programming Languages
-    "python", "java", "javascript", "typescript", "c++", "c#", "go", "rust", "php", "ruby", "swift", "kotlin", "scala", "r", "dart",
-    
-    # Web Development (Frontend/Backend)
-    "html", "css", "react", "angular", "vue", "next.js", "node.js", "django", "flask", "fastapi", "spring boot", "asp.net", "graphql", "rest api",
-    
-    # Data Science & AI
-    "machine learning", "deep learning", "nlp", "computer vision", "tensorflow", "pytorch", "scikit-learn", "pandas", "numpy", "matplotlib", "seaborn", "opencv", "hugging face", "llm", "langchain",
-    
-    # Databases
-    "sql", "mysql", "postgresql", "mongodb", "redis", "firebase", "elasticsearch", "cassandra", "oracle", "snowflake",
-    
-    # DevOps & Cloud
-    "git", "docker", "kubernetes", "aws", "azure", "gcp", "linux", "bash", "jenkins", "circleci", "terraform", "ansible", "prometheus", "grafana",
-    
-    # Tools & Others
-    "jira", "agile", "scrum", "excel", "power bi", "tableau", "figma", "selenium", "cypress", "junit", "postman"
-]
-
 def extract_skills_from_text(text: str) -> set:
     """
-    Scans text for skills from our expanded SKILL_KEYWORDS list.
+    Scans text for skills from our expanded SKILL_KEYWORDS list (and their synonyms)
+    in a single pass over the tokens, using the precompiled skill trie.
     """
-    text = text.lower()
-    found_skills = set()
+    return extract_skills_from_tokens(_tokenize(text))
 
-    # 1. Direct Keyword Search
-    for skill in SKILL_KEYWORDS:
-        # We add spaces around the skill to avoid partial matches (e.g., "go" in "google")
-        # Regex is safer, but for now, simple string check with padding works for 90% cases
-        pattern = f" {skill} " 
-        if pattern in f" {text} ": # Pad text too
-            found_skills.add(skill)
-            
-    # 2. Check Synonyms specifically (in case user wrote 'ReactJS' which isn't in main list but is in synonyms)
-    for main, aliases in SKILL_SYNONYMS.items():
-        for alias in aliases:
-            if f" {alias} " in f" {text} ":
-                found_skills.add(main)
+def extract_skills_from_tokens(tokens) -> set:
+    """extract_skills_from_text for text that is already tokenized (skill_taxonomy.tokenize / token_spans)."""
+    found_skills = set()
+    n = len(tokens)
+
+    for i in range(n):
+        node = _SKILL_TRIE.get(tokens[i])
+        j = i
+        # Walk forward while the tokens still spell a (multi-word) skill
+        while node is not None:
+            hits = node.get(_END)
+            if hits:
+                found_skills.update(hits)
+            j += 1
+            if j == n:
+                break
+            node = node.get(tokens[j])
 
     return found_skills
 
 
 def match_skills(resume_skills, jd_skills):
-    if not jd_skills:
+    """
+    Compares resume skills with JD skills (a set, or a JobProfile with pre-normalized skills).
+    Returns (match_percentage, matched, missing).
+    """
+    jd_set = getattr(jd_skills, "normalized_skills", None)
+    if jd_set is None:
+        jd_set = normalize_skills(jd_skills)
+    if not jd_set:
         return 0, set(), set()
 
     resume_set = normalize_skills(resume_skills)
-    jd_set = normalize_skills(jd_skills)
 
     matched = resume_set.intersection(jd_set)
     missing = jd_set - matched
@@ -105,99 +72,98 @@ def match_skills(resume_skills, jd_skills):
 
     
 
-WEAK_ACTION_WORDS = [
-    "worked on",
-    "helped",
-    "responsible for",
-    "assisted",
-    "participated",
-    "involved in"
-]
+def _as_text(experience_text):
+    """Accepts the experience text, or an already-split list of lines."""
+    return experience_text if isinstance(experience_text, str) else "\n".join(experience_text)
 
 def find_weak_bullets(experience_text):
-    weak_lines = []
-
-    for line in experience_text.split("\n"):
-        line_lower = line.lower()
-        for word in WEAK_ACTION_WORDS:
-            if word in line_lower:
-                weak_lines.append(line.strip())
-                break
-
-    return weak_lines
-
-import re
+    """Bullets that contain a weak phrase anywhere ("worked on", "helped"...), as the original line scan did."""
+    return [b.text for b in analyze_bullets(_as_text(experience_text)) if b.is_weak]
 
 def find_unquantified_bullets(experience_text):
-    unquantified = []
-
-    for line in experience_text.split("\n"):
-        if len(line.strip()) < 5:
-            continue
+    """Bullets with no number in them (too-short lines are ignored)."""
+    return [
+        b.text for b in analyze_bullets(_as_text(experience_text))
+        if not b.too_short and not b.is_quantified
+    ]
 
-        # Check if line has any number
-        if not re.search(r"\d", line):
-            unquantified.append(line.strip())
+def build_evidence_index(experience_text):
+    """
+    Indexes the experience text once: token -> list of token positions,
+    plus the (start, end) character span of every token.
+    Also accepts (token, start, end) triples already produced by token_spans (then
+    nothing is re-tokenized, and spans are offsets into the text those triples came from).
+    """
+    if isinstance(experience_text, str):
+        experience_text = _token_spans(experience_text)
+    positions = {}
+    spans = []
+    tokens = []
+    for i, (token, start, end) in enumerate(experience_text):
+        positions.setdefault(token, []).append(i)
+        spans.append((start, end))
+        tokens.append(token)
+    return tokens, spans, positions
+
+def _compact(name):
+    """Letters, digits, + and # only: "Node.js" -> "nodejs"."""
+    return "".join(char for char in name if char.isalnum() or char in "+#")
+
+@lru_cache(maxsize=None)
+def _skill_surfaces(skill):
+    """
+    Token sequences that count as evidence for a skill (cached): its own name, plus the
+    aliases that are spellings of it ("reactjs", "node.js", "python3", "html5": the alias
+    starts with the skill's name). Looser aliases don't count: "pandas" is listed under
+    "python" and "kubernetes" under "docker", but mentioning them isn't using the skill.
+    """
+    skill_lower = skill.lower().strip()
+    compact = _compact(skill_lower)
+    names = [skill_lower] + [
+        alias for alias in SKILL_SYNONYMS.get(skill_lower, ()) if compact and _compact(alias).startswith(compact)
+    ]
+    surfaces = []
+    for name in names:
+        surface = tuple(_tokenize(name))
+        if surface and surface not in surfaces:
+            surfaces.append(surface)
+    return tuple(surfaces)
+
+def find_skill_evidence(skills, experience_text):
+    """
+    For each skill, the (start, end) span in experience_text where it is first
+    mentioned as whole words (or None). The text is indexed once, then each skill
+    is an O(occurrences) lookup, so "r" or "go" no longer match inside other words.
+    experience_text can also be token_spans triples (see build_evidence_index).
+    """
+    tokens, spans, positions = build_evidence_index(experience_text)
+    evidence = {}
 
-    return unquantified
+    for skill in skills:
+        best = None
+        for surface in _skill_surfaces(skill):
+            n = len(surface)
+            for i in positions.get(surface[0], ()):
+                if tuple(tokens[i:i + n]) == surface:
+                    if best is None or i < best[0]:
+                        best = (i, i + n - 1)
+                    break  # Positions are in order: the first hit is the earliest
+        evidence[skill] = (spans[best[0]][0], spans[best[1]][1]) if best else None
+
+    return evidence
 
 def skills_without_evidence(skills, experience_text):
-    experience_text = experience_text.lower()
-    missing = []
+    """
+    Returns the skills that are never mentioned in the experience section.
+    (Phrases like "built using X" are covered by the mention of X itself.)
+    """
+    evidence = find_skill_evidence(skills, experience_text)
+    return [skill for skill in skills if evidence[skill] is None]
 
-    for skill in skills:
-        skill_lower = skill.lower()
-
-        # Direct mention
-        if skill_lower in experience_text:
-            continue
-
-        # Common action patterns
-        patterns = [
-            f"using {skill_lower}",
-            f"with {skill_lower}",
-            f"built using {skill_lower}",
-            f"developed using {skill_lower}",
-            f"implemented using {skill_lower}"
-        ]
-
-        if any(p in experience_text for p in patterns):
-            continue
-
-        missing.append(skill)
-
-    return missing
-
-
-SUGGESTION_TEMPLATES = {
-    "python": "Built backend features using Python for real-world data processing",
-    "sql": "Designed and queried relational databases using SQL",
-    "nlp": "Applied NLP techniques for text cleaning and analysis",
-    "machine learning": "Trained and evaluated machine learning models on structured data",
-    "git": "Used Git for version control and collaborative development",
-    "github": "Managed project repositories and pull requests on GitHub",
-    "streamlit": "Developed interactive web applications using Streamlit",
-    "data structures": "Implemented efficient data structures to optimize performance",
-    "algorithms": "Designed algorithms with time and space complexity considerations"
-}
-
-
-
-skill_resources = {
-    "python": "https://www.learnpython.org/",
-    "sql": "https://www.w3schools.com/sql/",
-    "machine learning": "https://www.coursera.org/learn/machine-learning",
-    "deep learning": "https://www.fast.ai/",
-    "nlp": "https://www.kaggle.com/learn/natural-language-processing",
-    "git": "https://git-scm.com/doc",
-    "docker": "https://docker-curriculum.com/",
-    "aws": "https://aws.amazon.com/getting-started/",
-    "react": "https://react.dev/learn",
-    "node.js": "https://nodejs.org/en/learn",
-    "kubernetes": "https://kubernetes.io/docs/tutorials/kubernetes-basics/",
-    "terraform": "https://developer.hashicorp.com/terraform/tutorials",
-    "java": "https://www.codecademy.com/learn/learn-java"
-}
+
+SUGGESTION_TEMPLATES = _SKILL_INDEX["suggestions"]
+
+skill_resources = _SKILL_INDEX["resources"]
 
 def get_learning_link(skill):
     """Returns a learning link for a missing skill."""
@@ -1,73 +1,252 @@
 import json
+import logging
 import os
+import sqlite3
+import threading
 from datetime import datetime
 
-# The file where we store user data
-DB_FILE = "users.json"
+# Anchored to the repo (like the .cache folder), so starting the app from another
+# directory doesn't create a fresh, empty database or skip the JSON migration
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-def load_users():
-    """Loads users from the JSON database."""
-    # If file doesn't exist, return empty dictionary
-    if not os.path.exists(DB_FILE):
-        return {}
-    
+# The SQLite database where we store users and their history
+DB_FILE = os.getenv("RESUME_DB_FILE", os.path.join(_ROOT, "users.db"))
+
+# The old JSON database, imported once into SQLite on first use
+LEGACY_JSON_FILE = os.getenv("RESUME_LEGACY_JSON_FILE", os.path.join(_ROOT, "users.json"))
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated emails allowed to see admin/debug tools (e.g. the metrics panel)
+ADMIN_EMAILS = {e.strip().lower() for e in os.getenv("ADMIN_EMAILS", "").split(",") if e.strip()}
+
+_conn = None
+_lock = threading.Lock()  # One connection per process, shared by all Streamlit sessions
+
+# History is an append-only log: rows are only ever INSERTed, never rewritten
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    email TEXT PRIMARY KEY,
+    password TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email TEXT NOT NULL,
+    date TEXT NOT NULL,
+    match_score NUMERIC,
+    semantic_score NUMERIC,
+    missing_count INTEGER,
+    idf_revision INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_history_email ON history (email, id);
+CREATE INDEX IF NOT EXISTS idx_history_email_date ON history (email, date);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+def _migrate_json(conn):
+    """One-shot import of users.json (users + history) into SQLite."""
+    if not os.path.exists(LEGACY_JSON_FILE):
+        return
+
+    # BEGIN IMMEDIATE takes the write lock, so two processes can't both migrate
+    conn.execute("BEGIN IMMEDIATE")
     try:
-        with open(DB_FILE, "r") as f:
-            return json.load(f)
-    except:
-        return {}
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+            conn.execute("COMMIT")
+            return
+
+        try:
+            with open(LEGACY_JSON_FILE, "r") as f:
+                users = json.load(f)
+        except (OSError, ValueError):
+            users = {}
+        if not isinstance(users, dict):
+            logger.warning("%s is not a JSON object: nothing to migrate", LEGACY_JSON_FILE)
+            users = {}
+
+        # Old records may lack fields: bad ones are skipped (and logged), never fatal,
+        # or the migration would roll back and fail again on every start
+        for email, user in users.items():
+            if not isinstance(user, dict) or not user.get("password"):
+                logger.warning("Skipping legacy user %r: no password", email)
+                continue
+            conn.execute(
+                "INSERT OR IGNORE INTO users (email, password, name) VALUES (?, ?, ?)",
+                (email, user["password"], user.get("name") or email)
+            )
+            history = []
+            for r in user.get("history") or []:
+                if not isinstance(r, dict) or not r.get("date"):
+                    logger.warning("Skipping legacy history record of %r without a date: %r", email, r)
+                    continue
+                history.append((email, r["date"], r.get("match_score"), r.get("semantic_score"), r.get("missing_count")))
+            conn.executemany(
+                "INSERT INTO history (email, date, match_score, semantic_score, missing_count) VALUES (?, ?, ?, ?, ?)",
+                history
+            )
+
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('json_migrated', ?)",
+            (datetime.now().strftime("%Y-%m-%d %H:%M"),)
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+def _migrate_schema(conn):
+    """Adds columns introduced after a database was created."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(history)")}
+    if "idf_revision" not in columns:
+        # IdfModel revision behind semantic_score (NULL: per-batch TF-IDF, or saved before revisions)
+        conn.execute("ALTER TABLE history ADD COLUMN idf_revision INTEGER")
+
+def _get_conn():
+    """Opens (once) the SQLite database in WAL mode and makes sure the schema exists."""
+    global _conn
+    if _conn is None:
+        conn = sqlite3.connect(DB_FILE, timeout=30, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")   # Readers never block the writer
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        _migrate_schema(conn)
+        _migrate_json(conn)
+        _conn = conn
+    return _conn
+
+def load_users():
+    """Loads all users (and their history) as a dictionary, like the old JSON file."""
+    with _lock:
+        conn = _get_conn()
+        users = {
+            email: {"password": password, "name": name}
+            for email, password, name in conn.execute("SELECT email, password, name FROM users")
+        }
+        for email, date, match_score, semantic_score, missing_count in conn.execute(
+            "SELECT email, date, match_score, semantic_score, missing_count FROM history ORDER BY id"
+        ):
+            if email in users:
+                users[email].setdefault("history", []).append({
+                    "date": date,
+                    "match_score": match_score,
+                    "semantic_score": semantic_score,
+                    "missing_count": missing_count
+                })
+    return users
 
 def save_user(email, password, name):
     """Saves a new user to the database."""
-    users = load_users()
-    
-    # Check if user already exists
-    if email in users:
-        return False 
-    
-    # Add new user
-    users[email] = {
-        "password": password,
-        "name": name
-    }
-    
-    # Save back to file
-    with open(DB_FILE, "w") as f:
-        json.dump(users, f)
+    with _lock:
+        try:
+            _get_conn().execute(
+                "INSERT INTO users (email, password, name) VALUES (?, ?, ?)",
+                (email, password, name)
+            )
+        except sqlite3.IntegrityError:
+            # User already exists
+            return False
     return True
 
 def authenticate(email, password):
     """Checks if email/password match."""
-    users = load_users()
-    if email in users and users[email]["password"] == password:
-        return users[email]["name"]
-    return None
-
-def save_history(email, match_score, semantic_score, missing_skills):
-    """Saves the analysis result to the user's history."""
-    users = load_users()
-    
-    if email in users:
-        if "history" not in users[email]:
-            users[email]["history"] = []
-            
-        # Create a record
-        record = {
-            "date": datetime.now().strftime("%Y-%m-%d %H:%M"),
-            "match_score": match_score,
-            "semantic_score": semantic_score,
-            "missing_count": len(missing_skills)
+    with _lock:
+        row = _get_conn().execute(
+            "SELECT name FROM users WHERE email = ? AND password = ?", (email, password)
+        ).fetchone()
+    return row[0] if row else None
+
+def save_history(email, match_score, semantic_score, missing_skills, idf_revision=None):
+    """
+    Saves the analysis result to the user's history, with the IdfModel revision the
+    semantic score came from (so load_idf_model(idf_revision) can reproduce it).
+    """
+    with _lock:
+        # Only known users get history (single statement, so it's atomic)
+        _get_conn().execute(
+            """INSERT INTO history (email, date, match_score, semantic_score, missing_count, idf_revision)
+               SELECT ?, ?, ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM users WHERE email = ?)""",
+            (email, datetime.now().strftime("%Y-%m-%d %H:%M"), match_score, semantic_score,
+             len(missing_skills), idf_revision, email)
+        )
+
+def _date_filter(email, start, end):
+    """Builds the WHERE clause for one user's history, optionally within [start, end] (dates or 'YYYY-MM-DD')."""
+    clause, params = "email = ?", [email]
+    if start is not None:
+        clause += " AND date >= ?"
+        params.append(str(start)[:10])
+    if end is not None:
+        clause += " AND date < ?"
+        params.append(str(end)[:10] + "~")  # '~' sorts after any "HH:MM", so the end day is included
+    return clause, params
+
+def get_user_history(email, limit=None, offset=0, start=None, end=None, newest_first=False):
+    """
+    Returns past analysis records (oldest first by default).
+    Use limit/offset to page through them and start/end to filter by date.
+    """
+    clause, params = _date_filter(email, start, end)
+    order = "DESC" if newest_first else "ASC"
+    query = (
+        "SELECT date, match_score, semantic_score, missing_count, idf_revision FROM history "
+        f"WHERE {clause} ORDER BY id {order} LIMIT ? OFFSET ?"
+    )
+    params += [-1 if limit is None else limit, offset]
+
+    with _lock:
+        rows = _get_conn().execute(query, params).fetchall()
+    return [
+        {"date": date, "match_score": match_score, "semantic_score": semantic_score,
+         "missing_count": missing_count, "idf_revision": idf_revision}
+        for date, match_score, semantic_score, missing_count, idf_revision in rows
+    ]
+
+def get_history_version(email):
+    """
+    Changes whenever the user's history changes (history is append-only, so the newest
+    row id is enough). One index lookup: use it as a cache key for history views.
+    """
+    with _lock:
+        return _get_conn().execute("SELECT MAX(id) FROM history WHERE email = ?", (email,)).fetchone()[0] or 0
+
+def count_user_history(email, start=None, end=None):
+    """Returns how many history records match (for pagination)."""
+    clause, params = _date_filter(email, start, end)
+    with _lock:
+        return _get_conn().execute(f"SELECT COUNT(*) FROM history WHERE {clause}", params).fetchone()[0]
+
+def _round_avg(value):
+    """AVG() is NULL when every score of the day is NULL: keep it None instead of failing."""
+    return None if value is None else round(value, 2)
+
+def get_history_summary(email, start=None, end=None):
+    """
+    Returns the user's history downsampled to one row per day (computed in SQLite),
+    with the number of runs and min/mean/max of both scores (None for a day without scores).
+    """
+    clause, params = _date_filter(email, start, end)
+    query = f"""
+        SELECT substr(date, 1, 10) AS day, COUNT(*),
+               MIN(match_score), AVG(match_score), MAX(match_score),
+               MIN(semantic_score), AVG(semantic_score), MAX(semantic_score)
+        FROM history WHERE {clause}
+        GROUP BY day ORDER BY day
+    """
+    with _lock:
+        rows = _get_conn().execute(query, params).fetchall()
+    return [
+        {
+            "date": day, "runs": runs,
+            "match_min": m_min, "match_mean": _round_avg(m_avg), "match_max": m_max,
+            "semantic_min": s_min, "semantic_mean": _round_avg(s_avg), "semantic_max": s_max
         }
-        
-        users[email]["history"].append(record)
-        
-        # Save back to file
-        with open(DB_FILE, "w") as f:
-            json.dump(users, f)
-            
-def get_user_history(email):
-    """Returns the list of past analysis records."""
-    users = load_users()
-    if email in users and "history" in users[email]:
-        return users[email]["history"]
-    return []
\ No newline at end of file
+        for day, runs, m_min, m_avg, m_max, s_min, s_avg, s_max in rows
+    ]
+
+def is_admin(email):
+    """True if this user may see admin-only tools (listed in ADMIN_EMAILS)."""
+    return bool(email) and email.strip().lower() in ADMIN_EMAILS
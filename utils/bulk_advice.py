@@ -0,0 +1,147 @@
+import asyncio
+import re
+import time
+
+from utils.ats_matcher import normalize_skills
+from utils.llm_engine import acomplete, get_backend, get_cached_completion, run_async
+from utils.metrics import stage
+
+# Candidates per group prompt: big groups are split so a prompt (and its answer) stays small
+MAX_CANDIDATES_PER_PROMPT = 10
+
+# Resume excerpt per candidate inside a group prompt
+EXCERPT_CHARS = 600
+
+# Section headings the model is asked to answer with (parse_group_reply splits on them)
+SHARED_HEADING = "### SHARED"
+CANDIDATE_HEADING = "### CANDIDATE {}"
+_SECTION_RE = re.compile(r"^\s*###\s*(SHARED|CANDIDATE\s+(\d+))\s*$", re.IGNORECASE | re.MULTILINE)
+
+def skill_signature(missing_skills):
+    """Normalized, sorted missing skills: candidates with the same signature share guidance."""
+    return tuple(sorted(normalize_skills(missing_skills)))
+
+def build_group_prompt(signature, jd_text, resume_texts):
+    """
+    One prompt for a group of candidates with the same missing skills: the shared
+    guidance plus a short personal note for each candidate, in one answer.
+    """
+    missing_str = ", ".join(signature) if signature else "None"
+    resumes = "\n\n".join(
+        f"{CANDIDATE_HEADING.format(n)}\n{text[:EXCERPT_CHARS]}" for n, text in enumerate(resume_texts, start=1)
+    )
+    notes = "\n".join(f"{CANDIDATE_HEADING.format(n)}\n<note>" for n in range(1, len(resume_texts) + 1))
+    return f"""
+    Act as a Senior Technical Recruiter and Career Coach.
+    {len(resume_texts)} candidates applied to the job below and all of them have these MISSING SKILLS: {missing_str}
+
+    Your task:
+    1. For the top 3 most important missing skills, suggest a SPECIFIC mini-project or certification to prove them.
+    2. Provide a 'Power Statement' a candidate can add to their resume for each skill once they learn it.
+    3. Keep it encouraging but direct.
+    4. Then, for EACH candidate, write 2-3 sentences on which part of their EXISTING experience to build on to close that gap.
+
+    Answer in exactly this format (keep the headings as they are):
+    {SHARED_HEADING}
+    <advice for tasks 1-3>
+    {notes}
+
+    JOB DESCRIPTION:
+    {jd_text[:1000]}
+
+    CANDIDATE RESUMES:
+    {resumes}
+    """
+
+def parse_group_reply(reply, n_candidates):
+    """
+    Splits a group answer into (shared_advice, [note per candidate]).
+    Missing notes are empty strings; an answer without headings is all shared advice.
+    """
+    notes = [""] * n_candidates
+    matches = list(_SECTION_RE.finditer(reply))
+    if not matches:
+        return reply.strip(), notes
+
+    shared = reply[:matches[0].start()].strip()   # Anything before the first heading
+    for match, following in zip(matches, matches[1:] + [None]):
+        body = reply[match.end():following.start() if following else len(reply)].strip()
+        if match.group(2) is None:
+            shared = f"{shared}\n\n{body}".strip()
+        else:
+            n = int(match.group(2))
+            if 1 <= n <= n_candidates:
+                notes[n - 1] = body
+    return shared, notes
+
+class RateLimiter:
+    """Spaces out request starts to stay within a requests-per-minute budget."""
+
+    def __init__(self, requests_per_minute):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self.next_slot = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+async def agenerate_bulk_advice(candidates, jd_text, max_concurrency=4, requests_per_minute=60, backend=None):
+    """
+    Advice for many candidates with as few LLM calls as possible.
+    candidates: list of {"missing_skills", "resume_text"}.
+    Candidates are grouped by missing-skill signature, and each group (split into chunks of
+    MAX_CANDIDATES_PER_PROMPT) is one prompt that returns the shared guidance and every
+    personal note at once, within a concurrency and requests-per-minute budget.
+    Returns one advice text per candidate, in the same order (so equal names can't collide).
+    """
+    backend = backend or get_backend()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limiter = RateLimiter(requests_per_minute)
+
+    async def ask(prompt):
+        # Cached answers don't count against the budget
+        cached = get_cached_completion(prompt, backend)
+        if cached is not None:
+            return cached
+        async with semaphore:
+            await limiter.wait()
+            try:
+                return await acomplete(prompt, backend)
+            except Exception as e:
+                return f"Error generating advice: {str(e)}"
+
+    # 1. Group candidate positions by missing-skill signature, then cut groups into prompt-sized chunks
+    groups = {}
+    for i, candidate in enumerate(candidates):
+        groups.setdefault(skill_signature(candidate["missing_skills"]), []).append(i)
+    chunks = [
+        (sig, members[start:start + MAX_CANDIDATES_PER_PROMPT])
+        for sig, members in groups.items()
+        for start in range(0, len(members), MAX_CANDIDATES_PER_PROMPT)
+    ]
+
+    # 2. One call per chunk (all concurrently)
+    replies = await asyncio.gather(*[
+        ask(build_group_prompt(sig, jd_text, [candidates[i]["resume_text"] for i in members]))
+        for sig, members in chunks
+    ])
+
+    # 3. Split each answer back into one advice text per candidate
+    advice = [""] * len(candidates)
+    for (_, members), reply in zip(chunks, replies):
+        shared, notes = parse_group_reply(reply, len(members))
+        for i, note in zip(members, notes):
+            advice[i] = f"{note}\n\n{shared}".strip()
+    return advice
+
+def generate_bulk_advice(candidates, jd_text, max_concurrency=4, requests_per_minute=60, backend=None):
+    """Blocking version of agenerate_bulk_advice (for Streamlit)."""
+    with stage("llm_bulk"):
+        return run_async(agenerate_bulk_advice(candidates, jd_text, max_concurrency, requests_per_minute, backend))
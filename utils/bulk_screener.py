@@ -0,0 +1,186 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from utils.pdf_reader import extract_text_from_bytes
+from utils.resume_pipeline import analyze_resume
+from utils.semantic_matcher import calculate_semantic_matches, calculate_pairwise_matches
+from utils.job_profile import get_job_profile
+from utils.idf_model import load_idf_model
+from utils import metrics
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+# One warm pool per worker count, reused across Analyze clicks
+_POOLS = {}
+
+# IdfModel revisions loaded by this (worker) process, so each is read from disk once
+_IDF_MODELS = {}
+
+def _idf_model(revision):
+    model = _IDF_MODELS.get(revision)
+    if model is None:
+        model = _IDF_MODELS[revision] = load_idf_model(revision)
+    return model
+
+def screen_resume(name, data, job_profile, semantic=False, idf_revision=None):
+    """
+    Extracts and keyword-scores one candidate PDF (raw bytes) against a JobProfile.
+    Returns (row, cleaned_text). The row's "Semantic Match" is filled in afterwards
+    by add_semantic_scores, which scores the whole batch in one TF-IDF fit.
+    With semantic=True it is scored right away with IdfModel revision idf_revision
+    (only the revision number crosses the process boundary), so the score matches the
+    app's and doesn't depend on which other resumes are in the batch. Without a ready
+    model it falls back to a fit on the JD and this resume alone.
+    The row's "IDF Revision" names the revision used (None for the fallbacks).
+    """
+    idf_model = _idf_model(idf_revision) if semantic and idf_revision else None
+    analysis = analyze_resume(extract_text_from_bytes(data), job_profile, idf_model, semantic=semantic, detailed=False)
+
+    row = {
+        "Candidate Name": name,
+        "ATS Match": analysis.match_percentage,
+        "Semantic Match": analysis.semantic_score if semantic else 0.0,
+        "Missing Skills": sorted(analysis.missing_skills),  # Sorted so every worker gives the same order
+        "IDF Revision": analysis.idf_revision,
+    }
+    return row, analysis.cleaned_text
+
+def error_row(name, error):
+    """The row for a file that couldn't be screened (zero scores, plus the error)."""
+    return {
+        "Candidate Name": name,
+        "ATS Match": 0,
+        "Semantic Match": 0.0,
+        "Missing Skills": [],
+        "IDF Revision": None,
+        "Error": f"{type(error).__name__}: {error}",
+    }
+
+def _screen_task(name, data, job_profile, semantic, idf_revision):
+    """screen_resume in a worker process, plus the worker's metrics (stages, cache counters) for the parent."""
+    row, text = screen_resume(name, data, job_profile, semantic, idf_revision)
+    return row, text, metrics.drain()
+
+def score_resume_texts(texts, job_description, idf_revision=None):
+    """
+    Scores already-extracted resume texts against a JD. Returns one result dict per text.
+    Like add_semantic_scores, semantic scores come from IdfModel revision idf_revision
+    when one is given; without it, each resume is scored against the JD alone (one
+    pairwise vectorization for the whole list). Either way a score never depends on
+    the other texts in the list. Workers keep the JobProfile cached, so repeat JDs
+    are only analyzed once.
+    """
+    job_profile = get_job_profile(job_description)
+    analyses = [analyze_resume(text, job_profile, semantic=False, detailed=False) for text in texts]
+    cleaned, terms = [a.cleaned_text for a in analyses], [a.terms for a in analyses]
+    if idf_revision is not None:
+        scores = calculate_semantic_matches(cleaned, job_profile, _idf_model(idf_revision), terms)
+    else:
+        scores = calculate_pairwise_matches(cleaned, job_profile, terms)
+    return [
+        {
+            "ats_match": analysis.match_percentage,
+            "semantic_match": score,
+            "matched_skills": sorted(analysis.matched_skills),
+            "missing_skills": sorted(analysis.missing_skills),
+            "idf_revision": idf_revision,
+        }
+        for analysis, score in zip(analyses, scores)
+    ]
+
+def add_semantic_scores(rows, texts, job_profile, idf_model=None):
+    """
+    Fills "Semantic Match" for every row, vectorizing the JD and all resumes at once
+    (or with the persistent IdfModel, when one is given and ready).
+    """
+    scores = calculate_semantic_matches(texts, job_profile, idf_model)
+    for row, score in zip(rows, scores):
+        row["Semantic Match"] = score
+    return rows
+
+def _get_pool(max_workers):
+    pool = _POOLS.get(max_workers)
+    if pool is None:
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+        _POOLS[max_workers] = pool
+    return pool
+
+def _isolate(items, job_profile, semantic, idf_revision):
+    """
+    After a worker crash: screens each file that was in flight in a pool of its own,
+    so only the file that really kills a worker gets an error row.
+    """
+    for i, name, data in items:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            try:
+                row, text, worker_metrics = pool.submit(
+                    _screen_task, name, data, job_profile, semantic, idf_revision
+                ).result()
+            except Exception as e:
+                yield i, error_row(name, e), ""
+                continue
+        metrics.merge(worker_metrics)
+        yield i, row, text
+
+def iter_screen_results(files, job_profile, max_workers=None, semantic=False, max_pending=None, idf_revision=None):
+    """
+    Screens (name, pdf_bytes) pairs across a process pool.
+    Yields (index, row, cleaned_text) as each candidate finishes, so callers can
+    update progress while results arrive out of order.
+    `files` can be a lazy iterable: at most max_pending files (default: 4 per worker)
+    are in flight at once, so a folder of 20,000 PDFs is never all in memory.
+    A file that fails (or crashes its worker) yields an error_row instead of stopping the run.
+    """
+    if hasattr(files, "__len__"):
+        max_workers = min(max_workers or DEFAULT_WORKERS, len(files) or 1)
+    max_workers = max(1, max_workers or DEFAULT_WORKERS)
+
+    # Serial path: no pool overhead for a single worker (or a single file)
+    if max_workers == 1:
+        for i, (name, data) in enumerate(files):
+            try:
+                yield (i, *screen_resume(name, data, job_profile, semantic, idf_revision))
+            except Exception as e:
+                yield i, error_row(name, e), ""
+        return
+
+    max_pending = max_pending or max_workers * 4
+    pending = {}   # future -> (index, name, data)
+
+    def finished(futures):
+        for future in futures:
+            item = pending.pop(future)
+            try:
+                row, text, worker_metrics = future.result()
+            except BrokenProcessPool:
+                pending[future] = item   # Re-screened below with the rest of the in-flight files
+                raise
+            except Exception as e:
+                yield item[0], error_row(item[1], e), ""
+                continue
+            metrics.merge(worker_metrics)
+            yield item[0], row, text
+
+    files = enumerate(files)
+    while True:
+        pool = _get_pool(max_workers)
+        item = None   # The file being submitted (not in `pending` yet)
+        try:
+            for item in ((i, name, data) for i, (name, data) in files):
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from finished(done)
+                pending[pool.submit(_screen_task, item[1], item[2], job_profile, semantic, idf_revision)] = item
+                item = None
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from finished(done)
+            return
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a huge PDF): drop the pool, find the culprit among
+            # the in-flight files, then carry on with a fresh pool
+            _POOLS.pop(max_workers, None)
+            items = sorted(pending.values()) + ([item] if item else [])
+            pending.clear()
+            yield from _isolate(items, job_profile, semantic, idf_revision)
@@ -0,0 +1,89 @@
+import re
+
+WEAK_ACTION_WORDS = [
+    "worked on",
+    "helped",
+    "responsible for",
+    "assisted",
+    "participated",
+    "involved in"
+]
+
+# Every phrase/pattern rule, compiled into ONE alternation below.
+# Add a rule here and it's checked in the same single scan (no extra pass over the text).
+BULLET_RULES = {
+    "weak_verb": "|".join(re.escape(word) for word in WEAK_ACTION_WORDS),
+    "number": r"\d+",
+    # "was deployed", "were built"...: only the auxiliary is consumed, so a weak verb
+    # right after it ("was helped") is still found; the participle end is read from the lookahead
+    "passive": r"\b(?:was|were|is|are|been|being)[ \t]+(?=(?P<participle>\w+ed)\b)",
+}
+
+_RULES_RE = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in BULLET_RULES.items()) + r"|(?P<eol>\n)",
+    re.IGNORECASE
+)
+
+MIN_BULLET_CHARS = 5      # Shorter lines aren't real bullets
+MAX_BULLET_CHARS = 200    # Longer bullets are hard to skim
+
+class BulletFinding:
+    """One experience bullet and every rule match in it (spans are offsets into the full text)."""
+    __slots__ = ("text", "start", "end", "matches")
+
+    def __init__(self, text, start, end, matches):
+        self.text = text
+        self.start = start
+        self.end = end
+        self.matches = matches   # {rule_name: [(start, end), ...]}
+
+    @property
+    def is_weak(self):
+        return "weak_verb" in self.matches
+
+    @property
+    def is_quantified(self):
+        return "number" in self.matches
+
+    @property
+    def is_passive(self):
+        return "passive" in self.matches
+
+    @property
+    def too_short(self):
+        return len(self.text) < MIN_BULLET_CHARS
+
+    @property
+    def too_long(self):
+        return len(self.text) > MAX_BULLET_CHARS
+
+def analyze_bullets(experience_text):
+    """
+    Splits the experience text into bullets and evaluates every rule in one regex scan.
+    Returns a BulletFinding per non-empty line.
+    """
+    findings = []
+    line_start = 0
+    matches = {}
+
+    def close_line(line_end):
+        # Strip by moving offsets, then keep the line if anything is left
+        raw = experience_text[line_start:line_end]
+        text = raw.strip()
+        if text:
+            start = line_start + (len(raw) - len(raw.lstrip()))
+            findings.append(BulletFinding(text, start, start + len(text), matches))
+
+    for match in _RULES_RE.finditer(experience_text):
+        rule = match.lastgroup
+        if rule == "eol":
+            close_line(match.start())
+            line_start = match.end()
+            matches = {}
+        elif rule == "passive":
+            matches.setdefault(rule, []).append((match.start(), match.end("participle")))
+        else:
+            matches.setdefault(rule, []).append(match.span())
+
+    close_line(len(experience_text))
+    return findings
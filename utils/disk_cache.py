@@ -0,0 +1,124 @@
+import hashlib
+import os
+import threading
+
+from utils import metrics
+
+# Root folder for every on-disk cache (PDF text, ...). Anchored to the repo, so the app,
+# the CLI and the service share one cache wherever they're started from.
+CACHE_DIR = os.getenv(
+    "RESUME_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache"),
+)
+
+# How many writes between two eviction sweeps
+_EVICT_EVERY = 32
+
+def make_key(*parts):
+    """SHA-256 over the given str/bytes parts (e.g. extractor version + file bytes)."""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        h.update(part)
+        h.update(b"\0")
+    return h.hexdigest()
+
+class DiskCache:
+    """
+    A small content-addressed text cache on disk with size-capped LRU eviction.
+
+    - One file per entry, written to a temp file then os.replace()d, so several
+      Streamlit sessions or worker processes can share the folder safely.
+    - Reads "touch" the file, so mtime order is least-recently-used order.
+    - Hits and misses are metrics counters ("<name>_cache_hits" / "<name>_cache_misses"),
+      so worker processes hand theirs to the parent with the rest of their metrics.
+    """
+
+    def __init__(self, name, max_bytes):
+        self.directory = os.path.join(CACHE_DIR, name)
+        self.max_bytes = max_bytes
+        self._hits_counter = f"{name}_cache_hits"
+        self._misses_counter = f"{name}_cache_misses"
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key):
+        """Returns the cached text, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = f.read().decode("utf-8")
+        except (OSError, UnicodeDecodeError):
+            metrics.count(self._misses_counter)
+            return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass  # Read-only cache: the entry is still valid, it just isn't touched
+
+        metrics.count(self._hits_counter)
+        return value
+
+    def set(self, key, value):
+        """Stores text under key. Failures (read-only disk, full disk) are ignored."""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(value.encode("utf-8"))
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+
+        with self._lock:
+            self._writes += 1
+            sweep = self._writes % _EVICT_EVERY == 1
+        if sweep:
+            self.evict()
+
+    def _entries(self):
+        """Lists (mtime, size, path) for every entry currently on disk."""
+        entries = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue  # Removed by another process meanwhile
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def evict(self):
+        """Deletes least-recently-used entries until the cache fits in max_bytes."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self):
+        """Returns hit/miss counters (this process plus merged workers) and the current on-disk footprint."""
+        entries = self._entries()
+        counters = metrics.counters()
+        return {
+            "hits": counters.get(self._hits_counter, 0),
+            "misses": counters.get(self._misses_counter, 0),
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+        }
@@ -0,0 +1,358 @@
+import atexit
+import contextlib
+import hashlib
+import glob
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:   # Windows
+    fcntl = None
+    import msvcrt
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from utils.disk_cache import CACHE_DIR
+from utils.semantic_matcher import analyze_terms
+
+# Bump MODEL_VERSION whenever hashing/tokenization (or the file layout) changes: old files are then ignored
+MODEL_VERSION = 2
+N_FEATURES = 2 ** 18
+MODEL_DIR = os.path.join(CACHE_DIR, "idf_model")
+
+# Below this many documents the corpus IDF is too noisy, callers fall back to per-batch TF-IDF
+MIN_DOCS = int(os.getenv("IDF_MODEL_MIN_DOCS", 20))
+
+# Every revision is saved as a small delta (the new documents' term columns and ids), so all of
+# them stay on disk and any saved score can be reproduced. Every SNAPSHOT_EVERY revisions the full
+# state is written too, so loading replays at most that many deltas; only the newest
+# KEEP_SNAPSHOTS snapshots are kept (older revisions replay from the oldest one kept, or from zero).
+SNAPSHOT_EVERY = int(os.getenv("IDF_MODEL_SNAPSHOT_EVERY", 20))
+KEEP_SNAPSHOTS = int(os.getenv("IDF_MODEL_KEEP_SNAPSHOTS", 2))
+
+# fold_in() saves in the background once this many new documents are waiting,
+# or once the oldest waiting one is this old (atexit saves whatever is left)
+SAVE_EVERY_DOCS = int(os.getenv("IDF_MODEL_SAVE_EVERY_DOCS", 50))
+SAVE_INTERVAL_SECONDS = float(os.getenv("IDF_MODEL_SAVE_INTERVAL", 300))
+
+def _identity(terms):
+    return terms
+
+# No vocabulary to store: terms are hashed straight into N_FEATURES columns
+_HASHER = HashingVectorizer(analyzer=_identity, n_features=N_FEATURES, alternate_sign=False, norm=None)
+
+def _doc_id(text):
+    """64-bit fingerprint of a document, so the same resume is never counted twice."""
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+
+def _revision_path(revision):
+    return os.path.join(MODEL_DIR, f"idf_v{MODEL_VERSION}_r{revision:06d}.npz")
+
+def _snapshot_path(revision):
+    return os.path.join(MODEL_DIR, f"idf_v{MODEL_VERSION}_s{revision:06d}.npz")
+
+@contextlib.contextmanager
+def _file_lock():
+    """
+    Exclusive lock on MODEL_DIR across processes. Only the app saves (through fold_in),
+    but several app processes can share the folder; bulk_screen.py and score_service.py
+    only read revisions, which os.replace() makes appear whole.
+    """
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    with open(os.path.join(MODEL_DIR, "model.lock"), "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+class IdfModel:
+    """
+    Corpus-wide document frequencies over hashed terms.
+    Scoring is a transform plus a dot product (no fitting), so a resume gets the
+    same score against a JD no matter which other resumes it is screened with.
+
+    Scores always come from a saved revision: update() only queues documents, and
+    save() merges them into the newest revision on disk. Record `revision` (see
+    scored_revision) next to a score and load_idf_model(revision) reproduces it.
+    """
+
+    def __init__(self, doc_freq=None, n_docs=0, seen=None, revision=0):
+        # The saved state. Never modified in place (save() swaps in new arrays),
+        # so pinned() copies can share it
+        self.doc_freq = doc_freq if doc_freq is not None else np.zeros(N_FEATURES, dtype=np.int64)
+        self.n_docs = n_docs
+        self.seen = seen if seen is not None else np.zeros(0, dtype=np.uint64)  # Sorted doc ids
+        self.revision = revision
+        self._idf = None
+        self._pending = {}          # doc id -> hashed term columns, waiting for the next save()
+        self._pending_since = None
+        self._lock = threading.Lock()
+
+    def is_ready(self):
+        """True once the corpus is big enough for its IDF to be meaningful."""
+        return self.n_docs >= MIN_DOCS
+
+    @property
+    def scored_revision(self):
+        """The revision scores from this model belong to (None while not ready: callers fit per batch)."""
+        return self.revision if self.is_ready() else None
+
+    def pinned(self):
+        """A read-only copy of the current revision (shares its arrays): scores from it never move."""
+        with self._lock:
+            copy = IdfModel(self.doc_freq, self.n_docs, self.seen, self.revision)
+            copy._idf = self.idf()   # Computed once per revision, not once per copy
+        return copy
+
+    @property
+    def pending(self):
+        """How many documents are waiting to be saved."""
+        return len(self._pending)
+
+    def update(self, texts):
+        """
+        Queues new documents for the next save() (duplicates are skipped).
+        Returns how many documents were added.
+        """
+        ids = {}
+        for text in texts:
+            if text.strip():
+                ids.setdefault(_doc_id(text), text)
+
+        with self._lock:
+            new_ids = [
+                doc_id for doc_id in ids
+                if doc_id not in self._pending and not _contains(self.seen, doc_id)
+            ]
+            if not new_ids:
+                return 0
+
+            counts = _HASHER.transform([analyze_terms(ids[doc_id]) for doc_id in new_ids])
+            # Each row lists a term column once, so its column indices are its document-frequency increments
+            for row, doc_id in enumerate(new_ids):
+                self._pending[doc_id] = counts.indices[counts.indptr[row]:counts.indptr[row + 1]]
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+        return len(new_ids)
+
+    def save_due(self):
+        """True when enough documents are queued (or for long enough) to be worth a save."""
+        with self._lock:
+            if not self._pending:
+                return False
+            return (len(self._pending) >= SAVE_EVERY_DOCS
+                    or time.monotonic() - self._pending_since >= SAVE_INTERVAL_SECONDS)
+
+    def idf(self):
+        """Smoothed IDF, same formula as sklearn's TfidfTransformer."""
+        idf = self._idf
+        if idf is None:
+            idf = self._idf = np.log((1 + self.n_docs) / (1 + self.doc_freq)) + 1
+        return idf
+
+    def transform(self, term_lists):
+        """Turns tokenized documents into L2-normalized TF-IDF rows."""
+        counts = _HASHER.transform(term_lists)
+        return normalize(counts.multiply(self.idf()).tocsr())
+
+    def score(self, resume_texts, jd_text, resume_terms=None):
+        """
+        Cosine similarity (as rounded percentages) of every resume with the JD.
+        jd_text can also be a JobProfile (JD already tokenized), and resume_terms
+        the resumes' analyze_terms (so they aren't tokenized again).
+        """
+        jd_terms = getattr(jd_text, "terms", None)
+        if jd_terms is None:
+            jd_terms = analyze_terms(jd_text)
+
+        scores = [0.0] * len(resume_texts)
+        positions = [i for i, text in enumerate(resume_texts) if text.strip()]
+        if not positions or not jd_terms:
+            return scores
+
+        model = self.pinned()   # One consistent revision for the whole call, even if a save lands meanwhile
+        jd_vector = model.transform([jd_terms])
+        resume_matrix = model.transform([
+            resume_terms[i] if resume_terms is not None else analyze_terms(resume_texts[i]) for i in positions
+        ])
+        similarities = (resume_matrix @ jd_vector.T).toarray().ravel()
+
+        for i, score in zip(positions, similarities):
+            scores[i] = round(float(score * 100), 2)
+        return scores
+
+    def save(self):
+        """
+        Merges the queued documents into the newest revision on disk (which may have been
+        written by another process meanwhile) and writes the result as the next revision.
+        The whole read-merge-write holds a file lock, so no process drops another's updates.
+        Afterwards this model is that new revision. Returns its path (None if nothing was saved).
+        """
+        try:
+            with _file_lock():
+                saved = _saved_revisions("r")
+                latest = saved[-1] if saved else 0
+                base = _load_revision(latest) if latest > self.revision else None
+                with self._lock:
+                    pending = dict(self._pending)
+                    base = base or self
+                    new_ids = [doc_id for doc_id in pending if not _contains(base.seen, doc_id)]
+
+                if not new_ids:
+                    self._adopt(base, pending)
+                    return None
+
+                # The new revision: the base plus one count per queued document's term column
+                revision = max(latest, self.revision) + 1
+                columns = np.concatenate([pending[doc_id] for doc_id in new_ids]).astype(np.int32)
+                ids = np.array(new_ids, dtype=np.uint64)
+                merged = IdfModel(
+                    base.doc_freq + np.bincount(columns, minlength=N_FEATURES),
+                    base.n_docs + len(new_ids),
+                    np.union1d(base.seen, ids),
+                    revision,
+                )
+                path = _revision_path(revision)
+                _write(path, columns=columns, new_ids=ids, n_docs=merged.n_docs)
+                # A snapshot every SNAPSHOT_EVERY revisions, or whenever the delta chain has a gap
+                if revision % SNAPSHOT_EVERY == 0 or base.revision != revision - 1:
+                    _write(_snapshot_path(revision), doc_freq=merged.doc_freq, seen=merged.seen, n_docs=merged.n_docs)
+                    for old in _saved_revisions("s")[:-KEEP_SNAPSHOTS]:
+                        os.remove(_snapshot_path(old))
+                self._adopt(merged, pending)
+        except OSError:
+            return None   # Read-only disk: the documents stay queued
+        return path
+
+    def _adopt(self, other, saved):
+        """Switches to another revision's state and drops the queued documents it now includes."""
+        with self._lock:
+            self.doc_freq, self.n_docs, self.seen, self.revision = other.doc_freq, other.n_docs, other.seen, other.revision
+            self._idf = None
+            for doc_id in saved:
+                self._pending.pop(doc_id, None)
+            self._pending_since = time.monotonic() if self._pending else None
+
+def _contains(sorted_ids, doc_id):
+    """Membership test on a sorted uint64 array (binary search)."""
+    i = np.searchsorted(sorted_ids, np.uint64(doc_id))
+    return i < len(sorted_ids) and sorted_ids[i] == doc_id
+
+def _saved_revisions(kind):
+    """Revision numbers saved as deltas ("r") or snapshots ("s") for the current model version, oldest first."""
+    prefix = f"idf_v{MODEL_VERSION}_{kind}"
+    names = (os.path.basename(path) for path in glob.glob(os.path.join(MODEL_DIR, f"{prefix}*.npz")))
+    return sorted(int(name[len(prefix):-len(".npz")]) for name in names)
+
+def _write(path, **arrays):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(f, version=MODEL_VERSION, n_features=N_FEATURES, **arrays)
+    os.replace(tmp_path, path)
+
+def _read(path, *fields):
+    """The given arrays of one saved file, or None if it's missing or unusable."""
+    try:
+        with np.load(path) as data:
+            if int(data["version"]) != MODEL_VERSION or int(data["n_features"]) != N_FEATURES:
+                return None
+            return [data[field] for field in fields]
+    except (OSError, KeyError, ValueError):
+        return None
+
+def _load_revision(revision):
+    """
+    Rebuilds one revision: the newest usable snapshot at or before it, plus every delta
+    after that. Returns None if a delta on the way is missing or unusable.
+    """
+    doc_freq, n_docs, start = np.zeros(N_FEATURES, dtype=np.int64), 0, 0
+    seen = [np.zeros(0, dtype=np.uint64)]
+    for snapshot in reversed([r for r in _saved_revisions("s") if r <= revision]):
+        data = _read(_snapshot_path(snapshot), "doc_freq", "seen", "n_docs")
+        if data is not None:
+            doc_freq, n_docs, start = data[0].astype(np.int64), int(data[2]), snapshot
+            seen.append(data[1])
+            break
+
+    columns = []
+    for r in range(start + 1, revision + 1):
+        data = _read(_revision_path(r), "columns", "new_ids", "n_docs")
+        if data is None:
+            return None
+        columns.append(data[0])
+        seen.append(data[1])
+        n_docs = int(data[2])
+    if columns:
+        doc_freq = doc_freq + np.bincount(np.concatenate(columns), minlength=N_FEATURES)
+    return IdfModel(doc_freq, n_docs, np.unique(np.concatenate(seen)), revision)
+
+def _load_latest():
+    for revision in reversed(_saved_revisions("r")):
+        model = _load_revision(revision)
+        if model is not None:
+            return model
+    return None
+
+def load_idf_model(revision=None):
+    """
+    Loads the latest saved model, or a specific revision to reproduce old scores
+    (raises FileNotFoundError if that revision can't be rebuilt from disk).
+    Returns an empty model if nothing usable is on disk.
+    """
+    if revision is not None:
+        model = _load_revision(revision) if revision else IdfModel()
+        if model is None:
+            raise FileNotFoundError(f"IDF model revision {revision} is not in {MODEL_DIR}")
+        return model
+    return _load_latest() or IdfModel()
+
+# Shared, process-wide instance (loaded on first use)
+_MODEL = None
+_SAVING = threading.Lock()   # At most one background save at a time
+
+def get_idf_model():
+    """Returns the process-wide IdfModel, loading it from disk the first time."""
+    global _MODEL
+    if _MODEL is None:
+        _MODEL = load_idf_model()
+    return _MODEL
+
+def _save_in_background(model):
+    if not _SAVING.acquire(blocking=False):
+        return   # A save is already running: it (or the next fold_in) picks these documents up
+    def run():
+        try:
+            model.save()
+        finally:
+            _SAVING.release()
+    threading.Thread(target=run, name="idf-model-save", daemon=True).start()
+
+def fold_in(texts):
+    """
+    Queues new resumes for the shared model. They are saved (as a new revision) in a
+    background thread once enough have piled up, so an Analyze click never waits on disk.
+    """
+    model = get_idf_model()
+    if model.update(texts) and model.save_due():
+        _save_in_background(model)
+    return model
+
+@atexit.register
+def flush():
+    """Saves whatever is still queued (runs at interpreter exit; call it directly at the end of a batch job)."""
+    if _MODEL is not None and _MODEL.pending:
+        with _SAVING:
+            _MODEL.save()
@@ -0,0 +1,43 @@
+import hashlib
+from collections import OrderedDict
+
+from utils.ats_matcher import extract_skills_from_tokens, normalize_skills
+from utils.semantic_matcher import terms_from_tokens
+from utils.skill_taxonomy import tokenize
+
+# Recently used profiles, keyed by JD hash (survives Streamlit reruns: the module stays imported)
+_PROFILE_CACHE = OrderedDict()
+_MAX_PROFILES = 32
+
+class JobProfile:
+    """
+    Everything we derive from a Job Description, computed once and reused for every candidate.
+    """
+    __slots__ = ("jd_hash", "jd_text", "skills", "normalized_skills", "terms")
+
+    def __init__(self, job_description):
+        self.jd_hash = hash_jd(job_description)
+        self.jd_text = job_description.lower()
+        tokens = tokenize(self.jd_text)                             # One tokenization for both engines
+        self.skills = extract_skills_from_tokens(tokens)            # Raw skills found in the JD
+        self.normalized_skills = normalize_skills(self.skills)      # What match_skills compares against
+        self.terms = terms_from_tokens(tokens)                      # Tokens fed to the TF-IDF vectorizer
+
+def hash_jd(job_description):
+    """Stable SHA-256 of the JD text."""
+    return hashlib.sha256(job_description.encode("utf-8")).hexdigest()
+
+def get_job_profile(job_description):
+    """
+    Returns the JobProfile for this JD, building it only the first time we see it.
+    """
+    key = hash_jd(job_description)
+    profile = _PROFILE_CACHE.get(key)
+    if profile is None:
+        profile = JobProfile(job_description)
+        _PROFILE_CACHE[key] = profile
+        if len(_PROFILE_CACHE) > _MAX_PROFILES:
+            _PROFILE_CACHE.popitem(last=False)  # Drop the least recently used JD
+    else:
+        _PROFILE_CACHE.move_to_end(key)
+    return profile
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+PASS_LABEL = "✅ Pass"
+REJECT_LABEL = "❌ Reject"
+
+COLUMNS = ["Candidate Name", "Status", "Final Score", "ATS Match", "Semantic Match", "Missing Skills"]
+
+class Leaderboard:
+    """
+    Bulk results stored column by column (one NumPy array per field), so re-weighting,
+    thresholding and ranking 100k candidates are a few vectorized operations.
+    Built once per bulk run; every slider move only calls the cheap methods below.
+    """
+    __slots__ = ("names", "ats", "semantic", "missing", "missing_display", "idf_revision")
+
+    def __init__(self, names, ats, semantic, missing, idf_revision=None):
+        self.names = np.asarray(names, dtype=object)
+        self.ats = np.asarray(ats, dtype=np.float64)
+        self.semantic = np.asarray(semantic, dtype=np.float64)
+        self.missing = missing                                   # Full lists (for AI advice)
+        # What the table shows: the first 5 missing skills, joined once up front
+        self.missing_display = np.array([", ".join(skills[:5]) for skills in missing], dtype=object)
+        self.idf_revision = idf_revision                         # IdfModel revision behind the semantic scores
+
+    @classmethod
+    def from_rows(cls, rows, idf_revision=None):
+        """From screen_resume-style row dicts (Candidate Name, ATS Match, Semantic Match, Missing Skills)."""
+        return cls(
+            [row["Candidate Name"] for row in rows],
+            [row["ATS Match"] for row in rows],
+            [row["Semantic Match"] for row in rows],
+            [row["Missing Skills"] for row in rows],
+            idf_revision,
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def final_scores(self, ats_weight, sem_weight):
+        """Weighted score of every candidate (weights in percent)."""
+        return self.ats * (ats_weight / 100) + self.semantic * (sem_weight / 100)
+
+    @staticmethod
+    def ranked(scores, start, stop):
+        """
+        Rows ranked start..stop-1 (0-based, best score first, ties broken by row order).
+        Uses a partial sort: only the rows in that slice (and any tied with its ends)
+        are sorted, so the last page costs the same as the first.
+        """
+        n = len(scores)
+        start, stop = max(start, 0), min(stop, n)
+        if start >= stop:
+            return np.empty(0, dtype=np.intp)
+        neg = -scores
+        bounds = np.partition(neg, [start, stop - 1])
+        first, last = bounds[start], bounds[stop - 1]
+        # Every row scoring between the slice's ends, plus the count of rows strictly above it
+        rows = np.flatnonzero((neg >= first) & (neg <= last))
+        above = np.count_nonzero(neg < first)
+        rows = rows[np.lexsort((rows, neg[rows]))]
+        return rows[start - above: stop - above]
+
+    @classmethod
+    def top_k(cls, scores, k):
+        """Rows of the k best scores, best first (ties broken by row order)."""
+        return cls.ranked(scores, 0, k)
+
+    def page(self, scores, cutoff, page, page_size):
+        """The DataFrame for one page of the ranking (page starts at 1): the only rows we render."""
+        offset = (page - 1) * page_size
+        return self._frame(self.ranked(scores, offset, offset + page_size), scores, cutoff)
+
+    def ranked_frame(self, scores, cutoff):
+        """The whole ranking as a DataFrame (for CSV export, not for display), with the IDF revision."""
+        df = self._frame(self.top_k(scores, len(scores)), scores, cutoff)
+        df["IDF Revision"] = self.idf_revision
+        return df
+
+    def _frame(self, rows, scores, cutoff):
+        """Display columns for the given rows; the DataFrame index is the row (upload position)."""
+        selected = scores[rows]
+        return pd.DataFrame({
+            "Candidate Name": self.names[rows],
+            "Status": np.where(selected >= cutoff, PASS_LABEL, REJECT_LABEL),
+            # Python's round (correctly rounded, unlike np.round): same values as a per-row round()
+            "Final Score": [round(score, 1) for score in selected.tolist()],
+            "ATS Match": self.ats[rows],
+            "Semantic Match": self.semantic[rows],
+            "Missing Skills": self.missing_display[rows],
+        }, columns=COLUMNS, index=rows)
+
+    def rejected(self, scores, cutoff):
+        """Rows below the cutoff, best score first."""
+        rows = np.flatnonzero(scores < cutoff)
+        return rows[np.lexsort((rows, -scores[rows]))]
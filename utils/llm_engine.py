@@ -1,49 +1,217 @@
-import google.generativeai as genai
-import streamlit as st
+import asyncio
+import hashlib
 import os
+import re
+import threading
+from utils.disk_cache import DiskCache, make_key
+from utils.metrics import stage
 
-try:
-    api_key = st.secrets["GOOGLE_API_KEY"]
-except:
-    api_key = os.getenv("GOOGLE_API_KEY")
+# google.generativeai is slow to import, so it's only loaded (and configured)
+# the first time a Gemini backend is created
+_api_key = None
+_genai_configured = False
 
-if api_key:
-    genai.configure(api_key=api_key)
+MODEL_NAME = 'gemini-flash-latest'
 
-def get_ai_feedback(resume_text, jd_text, missing_skills):
+# "gemini" (default) or "stub" (offline, deterministic: for tests and benchmarks)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+
+# At most this many LLM requests in flight at once, across all sessions of this process
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 4))
+
+# Answers are cached on disk by hash(model + prompt), so repeat clicks are instant
+RESPONSE_CACHE = DiskCache("llm", int(os.getenv("LLM_CACHE_MAX_BYTES", 64 * 1024 * 1024)))
+
+def get_api_key():
+    """The Gemini API key from Streamlit secrets (or the GOOGLE_API_KEY env var), read once."""
+    global _api_key
+    if _api_key is None:
+        try:
+            import streamlit as st
+            _api_key = st.secrets["GOOGLE_API_KEY"]
+        except Exception:
+            _api_key = os.getenv("GOOGLE_API_KEY") or ""
+    return _api_key
+
+def _get_genai():
+    global _genai_configured
+    import google.generativeai as genai
+    if not _genai_configured:
+        if get_api_key():
+            genai.configure(api_key=get_api_key())
+        _genai_configured = True
+    return genai
+
+class GeminiBackend:
+    """Streams completions from Google Gemini."""
+
+    def __init__(self, model_name=MODEL_NAME):
+        self.model_name = model_name
+        self.model = _get_genai().GenerativeModel(model_name)
+
+    async def stream(self, prompt):
+        response = await self.model.generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+class StubBackend:
     """
-    Asks Gemini to provide actionable advice on HOW to fill the missing gaps.
+    Offline backend: returns canned, deterministic advice word by word.
+    `delay` (seconds per chunk) simulates network latency for benchmarks.
+    """
+
+    def __init__(self, delay=0.0, model_name="stub"):
+        self.model_name = model_name
+        self.delay = delay
+
+    async def stream(self, prompt):
+        match = re.search(r"MISSING SKILLS: (.*)", prompt)
+        skills = match.group(1).strip() if match else "None"
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+        text = (
+            f"**Stub advice ({digest})**\n"
+            f"* Focus on: {skills}.\n"
+            "* Build one small project per skill and add a measurable result to your resume.\n"
+        )
+        # Group prompts (utils.bulk_advice) ask for a shared section plus one note per candidate
+        if "### SHARED" in prompt:
+            candidates = sorted({int(n) for n in re.findall(r"^\s*### CANDIDATE (\d+)\s*$", prompt, re.MULTILINE)})
+            text = "### SHARED\n" + text + "".join(
+                f"### CANDIDATE {n}\nBuild on your most recent project (candidate {n}).\n" for n in candidates
+            )
+        for word in re.findall(r"\S+\s*", text):
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            yield word
+
+BACKENDS = {"gemini": GeminiBackend, "stub": StubBackend}
+
+_backend = None
+_loop = None
+_semaphore = None
+_loop_lock = threading.Lock()
+
+def get_backend():
+    """Returns the process-wide backend (chosen by LLM_BACKEND)."""
+    global _backend
+    if _backend is None:
+        _backend = BACKENDS[LLM_BACKEND]()
+    return _backend
+
+def set_backend(backend):
+    """Swaps the backend (e.g. StubBackend() in tests or benchmarks)."""
+    global _backend
+    _backend = backend
+
+def _get_loop():
+    """
+    One background event loop for all LLM calls: Streamlit scripts run in plain threads,
+    and the async Gemini client must always be used from the same loop.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="llm-loop", daemon=True).start()
+    return _loop
+
+def _get_semaphore():
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    return _semaphore
+
+async def astream_completion(prompt, backend=None):
     """
-    if not api_key:
-        return "⚠️ Google API Key not found. Please check your secrets.toml file."
+    Async generator of text chunks for a prompt.
+    Cached answers come back as a single chunk without calling the model.
+    """
+    backend = backend or get_backend()
+    key = make_key(backend.model_name, prompt)
+    cached = RESPONSE_CACHE.get(key)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    async with _get_semaphore():
+        async for chunk in backend.stream(prompt):
+            parts.append(chunk)
+            yield chunk
+
+    # Only complete answers are cached (errors raise before we get here)
+    RESPONSE_CACHE.set(key, "".join(parts))
+
+def get_cached_completion(prompt, backend=None):
+    """Returns the cached answer for a prompt, or None (never calls the model)."""
+    backend = backend or get_backend()
+    return RESPONSE_CACHE.get(make_key(backend.model_name, prompt))
+
+async def acomplete(prompt, backend=None):
+    """Returns the full completion for a prompt (cached)."""
+    return "".join([chunk async for chunk in astream_completion(prompt, backend)])
+
+def run_async(coro):
+    """Runs a coroutine on the LLM loop and waits for its result (from a normal thread)."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+def iter_async(agen):
+    """Turns an async generator into a normal one by pulling each item through the LLM loop."""
+    try:
+        while True:
+            try:
+                yield run_async(agen.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        run_async(agen.aclose())
+
+def build_feedback_prompt(resume_text, jd_text, missing_skills):
+    """Builds the career-coach prompt sent to the model."""
+    # Sorted, so the same skills always give the same prompt (and the same cache key)
+    missing_str = ", ".join(sorted(missing_skills)) if missing_skills else "None"
 
-    # Create a focused prompt
-    missing_str = ", ".join(missing_skills) if missing_skills else "None"
-    
     # --- THIS IS THE NEW DAY 14 PROMPT ---
-    prompt = f"""
-    Act as a Senior Technical Recruiter and Career Coach. 
+    return f"""
+    Act as a Senior Technical Recruiter and Career Coach.
     I have a candidate's resume and a job description.
-    
+
     The system has detected these MISSING SKILLS: {missing_str}
-    
+
     Your task:
     1. For the top 3 most important missing skills, suggest a SPECIFIC mini-project or certification to prove them.
        (e.g., if missing 'Docker', suggest "Containerize your existing Python script").
     2. Provide a 'Power Statement' the candidate can add to their resume for each skill once they learn it.
     3. Keep it encouraging but direct.
-    
+
     RESUME CONTENT:
     {resume_text[:2000]}
-    
+
     JOB DESCRIPTION:
     {jd_text[:1000]}
     """
-    
+
+def stream_ai_feedback(resume_text, jd_text, missing_skills):
+    """
+    Same advice as get_ai_feedback, yielded chunk by chunk as the model writes it
+    (works directly with st.write_stream).
+    """
+    backend = get_backend()
+    if isinstance(backend, GeminiBackend) and not get_api_key():
+        yield "⚠️ Google API Key not found. Please check your secrets.toml file."
+        return
+
+    prompt = build_feedback_prompt(resume_text, jd_text, missing_skills)
     try:
-        # --- WE KEEP YOUR WORKING MODEL HERE ---
-        model = genai.GenerativeModel('gemini-flash-latest')
-        response = model.generate_content(prompt)
-        return response.text
+        # Timed up to the last chunk, so this is what the user waits for (model + streaming)
+        with stage("llm"):
+            yield from iter_async(astream_completion(prompt, backend))
     except Exception as e:
-        return f"Error generating advice: {str(e)}"
\ No newline at end of file
+        yield f"Error generating advice: {str(e)}"
+
+def get_ai_feedback(resume_text, jd_text, missing_skills):
+    """
+    Asks Gemini to provide actionable advice on HOW to fill the missing gaps.
+    """
+    return "".join(stream_ai_feedback(resume_text, jd_text, missing_skills))
@@ -0,0 +1,293 @@
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+# Off by default. RESUME_METRICS=1 turns stage timing on, RESUME_METRICS_MEMORY=1 also
+# tracks memory peaks with tracemalloc (much slower: only for debugging sessions).
+METRICS_ENABLED = os.getenv("RESUME_METRICS", "0") == "1"
+TRACE_MEMORY = os.getenv("RESUME_METRICS_MEMORY", "0") == "1"
+
+# Where export_files() writes metrics.json and metrics.prom (anchored to the repo, like the caches)
+METRICS_DIR = os.getenv(
+    "RESUME_METRICS_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "metrics"),
+)
+
+# Histogram bucket upper bounds (Prometheus-style, cumulative when exported)
+TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+MEMORY_BUCKETS = tuple(2 ** p for p in range(16, 31, 2))   # 64 KB .. 1 GB
+
+# What each stage records: {kind: buckets}
+_KINDS = {"wall_seconds": TIME_BUCKETS, "cpu_seconds": TIME_BUCKETS, "memory_peak_bytes": MEMORY_BUCKETS}
+
+class Histogram:
+    """Fixed-bucket histogram: count, sum and per-bucket counts (the last bucket is +Inf)."""
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        i = 0
+        for bound in self.bounds:
+            if value <= bound:
+                break
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+
+    def merge(self, other):
+        for i, n in enumerate(other["counts"]):
+            self.counts[i] += n
+        self.count += other["count"]
+        self.sum += other["sum"]
+
+    def quantile(self, q):
+        """Estimated q-quantile, interpolated inside its bucket (like Prometheus' histogram_quantile)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                if i == len(self.bounds):
+                    return lower   # +Inf bucket: the best we can say is "above the last bound"
+                upper = self.bounds[i]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+            if i < len(self.bounds):
+                lower = self.bounds[i]
+        return lower
+
+    def to_dict(self):
+        return {"bounds": list(self.bounds), "counts": list(self.counts), "count": self.count, "sum": self.sum}
+
+_stages = {}
+_counters = {}   # name -> int (cache hits/misses, ...): always on, each one is a dict update
+_lock = threading.Lock()
+
+def _histogram(name, kind):
+    stage_hists = _stages.get(name)
+    if stage_hists is None:
+        stage_hists = _stages[name] = {}
+    hist = stage_hists.get(kind)
+    if hist is None:
+        hist = stage_hists[kind] = Histogram(_KINDS[kind])
+    return hist
+
+def record(name, wall, cpu, memory_peak=None):
+    """Adds one observation for a stage (stage() calls this for you)."""
+    with _lock:
+        _histogram(name, "wall_seconds").observe(wall)
+        _histogram(name, "cpu_seconds").observe(cpu)
+        if memory_peak is not None:
+            _histogram(name, "memory_peak_bytes").observe(memory_peak)
+
+def count(name, n=1):
+    """Adds n to a counter. Unlike stages, counters are recorded even with metrics off."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+class _Stage:
+    __slots__ = ("name", "wall", "cpu", "memory")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.memory = None
+        if TRACE_MEMORY and tracemalloc.is_tracing():
+            # Peaks are per stage: nested stages reset the peak, so outer peaks are a lower bound
+            self.memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self.cpu = time.thread_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall
+        cpu = time.thread_time() - self.cpu
+        peak = None
+        if self.memory is not None:
+            peak = max(0, tracemalloc.get_traced_memory()[1] - self.memory)
+        record(self.name, wall, cpu, peak)
+        return False
+
+# Shared do-nothing context manager: a disabled stage() costs one global check
+_NULL_STAGE = contextlib.nullcontext()
+
+def stage(name):
+    """
+    Times a pipeline stage:
+
+        with stage("extract"):
+            text = extract_text_from_pdf(file)
+
+    Records wall time, CPU time (of this thread) and, with TRACE_MEMORY, the memory peak.
+    """
+    if not METRICS_ENABLED:
+        return _NULL_STAGE
+    return _Stage(name)
+
+def timed(name):
+    """Decorator form of stage(), for functions that are a stage on their own."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def enable(memory=False):
+    """Turns metrics on at runtime (and for worker processes started afterwards)."""
+    global METRICS_ENABLED, TRACE_MEMORY
+    METRICS_ENABLED = True
+    os.environ["RESUME_METRICS"] = "1"
+    if memory:
+        TRACE_MEMORY = True
+        os.environ["RESUME_METRICS_MEMORY"] = "1"
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+if METRICS_ENABLED and TRACE_MEMORY and not tracemalloc.is_tracing():
+    tracemalloc.start()
+
+def _as_data():
+    return {
+        "stages": {name: {kind: hist.to_dict() for kind, hist in hists.items()} for name, hists in _stages.items()},
+        "counters": dict(_counters),
+    }
+
+def snapshot():
+    """
+    {"stages": {stage: {kind: histogram dict}}, "counters": {name: int}}: plain data,
+    safe to pickle across processes or dump as JSON.
+    """
+    with _lock:
+        return _as_data()
+
+def reset():
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+
+def drain():
+    """snapshot() and reset() in one step: worker processes hand their metrics to the parent this way."""
+    with _lock:
+        data = _as_data()
+        _stages.clear()
+        _counters.clear()
+    return data
+
+def merge(data):
+    """Adds a snapshot()/drain() from another process into this one."""
+    if not data:
+        return
+    with _lock:
+        for name, hists in data.get("stages", {}).items():
+            for kind, hist in hists.items():
+                _histogram(name, kind).merge(hist)
+        for name, n in data.get("counters", {}).items():
+            _counters[name] = _counters.get(name, 0) + n
+
+def counters():
+    """Every counter of this process (including what workers handed back through merge())."""
+    with _lock:
+        return dict(_counters)
+
+def cache_stats():
+    """
+    Hits, misses and hit rate of every cache that reports "<cache>_hits" / "<cache>_misses"
+    counters: {cache: {"hits": int, "misses": int, "hit_rate": float}}.
+    """
+    values = counters()
+    stats = {}
+    for name in values:
+        if name.endswith("_hits") or name.endswith("_misses"):
+            cache = name.rsplit("_", 1)[0]
+            hits = values.get(f"{cache}_hits", 0)
+            misses = values.get(f"{cache}_misses", 0)
+            stats[cache] = {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses) if hits + misses else 0.0}
+    return stats
+
+def summary():
+    """One row per stage (calls, total/mean/p50/p95 wall time, mean CPU time, mean memory peak) for display."""
+    rows = []
+    with _lock:
+        for name in sorted(_stages):
+            wall = _stages[name]["wall_seconds"]
+            cpu = _stages[name]["cpu_seconds"]
+            row = {
+                "Stage": name,
+                "Calls": wall.count,
+                "Total (s)": round(wall.sum, 3),
+                "Mean (ms)": round(1000 * wall.sum / wall.count, 2) if wall.count else 0.0,
+                "p50 (ms)": round(1000 * wall.quantile(0.5), 2),
+                "p95 (ms)": round(1000 * wall.quantile(0.95), 2),
+                "CPU mean (ms)": round(1000 * cpu.sum / cpu.count, 2) if cpu.count else 0.0,
+            }
+            memory = _stages[name].get("memory_peak_bytes")
+            if memory and memory.count:
+                row["Peak mean (MB)"] = round(memory.sum / memory.count / 2 ** 20, 2)
+            rows.append(row)
+    return rows
+
+def to_json():
+    return json.dumps({"generated_at": time.time(), **snapshot()}, indent=2, sort_keys=True)
+
+def to_prometheus(prefix="resume_stage"):
+    """
+    Prometheus text exposition format: one histogram family per kind, labelled by stage,
+    plus one counter per counter name (resume_<name>_total).
+    """
+    snap = snapshot()
+    data = snap["stages"]
+    lines = []
+    for kind in _KINDS:
+        metric = f"{prefix}_{kind}"
+        lines.append(f"# HELP {metric} Resume pipeline stage {kind.replace('_', ' ')}.")
+        lines.append(f"# TYPE {metric} histogram")
+        for name in sorted(data):
+            hist = data[name].get(kind)
+            if not hist:
+                continue
+            cumulative = 0
+            for bound, n in zip(hist["bounds"] + ["+Inf"], hist["counts"]):
+                cumulative += n
+                lines.append(f'{metric}_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {hist["sum"]}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {hist["count"]}')
+    for name in sorted(snap["counters"]):
+        metric = f"resume_{name}_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {snap['counters'][name]}")
+    return "\n".join(lines) + "\n"
+
+def _write_atomic(path, text):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def export_files(directory=None):
+    """
+    Writes metrics.json and metrics.prom (e.g. for node_exporter's textfile collector).
+    Returns the two paths.
+    """
+    directory = directory or METRICS_DIR
+    os.makedirs(directory, exist_ok=True)
+    json_path = os.path.join(directory, "metrics.json")
+    prom_path = os.path.join(directory, "metrics.prom")
+    _write_atomic(json_path, to_json())
+    _write_atomic(prom_path, to_prometheus())
+    return json_path, prom_path
@@ -1,4 +1,143 @@
+import os
+import re
+import time
 import pdfplumber
+from io import BytesIO
+from pdfminer.high_level import extract_pages
+from pdfminer.layout import LAParams, LTTextContainer
+from utils.disk_cache import DiskCache, make_key
+from utils.metrics import stage
+from utils.section_extractor import SECTION_KEYWORDS
+
+# Bump this whenever the extraction logic changes, so old cached text is ignored
+EXTRACTOR_VERSION = "3"
+
+# Hard limits, so a huge PDF can't eat the worker's time or memory
+MAX_FILE_BYTES = int(os.getenv("PDF_MAX_FILE_BYTES", 10 * 1024 * 1024))
+MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", 10))         # Real resumes are 1-3 pages
+MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", 100_000))    # Stop once we've seen this much text
+
+# Extracted text is cached on disk, keyed by the file bytes (default cap: 256 MB)
+PDF_CACHE = DiskCache("pdf_text", int(os.getenv("PDF_CACHE_MAX_BYTES", 256 * 1024 * 1024)))
+
+# "auto" (fast pdfminer path, full pdfplumber layout only if the result looks broken),
+# "pdfminer" or "pdfplumber"
+PDF_BACKEND = os.getenv("PDF_BACKEND", "auto")
+
+# Below this many characters per page, fast-path text is considered broken
+MIN_CHARS_PER_PAGE = 100
+
+# Cheap pdfminer layout: no box-ordering pass, no vertical text detection
+_FAST_LAPARAMS = LAParams(boxes_flow=None, detect_vertical=False)
+
+_HEADERS = {keyword for keywords in SECTION_KEYWORDS.values() for keyword in keywords}
+
+def _pdfplumber_pages(source, max_pages, max_chars):
+    """Full character-level layout analysis (the original extractor)."""
+    seen = 0
+    with pdfplumber.open(source, pages=list(range(1, max_pages + 1))) as pdf:
+        for page in pdf.pages:
+            try:
+                extracted = page.extract_text()
+            finally:
+                page.close()  # Frees the page's character/layout cache
+
+            if extracted:
+                yield extracted
+                seen += len(extracted)
+                if seen >= max_chars:
+                    break
+
+def _pdfminer_pages(source, max_pages, max_chars):
+    """Lean pdfminer pass: text boxes read top to bottom, no advanced layout."""
+    seen = 0
+    for layout in extract_pages(source, maxpages=max_pages, laparams=_FAST_LAPARAMS):
+        extracted = "".join(el.get_text() for el in layout if isinstance(el, LTTextContainer)).rstrip("\n")
+        if extracted:
+            yield extracted
+            seen += len(extracted)
+            if seen >= max_chars:
+                break
+
+PDF_BACKENDS = {
+    "pdfplumber": _pdfplumber_pages,
+    "pdfminer": _pdfminer_pages,
+}
+
+def iter_pdf_pages(source, backend="pdfplumber", max_pages=None, max_chars=None):
+    """
+    Yields the text of each page, one at a time, with the given backend.
+    Only the first max_pages pages are read, and we stop early after max_chars characters
+    (default: MAX_PAGES / MAX_CHARS, read at call time like the cache key does).
+    """
+    max_pages = MAX_PAGES if max_pages is None else max_pages
+    max_chars = MAX_CHARS if max_chars is None else max_chars
+    yield from PDF_BACKENDS[backend](source, max_pages, max_chars)
+
+def looks_broken(text, pages):
+    """
+    Returns why fast-path text looks unusable (or None if it looks fine):
+    too little text per page, words glued together, or no section headers at all.
+    """
+    if len(text) < MIN_CHARS_PER_PAGE * max(pages, 1):
+        return "low text density"
+    if text.count(" ") < len(text) / 20:
+        return "words run together"
+    if not any(line.strip().lower() in _HEADERS for line in text.split("\n")):
+        return "no section headers"
+    return None
+
+def _join_pages(source, backend):
+    pages = list(iter_pdf_pages(source, backend))
+    return "".join(page + "\n" for page in pages), len(pages)
+
+def _extract_with_backend(source, backend=None):
+    """
+    Returns (text, backend_used). In "auto" mode the fast pdfminer path runs first
+    and we fall back to pdfplumber only when its output looks broken.
+    """
+    backend = backend or PDF_BACKEND
+    if backend != "auto":
+        return _join_pages(source, backend)[0], backend
+
+    try:
+        text, pages = _join_pages(source, "pdfminer")
+        if not looks_broken(text, pages):
+            return text, "pdfminer"
+    except Exception:
+        pass  # Let pdfplumber have a go
+
+    source.seek(0)
+    return _join_pages(source, "pdfplumber")[0], "pdfplumber"
+
+def _extract_text(source):
+    """
+    Extracts text from a file-like object and validates the result.
+    """
+    text, _ = _extract_with_backend(source)
+
+    # Check for Empty PDFs (Scanned images or corrupted files)
+    if not text.strip():
+        return "Error: No text found. This PDF might be an image or scanned document."
+
+    return text
+
+def _extract_text_cached(data):
+    """
+    Returns the text of a PDF given its raw bytes, parsing it only on a cache miss.
+    """
+    if len(data) > MAX_FILE_BYTES:
+        return f"Error: PDF is too large (limit is {MAX_FILE_BYTES // (1024 * 1024)} MB)."
+
+    key = make_key(EXTRACTOR_VERSION, PDF_BACKEND, str(MAX_PAGES), str(MAX_CHARS), data)
+    text = PDF_CACHE.get(key)
+    if text is not None:
+        return text
+
+    text = _extract_text(BytesIO(data))
+    if not text.startswith("Error:"):
+        PDF_CACHE.set(key, text)
+    return text
 
 def extract_text_from_pdf(file):
     """
@@ -9,19 +148,57 @@ def extract_text_from_pdf(file):
         if file.type != "application/pdf":
             return "Error: Uploaded file is not a standard PDF."
 
-        # 2. Extract Text
-        text = ""
-        with pdfplumber.open(file) as pdf:
-            for page in pdf.pages:
-                extracted = page.extract_text()
-                if extracted:
-                    text += extracted + "\n"
-        
-        # 3. Check for Empty PDFs (Scanned images or corrupted files)
-        if not text.strip():
-            return "Error: No text found. This PDF might be an image or scanned document."
-            
-        return text
+        # 2. Extract Text (or reuse it if we've seen these exact bytes before)
+        with stage("extract"):
+            return _extract_text_cached(file.getvalue())
+
+    except Exception as e:
+        return f"Error reading PDF: {str(e)}"
 
+def extract_text_from_bytes(data):
+    """
+    Same as extract_text_from_pdf, but for raw PDF bytes
+    (used by worker processes, which can't receive Streamlit upload objects).
+    """
+    try:
+        with stage("extract"):
+            return _extract_text_cached(data)
     except Exception as e:
-        return f"Error reading PDF: {str(e)}"
\ No newline at end of file
+        return f"Error reading PDF: {str(e)}"
+
+def _words(text):
+    return set(re.findall(r"\w+", text.lower()))
+
+def compare_backends(pdf_files, backends=("pdfplumber", "pdfminer", "auto")):
+    """
+    Benchmarks the backends on a sample corpus (list of PDF bytes).
+    Reports per-backend throughput and word-level agreement (Jaccard) with pdfplumber,
+    plus how often "auto" had to fall back to full layout.
+    """
+    reference = {}
+    report = {}
+    for backend in backends:
+        seconds, agreement, fallbacks = 0.0, [], 0
+        for i, data in enumerate(pdf_files):
+            start = time.perf_counter()
+            try:
+                text, used = _extract_with_backend(BytesIO(data), backend)
+            except Exception:
+                text, used = "", backend
+            seconds += time.perf_counter() - start
+
+            if backend == "auto" and used == "pdfplumber":
+                fallbacks += 1
+            if backend == "pdfplumber":
+                reference[i] = _words(text)
+            if i in reference:
+                ref, words = reference[i], _words(text)
+                agreement.append(len(ref & words) / len(ref | words) if ref | words else 1.0)
+
+        report[backend] = {
+            "seconds": round(seconds, 4),
+            "docs_per_sec": round(len(pdf_files) / seconds, 2) if seconds else None,
+            "agreement": round(sum(agreement) / len(agreement), 4) if agreement else None,
+            "fallbacks": fallbacks,
+        }
+    return report
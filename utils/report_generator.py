@@ -4,7 +4,9 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from io import BytesIO
 import re  # <--- NEW: Added Regex library
+from utils.metrics import timed
 
+@timed("report")
 def generate_pdf_report(name, match_score, semantic_score, missing_skills, ai_advice):
     """
     Generates a professional PDF report using ReportLab.
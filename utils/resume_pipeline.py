@@ -0,0 +1,115 @@
+from bisect import bisect_left
+
+from utils.text_cleaner import clean_text
+from utils.section_extractor import find_section_spans, LEGACY_MERGE
+from utils.skill_taxonomy import token_spans
+from utils.ats_matcher import extract_skills_from_tokens, match_skills, skills_without_evidence
+from utils.bullet_analyzer import analyze_bullets
+from utils.semantic_matcher import calculate_semantic_match, calculate_semantic_matches, terms_from_tokens
+from utils.metrics import stage
+
+_EXPERIENCE = LEGACY_MERGE["experience"]
+
+class ResumeAnalysis:
+    """
+    Everything we compute for one resume against one JobProfile.
+    Single, Compare and Bulk modes all read from this object.
+    """
+    __slots__ = (
+        "job_profile", "cleaned_text", "sections", "terms",
+        "resume_skills", "match_percentage", "matched_skills", "missing_skills",
+        "semantic_score", "idf_revision", "bullets", "weak_bullets", "unquantified", "skills_no_evidence"
+    )
+
+    def __init__(self, job_profile, cleaned_text):
+        self.job_profile = job_profile
+        self.cleaned_text = cleaned_text
+        self.sections = None
+        self.terms = []              # TF-IDF terms of cleaned_text (from the shared token pass)
+        self.resume_skills = set()
+        self.match_percentage = 0
+        self.matched_skills = set()
+        self.missing_skills = set()
+        self.semantic_score = None   # None until scored (bulk scores the whole batch at once)
+        self.idf_revision = None     # IdfModel revision behind semantic_score (None: per-batch TF-IDF)
+        self.bullets = []            # BulletFinding per experience line (with match spans)
+        self.weak_bullets = []
+        self.unquantified = []
+        self.skills_no_evidence = []
+
+    @property
+    def jd_text(self):
+        return self.job_profile.jd_text
+
+    @property
+    def jd_skills(self):
+        return self.job_profile.skills
+
+def _spans_within(spans, starts, ranges):
+    """The token triples lying inside the given (start, end) ranges, in text order."""
+    selected = []
+    for start, end in ranges:
+        i = bisect_left(starts, start)
+        while i < len(spans) and spans[i][2] <= end:
+            selected.append(spans[i])
+            i += 1
+    return selected
+
+def analyze_resume(text, job_profile, idf_model=None, semantic=True, detailed=True):
+    """
+    Runs the whole pipeline on raw resume text: clean once, tokenize once, split sections
+    once, then every scorer and detector works from those shared structures (the skill
+    trie walk, the TF-IDF terms and the evidence index all read the same token list).
+    - semantic=False skips the semantic score (e.g. to batch it later)
+    - detailed=False skips the bullet and evidence checks (Bulk mode doesn't show them)
+    Pass a pinned IdfModel (IdfModel.pinned()) so idf_revision names the revision that was used.
+    """
+    with stage("clean"):
+        cleaned_text = clean_text(text)
+    result = ResumeAnalysis(job_profile, cleaned_text)
+
+    # 0. The one tokenization pass: (token, start, end) for every token of the resume
+    with stage("tokenize"):
+        spans = list(token_spans(cleaned_text))
+        tokens = [token for token, _, _ in spans]
+        result.terms = terms_from_tokens(tokens)
+
+    # 1. Keyword engine
+    with stage("skills"):
+        result.resume_skills = extract_skills_from_tokens(tokens)
+        result.match_percentage, result.matched_skills, result.missing_skills = match_skills(result.resume_skills, job_profile)
+
+    # 2. Semantic engine
+    if semantic:
+        result.semantic_score = calculate_semantic_match(cleaned_text, job_profile, idf_model, result.terms)
+        result.idf_revision = idf_model.scored_revision if idf_model is not None else None
+
+    # 3. Quality checks: one rule scan over the experience bullets
+    if detailed:
+        with stage("sections"):
+            result.sections = find_section_spans(cleaned_text)
+            exp_text = result.sections.text(*_EXPERIENCE)
+        with stage("bullets"):
+            result.bullets = analyze_bullets(exp_text)
+            result.weak_bullets = [b.text for b in result.bullets if b.is_weak]
+            result.unquantified = [b.text for b in result.bullets if not b.too_short and not b.is_quantified]
+            # Evidence comes from the experience tokens of the shared pass (nothing re-tokenized)
+            exp_spans = _spans_within(spans, [start for _, start, _ in spans], result.sections.iter_lines(*_EXPERIENCE))
+            result.skills_no_evidence = skills_without_evidence(result.resume_skills, exp_spans)
+
+    return result
+
+def analyze_resumes(texts, job_profile, idf_model=None, detailed=True):
+    """
+    analyze_resume for several resumes, with all semantic scores computed in one batch
+    (so the scores are comparable with each other).
+    """
+    results = [analyze_resume(text, job_profile, semantic=False, detailed=detailed) for text in texts]
+    scores = calculate_semantic_matches(
+        [r.cleaned_text for r in results], job_profile, idf_model, [r.terms for r in results]
+    )
+    revision = idf_model.scored_revision if idf_model is not None else None
+    for result, score in zip(results, scores):
+        result.semantic_score = score
+        result.idf_revision = revision
+    return results
@@ -1,6 +1,9 @@
 import re
 
 SECTION_KEYWORDS = {
+    "summary": [
+        "summary", "professional summary", "profile", "objective", "career objective", "about me"
+    ],
     "skills": [
         "skills", "technical skills", "technologies", "tools", "expertise", "competencies"
     ],
@@ -8,44 +11,124 @@ SECTION_KEYWORDS = {
         "education", "academic", "qualification", "degree", "alma mater"
     ],
     "experience": [
-        "experience", "work experience", "employment", "internship", "projects", "work history"
+        "experience", "work experience", "employment", "internship", "work history"
+    ],
+    "projects": [
+        "projects", "personal projects", "academic projects", "key projects"
+    ],
+    "certifications": [
+        "certifications", "certification", "certificates", "licenses"
+    ],
+    "achievements": [
+        "achievements", "awards", "honors", "accomplishments"
+    ],
+    "languages": [
+        "languages"
     ]
 }
 
-def extract_sections(text):
-    sections = {
-        "skills": "",
-        "education": "",
-        "experience": ""
-    }
+# Projects used to be part of "experience", so the legacy dict still merges them in
+LEGACY_MERGE = {"experience": ("experience", "projects")}
 
-    current_section = None
-    lines = text.split("\n")
+# 1. Exact header lines -> section (one dict lookup per line)
+_HEADER_LOOKUP = {keyword: name for name, keywords in SECTION_KEYWORDS.items() for keyword in keywords}
+
+# 2. Headers we also recognize by prefix (e.g. "certifications and awards"), matched in place
+_PREFIX_HEADER_RE = re.compile(r"[^\S\n]*(certification|achievement|languages)", re.IGNORECASE)
+_PREFIX_SECTION = {"certification": "certifications", "achievement": "achievements", "languages": "languages"}
+
+# Longer lines are never exact headers, so we don't even copy/lowercase them
+_MAX_HEADER_LEN = 40
+
+class ResumeSections:
+    """
+    Section spans over the original text: {section: [(start, end), ...]}.
+    Nothing is copied until .text() is called; detectors can also walk
+    .iter_lines() and search the source with pattern.search(source, start, end).
+    """
+    __slots__ = ("source", "spans")
 
-    for line in lines:
-        line_strip = line.strip()
-        if not line_strip:
-            continue
+    def __init__(self, source, spans):
+        self.source = source
+        self.spans = spans
 
-        # 1. Check if this line is a Section Header
+    def _spans_for(self, names):
+        spans = []
+        for name in names:
+            spans.extend(self.spans.get(name, ()))
+        return sorted(spans)
+
+    def iter_lines(self, *names):
+        """Yields (start, end) offsets of each non-empty, stripped line in these sections."""
+        source = self.source
+        for start, end in self._spans_for(names):
+            pos = start
+            while pos < end:
+                nl = source.find("\n", pos, end)
+                line_end = end if nl == -1 else nl
+                # Strip by moving the offsets instead of copying the line
+                s, e = pos, line_end
+                while s < e and source[s].isspace():
+                    s += 1
+                while e > s and source[e - 1].isspace():
+                    e -= 1
+                if s < e:
+                    yield s, e
+                pos = line_end + 1
+
+    def text(self, *names):
+        """The section's text (one stripped line per row), sliced only now."""
+        source = self.source
+        return "".join(source[s:e] + "\n" for s, e in self.iter_lines(*names))
+
+    def __contains__(self, name):
+        return name in self.spans
+
+def find_section_spans(text):
+    """
+    One pass over the lines: every header switches the current section, and each
+    section gets the (start, end) offsets of the block of lines under its header.
+    """
+    spans = {}
+    current_section = None
+    block_start = 0
+    pos = 0
+    length = len(text)
+
+    while pos <= length:
+        nl = text.find("\n", pos)
+        line_end = length if nl == -1 else nl
         found_section = None
-        for section_name, keywords in SECTION_KEYWORDS.items():
-            if line_strip.lower() in keywords:
-                found_section = section_name
-                break
-        
-        # 2. If it is a header, switch the "bucket"
+        if line_end - pos <= _MAX_HEADER_LEN:
+            found_section = _HEADER_LOOKUP.get(text[pos:line_end].strip().lower())
+        if not found_section:
+            match = _PREFIX_HEADER_RE.match(text, pos, line_end)
+            if match:
+                found_section = _PREFIX_SECTION[match.group(1).lower()]
+
         if found_section:
+            # Close the previous block, then start a new one after the header line
+            if current_section and pos > block_start:
+                spans.setdefault(current_section, []).append((block_start, pos))
             current_section = found_section
-            continue # Don't add the header itself to the text
+            block_start = line_end + 1
 
-        # 3. Stop if we hit other headers we don't care about
-        if any(line_strip.upper().startswith(k) for k in ["CERTIFICATION", "ACHIEVEMENT", "LANGUAGES"]):
-            current_section = None
-            continue
+        if nl == -1:
+            break
+        pos = nl + 1
 
-        # 4. Add line to the current bucket
-        if current_section:
-            sections[current_section] += line_strip + "\n"  
+    if current_section and length > block_start:
+        spans.setdefault(current_section, []).append((block_start, length))
 
-    return sections
\ No newline at end of file
+    return ResumeSections(text, spans)
+
+def extract_sections(text):
+    """
+    Returns {section: text} for every known section (empty string if missing).
+    "experience" also includes projects, as it always has.
+    """
+    found = find_section_spans(text)
+    sections = {}
+    for name in SECTION_KEYWORDS:
+        sections[name] = found.text(*LEGACY_MERGE.get(name, (name,)))
+    return sections
@@ -1,30 +1,134 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import math
+import re
 
-def calculate_semantic_match(resume_text, jd_text):
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from utils.metrics import stage
+
+# Same tokenization as TfidfVectorizer(stop_words='english'), exposed so a JD can be tokenized once
+analyze_terms = TfidfVectorizer(stop_words='english').build_analyzer()
+
+_STOP_WORDS = TfidfVectorizer(stop_words='english').get_stop_words()
+_WORD_RE = re.compile(r"\w+")
+
+def terms_from_tokens(tokens):
+    """
+    analyze_terms(text), computed from skill_taxonomy.tokenize(text) instead of the text.
+    Skill tokens keep inner dots/hyphens and trailing +/#, so their \\w runs are exactly the
+    words TF-IDF sees: splitting them again and applying the same length and stop-word
+    filters gives the same terms without a second pass over the text.
+    """
+    words = _WORD_RE.findall(" ".join(tokens))   # One C-level scan instead of one per token
+    return [word for word in words if len(word) > 1 and word not in _STOP_WORDS]
+
+def _resume_terms(resume_texts, resume_terms, i):
+    return resume_terms[i] if resume_terms is not None else analyze_terms(resume_texts[i])
+
+def _identity(terms):
+    return terms
+
+def calculate_semantic_matches(resume_texts, jd_text, idf_model=None, resume_terms=None):
+    """
+    Scores a whole batch of resumes against one JD with a single TF-IDF fit.
+    The JD and all N resumes share one vocabulary and IDF, so scores are comparable
+    across the batch. jd_text can also be a JobProfile (JD already tokenized).
+    If a ready persistent IdfModel is given, it is used instead (no fitting at all).
+    resume_terms (analyze_terms of each resume, e.g. from terms_from_tokens) skips re-tokenizing.
+    Returns a list of percentages, in the same order as resume_texts.
+    """
+    with stage("semantic"):
+        return _semantic_matches(resume_texts, jd_text, idf_model, resume_terms)
+
+def _semantic_matches(resume_texts, jd_text, idf_model, resume_terms):
+    if idf_model is not None and idf_model.is_ready():
+        return idf_model.score(resume_texts, jd_text, resume_terms)
+
+    jd_terms = None
+    if hasattr(jd_text, "terms"):
+        jd_terms = jd_text.terms
+        jd_text = jd_text.jd_text
+
+    scores = [0.0] * len(resume_texts)
+    if not jd_text.strip():
+        return scores
+
+    if jd_terms is None:
+        jd_terms = analyze_terms(jd_text)
+
+    # 1. Tokenize the non-empty resumes (empty ones keep a score of 0)
+    positions = [i for i, text in enumerate(resume_texts) if text.strip()]
+    if not positions:
+        return scores
+    documents = [jd_terms] + [_resume_terms(resume_texts, resume_terms, i) for i in positions]
+
+    # 2. Fit TF-IDF once on the JD + every resume (documents are already tokenized)
+    vectorizer = TfidfVectorizer(analyzer=_identity)
+
+    try:
+        # 3. Transform text into mathematical vectors (rows are L2-normalized)
+        tfidf_matrix = vectorizer.fit_transform(documents)
+    except ValueError:
+        # Empty vocabulary (e.g., only stop words): nothing to compare
+        return scores
+
+    # 4. Cosine Similarity of every resume with the JD = one sparse matrix-vector product
+    similarities = (tfidf_matrix[1:] @ tfidf_matrix[0].T).toarray().ravel()
+
+    # 5. Return as rounded percentages
+    for i, score in zip(positions, similarities):
+        scores[i] = round(float(score * 100), 2)
+    return scores
+
+def calculate_semantic_match(resume_text, jd_text, idf_model=None, resume_terms=None):
     """
     Calculates the semantic similarity between resume and JD using TF-IDF and Cosine Similarity.
     This is an international-standard approach for basic NLP matching.
+    jd_text can also be a JobProfile, whose JD terms are already tokenized
+    (and resume_terms the resume's, see calculate_semantic_matches).
     """
-    if not resume_text.strip() or not jd_text.strip():
-        return 0.0
+    terms = [resume_terms] if resume_terms is not None else None
+    return calculate_semantic_matches([resume_text], jd_text, idf_model, terms)[0]
+
+# With 2 documents (JD + one resume), smooth IDF is 1 for terms in both and this for the rest
+_PAIR_IDF_SQ = (math.log(3 / 2) + 1) ** 2
+
+def calculate_pairwise_matches(resume_texts, jd_text, resume_terms=None):
+    """
+    For each resume, the same score as calculate_semantic_match(resume, jd) (a TF-IDF fit
+    on just that JD + resume), but computed for the whole list in one sparse vectorization.
+    Unlike calculate_semantic_matches, a resume's score never depends on the rest of the
+    batch, so requests can be batched together freely. jd_text can also be a JobProfile.
+    """
+    with stage("semantic"):
+        return _pairwise_matches(resume_texts, jd_text, resume_terms)
+
+def _pairwise_matches(resume_texts, jd_text, resume_terms):
+    jd_terms = jd_text.terms if hasattr(jd_text, "terms") else analyze_terms(jd_text)
+    scores = [0.0] * len(resume_texts)
+    if not jd_terms or not resume_texts:
+        return scores
 
-    # 1. Combine texts into a list for the vectorizer
-    documents = [resume_text, jd_text]
-    
-    # 2. Initialize TF-IDF Vectorizer (removes common English stop words)
-    vectorizer = TfidfVectorizer(stop_words='english')
-    
     try:
-        # 3. Transform text into mathematical vectors
-        tfidf_matrix = vectorizer.fit_transform(documents)
-        
-        # 4. Calculate Cosine Similarity (the 'angle' between the two vectors)
-        # tfidf_matrix[0:1] is the Resume; tfidf_matrix[1:2] is the JD
-        match_score = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-        
-        # 5. Return as a rounded percentage
-        return round(float(match_score * 100), 2)
-    except Exception:
-        # Returns 0 if vectors cannot be compared (e.g., empty or non-informative text)
-        return 0.0
\ No newline at end of file
+        counts = CountVectorizer(analyzer=_identity).fit_transform(
+            [jd_terms] + [_resume_terms(resume_texts, resume_terms, i) for i in range(len(resume_texts))]
+        ).tocsr().astype(float)
+    except ValueError:
+        return scores
+    jd_row, resumes = counts[0], counts[1:]
+
+    # Only the JD's terms can be shared, so every "shared" sum works on those columns
+    jd_counts = jd_row.data
+    shared = resumes[:, jd_row.indices]
+    dot = shared @ jd_counts                                     # Shared terms have IDF 1
+    shared_resume_sq = np.asarray(shared.multiply(shared).sum(axis=1)).ravel()
+    shared_jd_sq = (shared > 0).astype(float) @ (jd_counts ** 2)
+    resume_sq = np.asarray(resumes.multiply(resumes).sum(axis=1)).ravel()
+    jd_sq = float((jd_counts ** 2).sum())
+
+    # L2 norms of the TF-IDF vectors: unshared terms are weighted by the pair IDF
+    resume_norm = np.sqrt(_PAIR_IDF_SQ * resume_sq - (_PAIR_IDF_SQ - 1) * shared_resume_sq)
+    jd_norm = np.sqrt(_PAIR_IDF_SQ * jd_sq - (_PAIR_IDF_SQ - 1) * shared_jd_sq)
+
+    for i in np.flatnonzero(dot):
+        scores[i] = round(float(dot[i] / (resume_norm[i] * jd_norm[i]) * 100), 2)
+    return scores
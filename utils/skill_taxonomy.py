@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import pickle
+import re
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The taxonomy data file (skills, synonyms, suggestions, learning links).
+# Point SKILL_TAXONOMY_FILE at a bigger export to grow the skill list.
+TAXONOMY_FILE = os.getenv("SKILL_TAXONOMY_FILE", os.path.join(_ROOT, "data", "skill_taxonomy.json"))
+
+# Where the compiled index is stored (anchored to the repo, so the app, the CLI and the
+# service share one index wherever they're started from).
+# Bump INDEX_VERSION whenever the index layout changes.
+INDEX_DIR = os.getenv("SKILL_INDEX_DIR", os.path.join(_ROOT, ".cache"))
+INDEX_VERSION = 1
+
+# Tokens keep inner dots/hyphens and trailing +/# so "node.js", "scikit-learn",
+# "c++" and "c#" survive as single words, while "go" never matches inside "google".
+_TOKEN_RE = re.compile(r"\w+(?:[.\-]\w+)*[+#]*")
+TRIE_END = ""  # Trie key marking "a skill ends here" (never a real token)
+
+def tokenize(text):
+    """Splits lowercased text into skill-matching tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+def token_spans(text):
+    """Like tokenize, but yields (token, start, end) so matches can point back into the text."""
+    for match in _TOKEN_RE.finditer(text.lower()):
+        yield match.group(), match.start(), match.end()
+
+def _file_hash(path):
+    """SHA-256 of the raw taxonomy file, so a stale index is never used."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def build_index(taxonomy):
+    """
+    Compiles a taxonomy dict into the index used at runtime:
+    - alias_map: alias/skill -> canonical skill (O(1) normalization)
+    - trie: token trie whose terminal nodes hold the canonical skill(s) a phrase maps to
+    """
+    skills = [s.lower().strip() for s in taxonomy.get("skills", [])]
+    synonyms = {
+        main.lower().strip(): [a.lower().strip() for a in aliases]
+        for main, aliases in taxonomy.get("synonyms", {}).items()
+    }
+
+    # 1. Reverse alias map (first main skill wins, same as the old linear scan)
+    alias_map = {}
+    for main, aliases in synonyms.items():
+        alias_map.setdefault(main, main)
+        for alias in aliases:
+            alias_map.setdefault(alias, main)
+
+    # 2. Token trie over every skill and alias
+    trie = {}
+
+    def add(phrase, canonical):
+        node = trie
+        for token in tokenize(phrase):
+            node = node.setdefault(token, {})
+        node.setdefault(TRIE_END, set()).add(canonical)
+
+    for skill in skills:
+        add(skill, skill)
+    for main, aliases in synonyms.items():
+        for alias in aliases:
+            add(alias, main)
+
+    return {
+        "version": INDEX_VERSION,
+        "skills": skills,
+        "synonyms": synonyms,
+        "suggestions": taxonomy.get("suggestions", {}),
+        "resources": taxonomy.get("resources", {}),
+        "alias_map": alias_map,
+        "trie": trie,
+    }
+
+def _index_path(source_hash):
+    return os.path.join(INDEX_DIR, f"skill_index_v{INDEX_VERSION}_{source_hash[:16]}.pkl")
+
+def load_skill_index(path=None):
+    """
+    Loads the compiled skill index, rebuilding it from the taxonomy file only when
+    the file changed (or the index format version was bumped).
+    """
+    path = path or TAXONOMY_FILE
+    source_hash = _file_hash(path)
+    index_path = _index_path(source_hash)
+
+    # 1. Fast path: unpickle the precompiled index
+    try:
+        with open(index_path, "rb") as f:
+            index = pickle.load(f)
+        if index.get("version") == INDEX_VERSION and index.get("source_hash") == source_hash:
+            return index
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass
+
+    # 2. Slow path: parse the taxonomy and compile it
+    with open(path, "r", encoding="utf-8") as f:
+        index = build_index(json.load(f))
+    index["source_hash"] = source_hash
+
+    # 3. Save it atomically so concurrent processes never read a half-written file
+    try:
+        os.makedirs(INDEX_DIR, exist_ok=True)
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, index_path)
+    except OSError:
+        pass  # Read-only disk: we still have the index in memory
+
+    return index
@@ -1,21 +1,74 @@
 import re
+from array import array
+
+_KEEP_RE = re.compile(r"[\w\s]")
+
+class _CleanTable(dict):
+    """
+    str.translate table built on demand: punctuation (anything not \\w or \\s) is
+    deleted (None) and tabs become spaces. Each character is classified once, then cached.
+    """
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        if char == "\t":
+            value = " "
+        elif _KEEP_RE.match(char):
+            value = char
+        else:
+            value = None
+        self[codepoint] = value
+        return value
+
+_TABLE = _CleanTable()
+
+# One regex for both collapses: deletes every space that follows a space and every
+# newline that follows a newline (so runs shrink to a single character)
+_RUNS_RE = re.compile(r"(?<= ) +|(?<=\n)\n+")
 
 def clean_text(text):
     """
     Cleans text but PRESERVES newlines so structure is kept.
     """
-    # 1. Convert to lowercase
-    text = text.lower()
-    
-    # 2. Remove special characters (keep letters, numbers, spaces, AND newlines)
-    # [^...] means "not in this list". \w=words, \s=whitespace (includes \n)
-    text = re.sub(r'[^\w\s]', '', text)
-    
-    # 3. Replace multiple spaces/tabs with a single space
-    # We use [ \t]+ instead of \s+ to avoid grabbing newlines
-    text = re.sub(r'[ \t]+', ' ', text)
-    
-    # 4. Replace multiple newlines with a single newline
-    text = re.sub(r'\n+', '\n', text)
-    
-    return text.strip()
\ No newline at end of file
+    # 1. Lowercase, then remove special characters (keep letters, numbers, spaces AND newlines)
+    #    and turn tabs into spaces, all in one translate pass
+    text = text.lower().translate(_TABLE)
+
+    # 2. Collapse multiple spaces to one and multiple newlines to one, in a single regex pass
+    text = _RUNS_RE.sub("", text)
+
+    return text.strip()
+
+def clean_text_with_offsets(text):
+    """
+    Same output as clean_text, plus an offset map: offsets[i] is the index in the
+    raw text of the character that produced cleaned[i]. Use it to highlight findings
+    (skills, weak bullets...) in the original PDF text.
+    Returns (cleaned, offsets) where offsets is a compact array('l').
+    """
+    lowered = text.lower()
+    same_length = len(lowered) == len(text)
+
+    out = []
+    offsets = array("l")
+
+    # Walk the text once, mirroring the translate + collapse steps. We read from the
+    # whole-string lowercase (so context-dependent cases like the Greek final sigma match
+    # clean_text) and only count per-character lengths when lowercasing changed the size.
+    prev = ""
+    pos = 0
+    for index, raw_char in enumerate(text):
+        step = 1 if same_length else len(raw_char.lower())
+        for piece in lowered[pos:pos + step].translate(_TABLE):
+            if piece == prev and piece in " \n":
+                continue  # Collapsed run
+            out.append(piece)
+            offsets.append(index)
+            prev = piece
+        pos += step
+
+    result = "".join(out)
+
+    # strip(), applied to the offsets too
+    start = len(result) - len(result.lstrip())
+    end = len(result.rstrip())
+    return result[start:end], offsets[start:end]